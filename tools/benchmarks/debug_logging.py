@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the cost of the HTTPClient request/response debug logging.
+
+Measures log_curl_request + log_http_response for a large response body
+with DEBUG disabled and enabled, against the previous implementation
+which always built the log lines and masked the whole body.
+
+Usage: python tools/benchmarks/debug_logging.py [--size-mb N] [--runs N]
+"""
+
+import argparse
+import logging
+import time
+from unittest import mock
+
+from oslo_utils import strutils
+
+from watcherclient.common import httpclient
+
+import response_body
+
+
+def legacy_logging(client, method, url, kwargs, resp, body):
+    """The logging done for every request before it was level-gated."""
+    curl = ['curl -i -X %s' % method]
+    for (key, value) in kwargs['headers'].items():
+        curl.append('-H \'%s: %s\'' % client._process_header(key, value))
+    curl.append(url)
+    httpclient.LOG.debug(' '.join(curl))
+
+    status = (resp.raw.version / 10.0, resp.status_code, resp.reason)
+    dump = ['\nHTTP/%.1f %s %s' % status]
+    dump.extend(['%s: %s' % (k, v) for k, v in resp.headers.items()])
+    dump.append('')
+    dump.extend([strutils.mask_password(body.decode('utf-8')), ''])
+    httpclient.LOG.debug('\n'.join(dump))
+
+
+def current_logging(client, method, url, kwargs, resp, body):
+    client.log_curl_request(method, url, kwargs)
+    client.log_http_response(resp, body, client.max_log_body_size)
+
+
+def measure(func, runs, *args):
+    start = time.perf_counter()
+    for _ in range(runs):
+        func(*args)
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=4)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    body = response_body.make_payload(args.size_mb)
+    resp = response_body.make_response(body)
+    client = httpclient.HTTPClient('http://localhost:9322/')
+    client.session = mock.Mock(verify=True, cert=None)
+    kwargs = {'headers': {'X-Auth-Token': 'a-token',
+                          'OpenStack-API-Version': 'infra-optim 1.5'}}
+    call = ('GET', '/v1/actions', kwargs, resp, body)
+    # NOTE: the records are discarded, only the formatting cost is measured
+    httpclient.LOG.addHandler(logging.NullHandler())
+    httpclient.LOG.propagate = False
+
+    print('body: %.1f MB' % (len(body) / (1024 * 1024)))
+    for level in (logging.INFO, logging.DEBUG):
+        httpclient.LOG.setLevel(level)
+        for name, func in (('legacy', legacy_logging),
+                           ('current', current_logging)):
+            elapsed = measure(func, args.runs, client, *call)
+            print('%-5s %-8s %12.3f ms/request' % (
+                logging.getLevelName(level), name, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
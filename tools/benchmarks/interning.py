@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the interning of the values repeated across a list.
+
+Compares the time to decode and list the actions of a large synthetic
+action plan and the memory they retain, without and with interning
+(``intern_strings=True``). The actions run in waves whose actions all have
+the first action of the previous wave as parent.
+
+Usage: python tools/benchmarks/interning.py [--count N] [--wave-size N]
+"""
+
+import argparse
+import gc
+import itertools
+import time
+import tracemalloc
+import uuid
+
+from oslo_serialization import jsonutils
+
+from watcherclient.tests.unit import utils
+from watcherclient.v1 import action
+
+ACTION_TYPES = ['migrate', 'change_nova_service_state', 'resize', 'nop',
+                'sleep']
+
+
+def make_payload(count, wave_size):
+    action_plan_uuid = str(uuid.uuid4())
+    action_types = itertools.cycle(ACTION_TYPES)
+    actions = []
+    parents = []
+    for index in range(count):
+        if index % wave_size == 0:
+            parents = [actions[-wave_size]['uuid']] if actions else []
+        actions.append({
+            'uuid': str(uuid.uuid4()),
+            'action_plan_uuid': action_plan_uuid,
+            'state': 'PENDING',
+            'action_type': next(action_types),
+            'parents': parents,
+            'description': '',
+        })
+    return jsonutils.dump_as_bytes({'actions': actions})
+
+
+def list_actions(payload, intern):
+    body = jsonutils.loads(payload)
+    api = utils.FakeAPI({'/v1/actions/detail': {'GET': ({}, body)}})
+    manager = action.ActionManager(api, intern=intern)
+    return manager.list(detail=True)
+
+
+def measure(payload, intern):
+    gc.collect()
+    start = time.perf_counter()
+    list_actions(payload, intern)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    actions = list_actions(payload, intern)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(actions), elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--wave-size', type=int, default=100)
+    args = parser.parse_args()
+
+    payload = make_payload(args.count, args.wave_size)
+    print('actions: %d' % args.count)
+    for name, intern in (('default', False), ('interned', True)):
+        count, elapsed, retained = measure(payload, intern)
+        print('%-9s %8.1f ms  retained %7.1f MB'
+              % (name, elapsed * 1000, retained / (1024 * 1024)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the JSON codecs on Watcher API payloads.
+
+Compares the time per MB to decode and encode a detailed action list and a
+compute data model with ``oslo_serialization.jsonutils`` (used before the
+codecs were pluggable) and with each codec installed.
+
+Usage: python tools/benchmarks/json_codec.py [--count N] [--repeat N]
+"""
+
+import argparse
+import time
+import uuid
+
+from oslo_serialization import jsonutils
+
+from watcherclient.common import codec
+
+
+def make_actions(count):
+    action_plan_uuid = str(uuid.uuid4())
+    return {'actions': [{
+        'uuid': str(uuid.uuid4()),
+        'action_plan_uuid': action_plan_uuid,
+        'state': 'PENDING',
+        'action_type': 'migrate',
+        'parents': [str(uuid.uuid4())],
+        'input_parameters': {'migration_type': 'live',
+                             'source_node': 'compute-%d' % (i % 100),
+                             'resource_id': str(uuid.uuid4())},
+        'description': 'Moving a VM instance from source_node to '
+                       'destination_node',
+        'created_at': '2026-10-18T10:00:00+00:00',
+        'updated_at': None,
+        'deleted_at': None,
+        'links': [{'href': 'http://watcher.example.org:9322/v1/actions/',
+                   'rel': 'self'}],
+    } for i in range(count)]}
+
+
+def make_data_model(count):
+    return {'context': [{
+        'server_uuid': str(uuid.uuid4()),
+        'server_name': 'server-%d' % i,
+        'server_vcpus': 4,
+        'server_memory': 8192,
+        'server_disk': 80,
+        'server_state': 'active',
+        'node_uuid': str(uuid.uuid4()),
+        'node_hostname': 'compute-%d' % (i % 100),
+        'node_vcpus': 64,
+        'node_vcpu_ratio': 16.0,
+        'node_memory': 262144,
+        'node_memory_ratio': 1.5,
+        'node_disk': 2048,
+        'node_disk_ratio': 1.0,
+        'node_state': 'up',
+    } for i in range(count)]}
+
+
+class OsloCodec(object):
+    name = 'oslo'
+
+    def encode(self, obj):
+        return jsonutils.dump_as_bytes(obj)
+
+    def decode(self, data):
+        return jsonutils.loads(data)
+
+
+def measure(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    codecs = [OsloCodec()] + [codec.get_codec(name)
+                              for name in reversed(list(codec.CODECS))]
+    for payload_name, obj in (('actions', make_actions(args.count)),
+                              ('data model', make_data_model(args.count))):
+        payload = jsonutils.dump_as_bytes(obj)
+        size = len(payload) / (1024 * 1024)
+        print('%s: %.1f MB' % (payload_name, size))
+        for json_codec in codecs:
+            decode = measure(lambda: json_codec.decode(payload), args.repeat)
+            encode = measure(lambda: json_codec.encode(obj), args.repeat)
+            print('  %-7s decode %7.2f ms/MB  encode %7.2f ms/MB'
+                  % (json_codec.name, decode * 1000 / size,
+                     encode * 1000 / size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the objects returned by the list calls.
+
+Compares the time to build the objects of a detailed action list and the
+memory they retain, with resources (the default) and with compact records
+(``compact_lists=True``). Each variant runs in its own process so that its
+peak RSS is reported separately.
+
+Usage: python tools/benchmarks/list_records.py [--count N]
+"""
+
+import argparse
+import multiprocessing
+import resource
+import time
+import tracemalloc
+import uuid
+
+from oslo_serialization import jsonutils
+
+from watcherclient.tests.unit import utils
+from watcherclient.v1 import action
+
+
+def make_payload(count):
+    action_plan_uuid = str(uuid.uuid4())
+    actions = [{
+        'uuid': str(uuid.uuid4()),
+        'action_plan_uuid': action_plan_uuid,
+        'state': 'PENDING',
+        'action_type': 'migrate',
+        'parents': [str(uuid.uuid4())],
+        'input_parameters': {'migration_type': 'live',
+                             'source_node': 'compute-1',
+                             'resource_id': str(uuid.uuid4())},
+        'description': 'Moving a VM instance from source_node to '
+                       'destination_node',
+        'created_at': '2026-10-18T10:00:00+00:00',
+        'updated_at': None,
+        'deleted_at': None,
+        'links': [],
+    } for _ in range(count)]
+    return jsonutils.dump_as_bytes({'actions': actions})
+
+
+def run(payload, compact, results):
+    body = jsonutils.loads(payload)
+    api = utils.FakeAPI({'/v1/actions/detail': {'GET': ({}, body)}})
+    manager = action.ActionManager(api, compact=compact)
+    del body
+
+    start = time.perf_counter()
+    actions = list(manager.list(detail=True))
+    elapsed = time.perf_counter() - start
+    del actions
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    actions = list(manager.list(detail=True))
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((len(actions), elapsed, retained, maxrss))
+
+
+def measure(payload, compact):
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run,
+                                      args=(payload, compact, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args()
+
+    payload = make_payload(args.count)
+    print('actions: %d' % args.count)
+    for name, compact in (('resource', False), ('record', True)):
+        count, elapsed, retained, maxrss = measure(payload, compact)
+        print('%-8s %8.1f ms  retained %7.1f MB  max RSS %7.1f MB'
+              % (name, elapsed * 1000, retained / (1024 * 1024),
+                 maxrss / 1024))
+
+
+if __name__ == '__main__':
+    main()
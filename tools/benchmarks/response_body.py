@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the HTTPClient response body pipeline.
+
+Compares the time per MB and the peak memory used to turn a large JSON
+response into Python objects with ``HTTPClient.json_request`` against the
+previous chunk-decode/join/StringIO pipeline.
+
+Usage: python tools/benchmarks/response_body.py [--size-mb N]
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+from unittest import mock
+import uuid
+
+from oslo_serialization import jsonutils
+import requests
+
+from watcherclient.common import httpclient
+
+
+def make_payload(size_mb):
+    action = {
+        'uuid': str(uuid.uuid4()),
+        'action_plan_uuid': str(uuid.uuid4()),
+        'state': 'PENDING',
+        'action_type': 'migrate',
+        'parents': [str(uuid.uuid4())],
+        'input_parameters': {'migration_type': 'live',
+                             'source_node': 'compute-1',
+                             'resource_id': str(uuid.uuid4())},
+        'description': 'Moving a VM instance from source_node to '
+                       'destination_node',
+    }
+    one = len(jsonutils.dump_as_bytes(action))
+    count = max(1, size_mb * 1024 * 1024 // one)
+    return jsonutils.dump_as_bytes({'actions': [action] * count})
+
+
+class _Raw(io.BytesIO):
+    version = 11
+
+
+def make_response(payload):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = 'OK'
+    resp.headers['Content-Type'] = 'application/json'
+    resp.raw = _Raw(payload)
+    return resp
+
+
+def legacy_json_body(resp):
+    """The body handling used before the single-read pipeline."""
+    body_iter = resp.iter_content(chunk_size=httpclient.CHUNKSIZE)
+    body_list = [chunk.decode('utf-8') if isinstance(chunk, bytes)
+                 else chunk for chunk in body_iter]
+    body_str = ''.join(body_list)
+    body_iter = io.StringIO(body_str)
+    body = ''.join([chunk for chunk in body_iter])
+    return jsonutils.loads(body)
+
+
+def current_json_body(client, payload):
+    client.session.request.return_value = make_response(payload)
+    return client.json_request('GET', '/v1/actions')[1]
+
+
+def measure(func, size):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed / size, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=16)
+    args = parser.parse_args()
+
+    payload = make_payload(args.size_mb)
+    size = len(payload) / (1024 * 1024)
+    client = httpclient.HTTPClient('http://localhost:9322/')
+    client.session = mock.Mock(verify=True, cert=None)
+
+    results = [
+        ('legacy', measure(
+            lambda: legacy_json_body(make_response(payload)), size)),
+        ('current', measure(
+            lambda: current_json_body(client, payload), size)),
+    ]
+    print('payload: %.1f MB' % size)
+    for name, (per_mb, peak) in results:
+        print('%-8s %8.2f ms/MB  peak %8.1f MB' % (name, per_mb * 1000, peak))
+
+
+if __name__ == '__main__':
+    main()
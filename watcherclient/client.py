@@ -30,7 +30,12 @@ def get_client(api_version, os_auth_token=None, watcher_url=None,
                os_cert=None, cert_file=None, os_key=None, key_file=None,
                os_infra_optim_api_version=None, max_retries=None,
                retry_interval=None, session=None, os_endpoint_override=None,
-               **ignored_kwargs):
+               connect_timeout=None, read_timeout=None, pool_connections=None,
+               pool_maxsize=None, keep_alive=None, retry_policy=None,
+               rate_limiter=None, catalog_cache=None, response_cache=None,
+               single_flight=None, compact_lists=None, intern_strings=None,
+               lazy_detail=None, lazy_lists=None, json_codec=None,
+               version_cache_expiry=None, **ignored_kwargs):
     """Get an authenticated client, based on the credentials.
 
     :param api_version: the API version to use. Valid value: '1'.
@@ -67,6 +72,49 @@ def get_client(api_version, os_auth_token=None, watcher_url=None,
         of conflict error
     :param session: Keystone session to use
     :param os_endpoint_override: watcher API endpoint
+    :param connect_timeout: timeout (in seconds) for establishing a
+        connection to the watcher API, overrides timeout
+    :param read_timeout: timeout (in seconds) for waiting on a response from
+        the watcher API, overrides timeout
+    :param pool_connections: number of connection pools (one per host) to
+        keep
+    :param pool_maxsize: maximum number of connections kept per host, set it
+        to at least the number of threads sharing the client
+    :param keep_alive: whether to reuse connections between requests,
+        defaults to True
+    :param retry_policy: a
+        :class:`watcherclient.common.httpclient.RetryPolicy` deciding how
+        failed requests are retried, overrides max_retries and retry_interval
+    :param rate_limiter: a
+        :class:`watcherclient.common.ratelimit.RateLimiter` limiting the rate
+        of the requests sent to the watcher API
+    :param catalog_cache: a :class:`watcherclient.common.cache.TTLCache`
+        caching the goals, strategies, scoring engines and services
+    :param response_cache: a
+        :class:`watcherclient.common.cache.ResponseCache` revalidating the
+        responses of the GET requests instead of downloading them again
+    :param single_flight: a
+        :class:`watcherclient.common.httpclient.SingleFlight` sharing one
+        request between the identical GET requests made at the same time
+    :param compact_lists: whether the list calls return read-only
+        :class:`watcherclient.common.base.Record` instances, which use less
+        memory than resources
+    :param intern_strings: whether the values repeated across the audits,
+        audit templates, action plans and actions of a list, e.g. their
+        state, share a single string
+    :param lazy_detail: whether reading an attribute missing from a resource
+        of a list without details loads the details of the whole list with
+        one request
+    :param lazy_lists: whether the list calls return a
+        :class:`watcherclient.common.base.LazyList`, a read-only sequence
+        building the resource of an item on access, rather than a list
+    :param json_codec: the JSON codec of the request and response bodies:
+        'json', 'orjson', 'ujson' or a
+        :class:`watcherclient.common.codec.JSONCodec`. Defaults to the
+        'json' codec of the standard library
+    :param version_cache_expiry: age, in seconds, after which the API version
+        cached for the endpoint is negotiated again, 0 to always negotiate
+        it. Defaults to 300
     :param ignored_kwargs: all the other params that are passed. Left for
         backwards compatibility. They are ignored.
     """
@@ -79,6 +127,26 @@ def get_client(api_version, os_auth_token=None, watcher_url=None,
         'max_retries': max_retries,
         'retry_interval': retry_interval,
     }
+    optional_kwargs = {
+        'connect_timeout': connect_timeout,
+        'read_timeout': read_timeout,
+        'pool_connections': pool_connections,
+        'pool_maxsize': pool_maxsize,
+        'keep_alive': keep_alive,
+        'retry_policy': retry_policy,
+        'rate_limiter': rate_limiter,
+        'catalog_cache': catalog_cache,
+        'response_cache': response_cache,
+        'single_flight': single_flight,
+        'compact_lists': compact_lists,
+        'intern_strings': intern_strings,
+        'lazy_detail': lazy_detail,
+        'lazy_lists': lazy_lists,
+        'json_codec': json_codec,
+        'version_cache_expiry': version_cache_expiry,
+    }
+    kwargs.update((k, v) for k, v in optional_kwargs.items()
+                  if v is not None)
     endpoint = watcher_url or os_endpoint_override
     cacert = os_cacert or ca_file
     cert = os_cert or cert_file
@@ -11,6 +11,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import logging
 import os
 import pkgutil
@@ -43,8 +44,8 @@ def allow_start_end_audit_time(requested_version):
     Version 1.1 of the API added support for start and end time of continuous
     audits.
     """
-    return (APIVersion(requested_version) >=
-            APIVersion(MINOR_1_START_END_TIMING))
+    return (get_interned_version(requested_version) >=
+            get_interned_version(MINOR_1_START_END_TIMING))
 
 
 def launch_audit_forced(requested_version):
@@ -52,8 +53,8 @@ def launch_audit_forced(requested_version):
 
     Version 1.2 of the API added support for force option.
     """
-    return (APIVersion(requested_version) >=
-            APIVersion(MINOR_2_FORCE_AUDIT))
+    return (get_interned_version(requested_version) >=
+            get_interned_version(MINOR_2_FORCE_AUDIT))
 
 
 def action_update_supported(requested_version):
@@ -61,8 +62,8 @@ def action_update_supported(requested_version):
 
     Version 1.5 of the API added support for updating action state.
     """
-    return (APIVersion(requested_version) >=
-            APIVersion(MINOR_5_ACTION_UPDATE))
+    return (get_interned_version(requested_version) >=
+            get_interned_version(MINOR_5_ACTION_UPDATE))
 
 
 def allow_audit_template_default_parameters(requested_version):
@@ -70,8 +71,8 @@ def allow_audit_template_default_parameters(requested_version):
 
     Version 1.7 of the API added default_parameters to AuditTemplate.
     """
-    return (APIVersion(requested_version) >=
-            APIVersion(MINOR_7_AUDIT_TEMPLATE_DEFAULT_PARAMS))
+    return (get_interned_version(requested_version) >=
+            get_interned_version(MINOR_7_AUDIT_TEMPLATE_DEFAULT_PARAMS))
 
 
 class APIVersion(object):
@@ -204,15 +205,32 @@ class APIVersion(object):
         return "%s.%s" % (self.ver_major, self.ver_minor)
 
 
-def get_available_major_versions():
+@functools.lru_cache(maxsize=128)
+def get_interned_version(version_str):
+    """Return a shared APIVersion object for the given version string.
+
+    APIVersion objects are never modified once created, so the parsed
+    result is cached and reused instead of running the version regex
+    again for every feature check.
+    """
+    return APIVersion(version_str)
+
+
+@functools.lru_cache(maxsize=None)
+def _discover_major_versions():
     # NOTE(andreykurilin): available clients version should not be
     # hardcoded, so let's discover them.
     matcher = re.compile(r"v[0-9]*$")
     submodules = pkgutil.iter_modules(
         [os.path.dirname(os.path.dirname(__file__))])
-    available_versions = [name[1:] for loader, name, ispkg in submodules
-                          if matcher.search(name)]
-    return available_versions
+    return tuple(name[1:] for loader, name, ispkg in submodules
+                 if matcher.search(name))
+
+
+def get_available_major_versions():
+    # NOTE: the package directory is only scanned once per process since
+    # this is called for every request made by the HTTP clients.
+    return list(_discover_major_versions())
 
 
 def check_major_version(api_version):
@@ -42,10 +42,14 @@ import copy
 from urllib import parse
 
 from oslo_utils import strutils
+import yaml
 
 from watcherclient._i18n import _
 from watcherclient.common.apiclient import exceptions
 
+# NOTE: the copy parameter of Resource.to_dict shadows the copy module
+_deepcopy = copy.deepcopy
+
 
 def getid(obj):
     """Return id if argument is a Resource.
@@ -435,6 +439,132 @@ class Extension(HookableMixin):
         return "<Extension '%s'>" % self.name
 
 
+def _freeze(value):
+    if isinstance(value, dict) and not isinstance(value, ReadOnlyDict):
+        return ReadOnlyDict(value)
+    if isinstance(value, list) and not isinstance(value, ReadOnlyList):
+        return ReadOnlyList(value)
+    return value
+
+
+class ReadOnlyList(list):
+    """Read-only list, returned for the lists nested in a ReadOnlyDict."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('%s is read-only' % self.__class__.__name__)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = _read_only
+    reverse = sort = _read_only
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ReadOnlyList(list.__getitem__(self, index))
+        return _freeze(list.__getitem__(self, index))
+
+    def __iter__(self):
+        return (_freeze(v) for v in list.__iter__(self))
+
+    def __reversed__(self):
+        return (_freeze(v) for v in list.__reversed__(self))
+
+    def __add__(self, other):
+        return list(self) + other
+
+    def __radd__(self, other):
+        return other + list(self)
+
+    def __mul__(self, count):
+        return list(self) * count
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        return list(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+
+class ReadOnlyDict(dict):
+    """Read-only dict of the attributes of a resource.
+
+    Returned by :meth:`Resource.to_dict` instead of a deep copy: only the
+    top level is copied, and the nested dicts and lists are returned
+    read-only, as a ReadOnlyDict and a ReadOnlyList, when they are read. Use
+    ``to_dict(copy=True)`` to get a dict which can be modified.
+
+    The copies made with ``copy()``, ``dict()`` or ``**`` can be modified
+    at the top level, but their nested dicts and lists are still
+    read-only.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('%s is read-only' % self.__class__.__name__)
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __getitem__(self, key):
+        return _freeze(dict.__getitem__(self, key))
+
+    def __iter__(self):
+        # NOTE: overriding __iter__ prevents dict() and ** from copying the
+        # nested values directly, they read them with __getitem__ instead
+        return dict.__iter__(self)
+
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return {**self, **other}
+
+    def __ror__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return {**other, **self}
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self):
+        return [_freeze(v) for v in dict.values(self)]
+
+    def items(self):
+        return [(k, _freeze(v)) for k, v in dict.items(self)]
+
+    def copy(self):
+        return dict(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+# NOTE: the read-only containers are dumped as plain YAML mappings and
+# sequences, e.g. by the exporters and the yaml formatter of the CLI,
+# rather than rejected by the safe dumpers or tagged as Python objects
+for _dumper in (yaml.SafeDumper, yaml.Dumper):
+    _dumper.add_representer(
+        ReadOnlyDict, lambda dumper, data: dumper.represent_dict(data))
+    _dumper.add_representer(
+        ReadOnlyList, lambda dumper, data: dumper.represent_list(data))
+
+
 class Resource(object):
     """Base class for OpenStack resources (tenant, user, etc.).
 
@@ -528,5 +658,12 @@ class Resource(object):
     def set_loaded(self, val):
         self._loaded = val
 
-    def to_dict(self):
-        return copy.deepcopy(self._info)
+    def to_dict(self, copy=False):
+        """Return the attributes of the resource.
+
+        :param copy: whether to return a deep copy which can be modified,
+            rather than a :class:`ReadOnlyDict`.
+        """
+        if copy:
+            return _deepcopy(self._info)
+        return ReadOnlyDict(self._info)
@@ -396,6 +396,14 @@ class ServiceUnavailable(HttpServerError):
     http_status = 503
     message = _("Service Unavailable")
 
+    def __init__(self, *args, **kwargs):
+        try:
+            self.retry_after = int(kwargs.pop('retry_after'))
+        except (KeyError, ValueError):
+            self.retry_after = 0
+
+        super(ServiceUnavailable, self).__init__(*args, **kwargs)
+
 
 class GatewayTimeout(HttpServerError):
     """HTTP 504 - Gateway Timeout.
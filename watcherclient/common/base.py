@@ -18,10 +18,32 @@
 Base utilities to build API operation managers and objects on top of.
 """
 
+import asyncio
+import collections.abc
+from concurrent import futures
 import copy
+import functools
+import itertools
+import operator
+import queue
+import sys
+import threading
 from urllib import parse as urlparse
 
 from watcherclient.common.apiclient import base
+from watcherclient.common import httpclient
+from watcherclient.common import ratelimit
+
+# NOTE: the copy parameter of the to_dict methods shadows the copy module
+_deepcopy = copy.deepcopy
+
+# Maximum time, in seconds, waited for the thread prefetching the pages of
+# a list to exit once the iteration stops
+PREFETCH_JOIN_TIMEOUT = 1
+
+# NOTE: kept below the default size of the connection pool of the HTTP
+# clients, so that every worker reuses a pooled connection.
+DEFAULT_MAX_WORKERS = 8
 
 
 def getid(obj):
@@ -33,12 +55,253 @@ def getid(obj):
     return getattr(obj, 'id', obj)
 
 
+def _intern_fields(data, fields):
+    """Intern in place the string values of fields in the items of data."""
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        for field in fields:
+            value = item.get(field)
+            if isinstance(value, str):
+                item[field] = sys.intern(value)
+            elif isinstance(value, list):
+                for index, element in enumerate(value):
+                    if isinstance(element, str):
+                        value[index] = sys.intern(element)
+
+
 class Manager(object):
     """Provides  CRUD operations with a particular API."""
     resource_class = None
+    # The fields of the listed resources whose values are interned
+    interned_fields = ()
 
-    def __init__(self, api):
+    def __init__(self, api, cache=None, compact=False, intern=False,
+                 lazy_detail=False, lazy_lists=False):
         self.api = api
+        # An optional watcherclient.common.cache.TTLCache of the GET
+        # responses, for the resources which rarely change
+        self.cache = cache
+        # Whether the list calls return Record instances rather than
+        # resource_class instances
+        self.compact = compact
+        # Whether the values of interned_fields are interned, so that the
+        # values repeated across a list share a single string
+        self.intern = intern
+        # Whether the resources of the short lists load the details of the
+        # whole list with one request when a missing attribute is read
+        self.lazy_detail = lazy_detail
+        # Whether the list calls return a LazyList building the resources
+        # on access rather than a list
+        self.lazy_lists = lazy_lists
+
+    def _list_class(self, response_key):
+        # NOTE: only the lists are compacted, the responses without
+        # response_key are single resources returned by get().
+        if self.compact and response_key:
+            return RecordFactory()
+        return self.resource_class
+
+    def _cache_key(self, url):
+        # NOTE: the session clients have no endpoint attribute, their
+        # endpoint is resolved from the session, e.g. the service catalog,
+        # so that the caches shared by several clouds do not mix them up
+        api = self.api
+        if hasattr(api, '_version_cache_endpoint'):
+            endpoint = api._version_cache_endpoint()
+            version = api._get_api_version_header()
+        else:
+            endpoint = getattr(api, 'endpoint', None)
+            version = getattr(api, 'os_infra_optim_api_version', None)
+        return ' '.join([url, str(version), str(endpoint)])
+
+    def _get_json(self, url):
+        if self.cache is None:
+            resp, body = self.api.json_request('GET', url)
+            return body
+
+        body = self.cache.get(self._cache_key(url))
+        if body is None:
+            resp, body = self.api.json_request('GET', url)
+            self.cache.set(self._cache_key(url), body)
+        # NOTE: the resources built from the body may be modified
+        return copy.deepcopy(body)
+
+    def hydrate(self, resources):
+        """Load the details of several resources with one request.
+
+        Instead of one GET request per resource, the detailed list of the
+        resources of this manager is requested, following the pagination
+        until all the resources are found, and the resources are updated
+        in place.
+
+        :param resources: the resources to load, e.g. the result of a list
+            call without ``detail``. The read-only records of the compact
+            lists can only be loaded in a :class:`LazyList`, returned by
+            the list calls with ``lazy_lists``.
+        :returns: resources.
+        """
+        if isinstance(resources, LazyList):
+            resources.hydrate()
+            return resources
+
+        if not isinstance(resources, list):
+            resources = list(resources)
+        self._load_details([r._info for r in resources],
+                           self._path('detail'),
+                           self._path().rstrip('/').rsplit('/', 1)[-1])
+        for resource in resources:
+            resource._add_details(resource._info)
+            resource.set_loaded(True)
+        return resources
+
+    def _load_details(self, infos, url, response_key):
+        """Update infos with the items of the detailed list at url."""
+        pending = {}
+        for info in infos:
+            key = info.get('uuid', info.get('id'))
+            if key is not None:
+                pending.setdefault(key, []).append(info)
+        if not pending:
+            return
+
+        for item in self._iter_data(url, response_key, None, 0):
+            for info in pending.pop(item.get('uuid', item.get('id')), ()):
+                info.update(item)
+            if not pending:
+                return
+
+    @staticmethod
+    def _detail_url(url):
+        """Return the URL of the detailed version of the list at url."""
+        parts = urlparse.urlsplit(url)
+        path = parts.path.rstrip('/')
+        if path.endswith('/detail'):
+            return None
+        return urlparse.urlunsplit(('', '', path + '/detail', parts.query,
+                                    ''))
+
+    def _new_list(self, url, response_key, obj_class, data):
+        lazy = (self.lazy_detail and bool(response_key) and
+                isinstance(obj_class, type) and
+                issubclass(obj_class, Resource))
+        if not (lazy or self.lazy_lists):
+            return [obj_class(self, item, loaded=True) for item in data]
+
+        objects = LazyList(self, obj_class, data, response_key=response_key,
+                           detail_url=self._detail_url(url), lazy=lazy)
+        if self.lazy_lists:
+            return objects
+        # NOTE: the resources are bound to the LazyList keeping the items,
+        # which loads their details on first miss
+        return list(objects)
+
+    def invalidate_cache(self):
+        """Drop the cached responses of this manager, if it has a cache."""
+        if self.cache is not None:
+            self.cache.invalidate(self._path())
+
+    def get_many(self, ids, max_workers=None, limiter=None):
+        """Retrieve several resources concurrently.
+
+        Calls the ``get`` method of the manager for each of the ``ids`` on
+        a pool of at most ``max_workers`` threads sharing the connection
+        pool of the client.
+
+        :param ids: the UUIDs (or names) of the resources to retrieve.
+        :param max_workers: maximum number of concurrent requests. Defaults
+            to DEFAULT_MAX_WORKERS, or to the ``max_limit`` of ``limiter``.
+        :param limiter: an optional
+            :class:`watcherclient.common.ratelimit.AdaptiveConcurrencyLimiter`
+            adapting the number of concurrent requests to the load of the
+            Watcher API.
+        :returns: a list with, in the order of ``ids``, the resource or the
+            exception raised while retrieving it, so that one failure does
+            not abort the whole batch.
+        """
+        return self._run_many(self.get, ids, max_workers, limiter=limiter)
+
+    def delete_many(self, ids, max_workers=None, rate=None, limiter=None):
+        """Delete several resources concurrently.
+
+        Calls the ``delete`` method of the manager for each of the ``ids``
+        on a pool of at most ``max_workers`` threads.
+
+        :param ids: the UUIDs (or names) of the resources to delete.
+        :param max_workers: maximum number of concurrent requests. Defaults
+            to DEFAULT_MAX_WORKERS, or to the ``max_limit`` of ``limiter``.
+        :param rate: maximum number of deletions started per second. None
+            does not limit the rate.
+        :param limiter: an optional
+            :class:`watcherclient.common.ratelimit.AdaptiveConcurrencyLimiter`
+            adapting the number of concurrent requests to the load of the
+            Watcher API.
+        :returns: a list with, in the order of ``ids``, None or the
+            exception raised while deleting the resource.
+        """
+        return self._run_many(self.delete, ids, max_workers, rate, limiter)
+
+    def update_many(self, patches, max_workers=None, rate=None,
+                    limiter=None):
+        """Update several resources concurrently.
+
+        Calls the ``update`` method of the manager for each resource on a
+        pool of at most ``max_workers`` threads.
+
+        :param patches: a list of (UUID or name, patch) pairs, or a dict
+            mapping the UUIDs (or names) of the resources to their patch.
+        :param max_workers: maximum number of concurrent requests. Defaults
+            to DEFAULT_MAX_WORKERS, or to the ``max_limit`` of ``limiter``.
+        :param rate: maximum number of updates started per second. None
+            does not limit the rate.
+        :param limiter: an optional
+            :class:`watcherclient.common.ratelimit.AdaptiveConcurrencyLimiter`
+            adapting the number of concurrent requests to the load of the
+            Watcher API.
+        :returns: a list with, in the order of ``patches``, the updated
+            resource or the exception raised while updating it.
+        """
+        if isinstance(patches, dict):
+            patches = patches.items()
+        return self._run_many(lambda args: self.update(*args), patches,
+                              max_workers, rate, limiter)
+
+    def _run_many(self, func, items, max_workers=None, rate=None,
+                  limiter=None):
+        items = list(items)
+        if not items:
+            return []
+        if max_workers is None:
+            max_workers = (DEFAULT_MAX_WORKERS if limiter is None
+                           else limiter.max_limit)
+
+        bucket = ratelimit.TokenBucket(rate, burst=1) if rate else None
+        stats = getattr(self.api, 'retry_stats', None)
+        if not isinstance(stats, httpclient.RetryStats):
+            stats = None
+
+        def _call(item):
+            if bucket is not None:
+                bucket.acquire()
+            token = limiter.acquire() if limiter is not None else None
+            if stats is not None:
+                stats.clear_last()
+            error = None
+            try:
+                return func(item)
+            except Exception as e:
+                error = e
+                return e
+            finally:
+                if limiter is not None:
+                    # NOTE: the latency of the last attempt of the request
+                    # is used, without the retries and their backoff
+                    limiter.release(token, error, latency=(
+                        stats.last_latency if stats is not None else None))
+
+        with futures.ThreadPoolExecutor(
+                max_workers=min(int(max_workers), len(items))) as executor:
+            return list(executor.map(_call, items))
 
     def _create(self, url, body):
         resp, body = self.api.json_request('POST', url, body=body)
@@ -57,10 +320,13 @@ class Manager(object):
         if not isinstance(data, list):
             data = [data]
 
+        if self.intern and self.interned_fields:
+            _intern_fields(data, self.interned_fields)
+
         return data
 
     def _list_pagination(self, url, response_key=None, obj_class=None,
-                         limit=None):
+                         limit=None, prefetch=0):
         """Retrieve a list of items.
 
         The Watcher API is configured to return a maximum number of
@@ -76,50 +342,157 @@ class Manager(object):
         :param obj_class: class for constructing the returned objects.
         :param limit: maximum number of items to return. If None returns
             everything.
+        :param prefetch: number of pages to fetch ahead on a background
+            thread while the current page is being processed. 0 disables
+            prefetching.
 
         """
         if obj_class is None:
-            obj_class = self.resource_class
+            obj_class = self._list_class(response_key)
+
+        items = self._iter_data(url, response_key, limit, prefetch)
+        try:
+            data = list(items)
+        finally:
+            items.close()
+        return self._new_list(url, response_key, obj_class, data)
+
+    def _iter_pagination(self, url, response_key=None, obj_class=None,
+                         limit=None, prefetch=0):
+        """Retrieve an iterator over items, one page at a time.
 
+        This behaves like :meth:`_list_pagination` but yields the objects
+        as each page arrives instead of accumulating them, so only one
+        page is held in memory at a time. The first page is requested
+        before returning so that API errors are raised to the caller
+        rather than on first iteration.
+
+        :param url: a partial URL, e.g. '/nodes'
+        :param response_key: the key to be looked up in response
+            dictionary, e.g. 'nodes'
+        :param obj_class: class for constructing the returned objects.
+        :param limit: maximum number of items to return. If None returns
+            everything.
+        :param prefetch: number of pages to fetch ahead on a background
+            thread while the current page is being processed. 0 disables
+            prefetching.
+        :returns: a :class:`ListIterator` of ``obj_class`` instances. The
+            callers which stop iterating before the end should close it,
+            so that the pages are no longer prefetched.
+        """
+        if obj_class is None:
+            obj_class = self._list_class(response_key)
+
+        data = self._iter_data(url, response_key, limit, prefetch)
+        return ListIterator(self, obj_class, data)
+
+    def _iter_data(self, url, response_key, limit, prefetch):
+        """Request the first page and return an iterator over the items."""
         if limit is not None:
             limit = int(limit)
 
-        object_list = []
-        object_count = 0
-        limit_reached = False
-        while url:
-            resp, body = self.api.json_request('GET', url)
-            data = self._format_body_data(body, response_key)
-            for obj in data:
-                object_list.append(obj_class(self, obj, loaded=True))
-                object_count += 1
-                if limit and object_count >= limit:
-                    # break the for loop
-                    limit_reached = True
-                    break
+        body = self._get_json(url)
+        if prefetch:
+            pages = self._iter_pages_prefetch(body, response_key,
+                                              int(prefetch))
+        else:
+            pages = self._iter_pages(body, response_key)
+        return self._iter_items(pages, limit)
 
-            # break the while loop and return
-            if limit_reached:
-                break
+    def _iter_pages(self, body, response_key):
+        """Yield the data of each page, following the 'next' links."""
+        while True:
+            yield self._format_body_data(body, response_key)
 
             url = body.get('next')
-            if url:
-                # NOTE(lucasagomes): We need to edit the URL to remove
-                # the scheme and netloc
-                url_parts = list(urlparse.urlparse(url))
-                url_parts[0] = url_parts[1] = ''
-                url = urlparse.urlunparse(url_parts)
+            if not url:
+                return
+            body = self._get_json(self._strip_next_url(url))
+
+    def _iter_pages_prefetch(self, body, response_key, depth):
+        """Yield the data of each page, fetching the next ones in advance.
 
-        return object_list
+        The 'next' links are followed by a worker thread which keeps up to
+        ``depth`` pages ready, so that the round trip for page N+1 overlaps
+        with the processing of page N by the caller.
+        """
+        pages = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+
+        def _put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def _fetch(url):
+            try:
+                while url and not stop.is_set():
+                    next_body = self._get_json(self._strip_next_url(url))
+                    _put((next_body, None))
+                    url = next_body.get('next')
+            except Exception as e:
+                _put((None, e))
+            else:
+                _put((None, None))
+
+        worker = threading.Thread(target=_fetch, args=(body.get('next'),),
+                                  daemon=True)
+        worker.start()
+        try:
+            yield self._format_body_data(body, response_key)
+            while True:
+                body, error = pages.get()
+                if error is not None:
+                    raise error
+                if body is None:
+                    return
+                yield self._format_body_data(body, response_key)
+        finally:
+            # NOTE: stop the worker when the caller stops iterating before
+            # the last page, e.g. once the limit is reached, and drop the
+            # pages it fetched in advance.
+            stop.set()
+            while True:
+                try:
+                    pages.get_nowait()
+                except queue.Empty:
+                    break
+            worker.join(PREFETCH_JOIN_TIMEOUT)
+
+    def _iter_items(self, pages, limit):
+        object_count = 0
+        try:
+            for data in pages:
+                for obj in data:
+                    yield obj
+                    object_count += 1
+                    if limit and object_count >= limit:
+                        return
+        finally:
+            # NOTE: do not rely on the garbage collector to stop the
+            # prefetching of the pages
+            pages.close()
+
+    @staticmethod
+    def _strip_next_url(url):
+        # NOTE(lucasagomes): We need to edit the URL to remove
+        # the scheme and netloc
+        url_parts = list(urlparse.urlparse(url))
+        url_parts[0] = url_parts[1] = ''
+        return urlparse.urlunparse(url_parts)
 
     def _list(self, url, response_key=None, obj_class=None, body=None):
-        resp, body = self.api.json_request('GET', url)
+        body = self._get_json(url)
 
         if obj_class is None:
-            obj_class = self.resource_class
+            obj_class = self._list_class(response_key)
 
         data = self._format_body_data(body, response_key)
-        return [obj_class(self, res, loaded=True) for res in data if res]
+        return self._new_list(url, response_key, obj_class,
+                              [res for res in data if res])
 
     def _update(self, url, body, method='PATCH', response_key=None):
         resp, body = self.api.json_request(method, url, body=body)
@@ -136,11 +509,336 @@ class Manager(object):
             return self.resource_class(self, body)
 
 
+class ListIterator(object):
+    """Iterator over the resources of a paginated list.
+
+    Builds the resources of the items as they are read. :meth:`close`
+    stops the iteration and the prefetching of the next pages, if any, so
+    the callers which stop iterating before the end should close the
+    iterator, or use it as a context manager, rather than let the garbage
+    collector do it.
+    """
+
+    def __init__(self, manager, obj_class, items):
+        self._manager = manager
+        self._obj_class = obj_class
+        self._items = items
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self._obj_class(self._manager, next(self._items),
+                               loaded=True)
+
+    def close(self):
+        """Stop the iteration and the prefetching of the pages."""
+        self._items.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LazyList(collections.abc.Sequence):
+    """List of resources built on first access.
+
+    Keeps the decoded items of a list response and only builds the
+    resource of an item when it is accessed, so that the callers which
+    only read a few items, or which only count them, do not pay for
+    building all of them. Once built, a resource is kept and returned by
+    the next accesses.
+
+    :meth:`hydrate` loads the details of all the items with a single
+    request to ``detail_url``. When the list is ``lazy``, its resources are
+    not loaded and reading a missing attribute of one of them hydrates the
+    whole list.
+
+    :param manager: the :class:`Manager` the resources are bound to.
+    :param obj_class: class for constructing the resources.
+    :param data: the list of the decoded items.
+    :param response_key: the key of the items in the responses.
+    :param detail_url: the URL of the detailed list of the items, or None
+        if the items are already detailed.
+    :param lazy: whether the resources are hydrated on first miss.
+    """
+
+    __slots__ = ('_manager', '_obj_class', '_data', '_objects',
+                 '_response_key', '_detail_url', '_lazy', '_lock')
+
+    def __init__(self, manager, obj_class, data, response_key=None,
+                 detail_url=None, lazy=False):
+        self._manager = manager
+        self._obj_class = obj_class
+        self._data = data
+        self._objects = [None] * len(data)
+        self._response_key = response_key
+        self._detail_url = detail_url
+        self._lazy = lazy and detail_url is not None
+        self._lock = threading.Lock()
+
+    def _get(self, index):
+        obj = self._objects[index]
+        if obj is None:
+            with self._lock:
+                # NOTE: another thread may have built it while this one
+                # was waiting for the lock
+                obj = self._objects[index]
+                if obj is None:
+                    obj = self._obj_class(self._manager, self._data[index],
+                                          loaded=not self._lazy)
+                    if self._lazy:
+                        obj._lazy_list = self
+                    self._objects[index] = obj
+        return obj
+
+    def hydrate(self):
+        """Load the details of all the items with one request."""
+        with self._lock:
+            if self._detail_url is None:
+                return
+            self._manager._load_details(self._data, self._detail_url,
+                                        self._response_key)
+            self._detail_url = None
+            self._lazy = False
+            for index, obj in enumerate(self._objects):
+                if isinstance(obj, base.Resource):
+                    obj.__dict__.pop('_lazy_list', None)
+                    obj._add_details(obj._info)
+                    obj.set_loaded(True)
+                else:
+                    # NOTE: the records are read-only, they are built
+                    # again from the detailed items on next access
+                    self._objects[index] = None
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('list index out of range')
+        return self._get(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._get(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, LazyList)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class ExecutorManager(object):
+    """Exposes the operations of a :class:`Manager` to asyncio code.
+
+    The public methods of the wrapped manager (``get``, ``list``,
+    ``create``...) are returned as coroutine functions taking the same
+    arguments. This is not an asynchronous transport: each call runs the
+    synchronous method on ``executor`` and occupies one of its threads
+    until the response is received, so that the event loop is not blocked.
+    ``iter`` returns an asynchronous iterator.
+
+    :param manager: the :class:`Manager` to wrap.
+    :param executor: the :class:`concurrent.futures.Executor` running the
+        requests. None uses the default executor of the event loop.
+    :param chunk_size: number of items fetched by each call to the
+        executor when iterating.
+    """
+
+    def __init__(self, manager, executor=None, chunk_size=100):
+        self.manager = manager
+        self.executor = executor
+        self.chunk_size = chunk_size
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self.manager, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self._run(attr, *args, **kwargs)
+
+        return wrapper
+
+    async def iter(self, *args, **kwargs):
+        """Asynchronously iterate over the items of the wrapped manager.
+
+        Takes the same parameters as the ``iter`` method of the manager, or
+        its ``list`` method if it has none. Pages are requested on the
+        executor as the iteration progresses.
+        """
+        func = getattr(self.manager, 'iter', None)
+        if func is None:
+            func = self.manager.list
+        items = await self._run(lambda: iter(func(*args, **kwargs)))
+        try:
+            while True:
+                chunk = await self._run(
+                    lambda: list(itertools.islice(items, self.chunk_size)))
+                for item in chunk:
+                    yield item
+                if len(chunk) < self.chunk_size:
+                    return
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                await self._run(close)
+
+
+class Record(tuple):
+    """Read-only, compact representation of a listed resource.
+
+    The attributes of a record are read like the ones of a
+    :class:`Resource`, but a record is a tuple of the values, like a named
+    tuple: it has neither a ``__dict__`` nor a reference to its manager,
+    and the mapping of the field names to their index is shared by the
+    records of a list. The dict of the values is only built by
+    :meth:`to_dict`.
+
+    The fields named like a method of tuple, e.g. ``count`` or ``index``,
+    are read like the other ones. The resources with a field named like an
+    attribute of the record itself, e.g. ``to_dict``, or starting with an
+    underscore are not compacted (see :class:`RecordFactory`).
+    """
+
+    __slots__ = ()
+    _fields = {}
+
+    def __getattr__(self, name):
+        try:
+            return self[self._fields[name]]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __reduce__(self):
+        return _make_record, (tuple(self._fields), tuple(self))
+
+    def __repr__(self):
+        info = ", ".join("%s=%s" % (k, self[i])
+                         for k, i in sorted(self._fields.items()))
+        return "<Record %s>" % info
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return dict(zip(self._fields, self)) == dict(zip(other._fields,
+                                                         other))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __dir__(self):
+        return sorted(set(dir(self.__class__)) | set(self._fields))
+
+    def to_dict(self, copy=False):
+        """Return the fields of the record.
+
+        :param copy: whether to return a deep copy which can be modified,
+            rather than a read-only dict.
+        """
+        info = dict(zip(self._fields, self))
+        if copy:
+            return _deepcopy(info)
+        return base.ReadOnlyDict(info)
+
+
+def _is_record_field(key):
+    """Return whether a field can be an attribute of a Record."""
+    return not key.startswith('_') and key not in vars(Record)
+
+
+def _record_class(keys):
+    fields = {k: i for i, k in enumerate(keys)}
+    attrs = {'__slots__': (), '_fields': fields}
+    # NOTE: __getattr__ is not called for the fields named like a method of
+    # tuple, e.g. count or index, so they are read by properties
+    for key, index in fields.items():
+        if hasattr(tuple, key):
+            attrs[key] = property(operator.itemgetter(index))
+    return type('Record', (Record,), attrs)
+
+
+def _make_record(keys, values):
+    return _record_class(keys)(values)
+
+
+class RecordFactory(object):
+    """Builds the :class:`Record` instances of a list.
+
+    Takes the same arguments as a resource class, so that it can be used as
+    the ``obj_class`` of :meth:`Manager._list`. The records with the same
+    fields share their class, which maps the field names to their index.
+    The resources with a field which cannot be read from a record are
+    built with the resource class of the manager instead.
+    """
+
+    def __init__(self):
+        self._classes = {}
+
+    def __call__(self, manager, info, loaded=True):
+        keys = tuple(info)
+        try:
+            record_class = self._classes[keys]
+        except KeyError:
+            record_class = self._classes.setdefault(
+                keys, _record_class(keys)
+                if all(_is_record_field(key) for key in keys) else None)
+        if record_class is None:
+            return manager.resource_class(manager, info, loaded=loaded)
+        return record_class(info.values())
+
+
 class Resource(base.Resource):
     """Represents a particular instance of an object (tenant, user, etc).
 
     This is pretty much just a bag for attributes.
     """
 
-    def to_dict(self):
-        return copy.deepcopy(self._info)
+    # The attributes whose absence does not load the details of a lazy
+    # list, besides the private ones: they are probed by getid(), hasattr()
+    # and __eq__() and are never added by the details
+    _not_lazy_loaded = frozenset(['id'])
+
+    def __getattr__(self, k):
+        if ('_lazy_list' in self.__dict__ and
+                (k.startswith('_') or k in self._not_lazy_loaded)):
+            raise AttributeError(k)
+        return super(Resource, self).__getattr__(k)
+
+    def get(self):
+        lazy_list = self.__dict__.get('_lazy_list')
+        if lazy_list is None:
+            return super(Resource, self).get()
+        # NOTE: load the details of the whole list rather than of this
+        # resource only, with one request
+        self.set_loaded(True)
+        lazy_list.hydrate()
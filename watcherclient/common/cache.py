@@ -0,0 +1,349 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cache of the responses of the Watcher API which rarely change.
+
+Goals, strategies, scoring engines and services only change when Watcher is
+upgraded or reconfigured, so their managers can be given a
+:class:`TTLCache` to serve repeated requests locally. The HTTP clients can
+also be given a :class:`ResponseCache` to revalidate the responses of any
+GET request instead of downloading them again.
+"""
+
+import atexit
+import collections
+import logging
+import os
+import threading
+import time
+import weakref
+
+from watcherclient.common import filecache
+from watcherclient.common import utils
+
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 256
+# Time (in seconds) after which a cached response is requested again
+DEFAULT_TTL = 3600
+CACHE_FILENAME = 'catalog.json'
+# Time (in seconds) during which a response without validator is reused
+DEFAULT_RESPONSE_TTL = 10
+# Minimum time (in seconds) between two writes of a persisted cache
+DEFAULT_SAVE_INTERVAL = 5
+
+# The collections whose resources are changed by the server when a resource
+# of another collection is modified, e.g. starting an action plan changes
+# the state of its actions
+RELATED_COLLECTIONS = {
+    'action_plans': ('actions',),
+    'actions': ('action_plans',),
+    'audits': ('action_plans', 'actions'),
+    'webhooks': ('audits', 'action_plans', 'actions'),
+}
+
+# The persisted caches, whose pending changes are written at exit
+_persisted = weakref.WeakSet()
+
+
+def _valid_entry(entry):
+    """Return whether an entry read from a cache file is well formed."""
+    return (isinstance(entry, dict) and
+            isinstance(entry.get('timestamp'), (int, float)) and
+            not isinstance(entry['timestamp'], bool))
+
+
+class TTLCache(object):
+    """Thread-safe LRU cache whose entries expire.
+
+    :param maxsize: maximum number of entries; the least recently used
+        entries are evicted first.
+    :param ttl: time (in seconds) after which an entry expires.
+    :param persist: whether to also store the entries in a file, so that
+        they can be reused by other processes.
+    :param path: the file storing the entries. Defaults to ``catalog.json``
+        in the cache directory of the client.
+    :param save_interval: minimum time (in seconds) between two writes of
+        the file. The changes made in between are written by the next
+        change after this interval, by :meth:`flush` or at exit.
+
+    The file is shared by the processes using the same path: its entries
+    are merged with the ones of the cache on every write, the most recent
+    entry of a key winning.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL,
+                 persist=False, path=None,
+                 save_interval=DEFAULT_SAVE_INTERVAL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.save_interval = save_interval
+        self.path = None
+        if persist or path:
+            self.path = path or os.path.join(filecache.CACHE_DIR,
+                                             CACHE_FILENAME)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        # The changes not written to the file yet
+        self._dirty = False
+        self._invalidations = []
+        self._saved = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path:
+            self._load()
+            _persisted.add(self)
+        utils.register_after_fork(self)
+
+    def after_fork(self):
+        """Replace the locks possibly held when the process forked."""
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def _load(self):
+        now = time.time()
+        # NOTE: the entries of a corrupted file are ignored, like the
+        # corrupted files themselves
+        entries = [(entry['timestamp'], key, entry.get('data'))
+                   for key, entry in filecache.read_json(self.path).items()
+                   if _valid_entry(entry)]
+        for timestamp, key, data in sorted(entries, key=lambda e: e[0]):
+            if now - timestamp <= self.ttl:
+                self._entries[key] = (timestamp, data)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _changed(self):
+        """Record a change, and return whether the file must be written.
+
+        Must be called with the lock held.
+        """
+        if not self.path:
+            return False
+        self._dirty = True
+        return (self._saved is None or
+                time.monotonic() - self._saved >= self.save_interval)
+
+    def _merge(self, stored, entries, invalidations):
+        now = time.time()
+        merged = {}
+        for key, entry in stored.items():
+            if not _valid_entry(entry):
+                continue
+            timestamp = entry['timestamp']
+            if now - timestamp > self.ttl:
+                continue
+            # NOTE: the entries invalidated by this process must not be
+            # brought back, unless another process stored them since.
+            if any(key.startswith(prefix) and timestamp <= invalidated
+                   for prefix, invalidated in invalidations):
+                continue
+            merged[key] = entry
+        for key, (timestamp, data) in entries.items():
+            if merged.get(key, {}).get('timestamp', 0) <= timestamp:
+                merged[key] = {'timestamp': timestamp, 'data': data}
+        if len(merged) > self.maxsize:
+            recent = sorted(merged, key=lambda key: merged[key]['timestamp'])
+            for key in recent[:len(merged) - self.maxsize]:
+                del merged[key]
+        return merged
+
+    def flush(self):
+        """Write the pending changes to the file, if any."""
+        if not self.path:
+            return
+        # NOTE: the file is read and written without holding the lock of
+        # the entries, so that the readers of the cache never wait for it.
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                entries = collections.OrderedDict(self._entries)
+                invalidations = self._invalidations
+                self._dirty = False
+                self._invalidations = []
+                self._saved = time.monotonic()
+            try:
+                filecache.write_json(
+                    self.path,
+                    self._merge(filecache.read_json(self.path), entries,
+                                invalidations))
+            except OSError as e:
+                LOG.debug('Unable to write the cache %s: %s', self.path, e)
+
+    def get(self, key, default=None):
+        """Return the value cached for key, or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """Cache a value, which must be serializable to JSON if persisted."""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            save = self._changed()
+        if save:
+            self.flush()
+
+    def invalidate(self, prefix=None):
+        """Drop the entries whose key starts with prefix, or all of them."""
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries
+                            if key.startswith(prefix)]:
+                    del self._entries[key]
+            if self.path:
+                self._invalidations.append((prefix or '', time.time()))
+            save = self._changed()
+        if save:
+            self.flush()
+
+    def stats(self):
+        """Return the counters of the cache as a dict."""
+        with self._lock:
+            return {'size': len(self._entries),
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+
+@atexit.register
+def _flush_all():
+    for ttl_cache in list(_persisted):
+        ttl_cache.flush()
+
+
+class ResponseCache(object):
+    """Cache of the responses of GET requests.
+
+    A response with an ``ETag`` or a ``Last-Modified`` header is revalidated
+    by sending the next identical request with an ``If-None-Match`` or an
+    ``If-Modified-Since`` header; when the server answers with a 304, the
+    cached body is returned instead of downloading it again. A response
+    without these validators is reused without any request for ``ttl``
+    seconds.
+
+    The raw bodies are cached, and decoded again on every use so that each
+    caller gets its own copy. They are cached per URL, API version and
+    scope, i.e. endpoint and authentication token, so that the responses
+    are not shared by the clients of other endpoints or users. The
+    responses of a collection, and of the collections it affects (see
+    ``RELATED_COLLECTIONS``), are dropped when a request modifies it.
+
+    :param maxsize: maximum number of responses cached; the least recently
+        used ones are evicted first.
+    :param ttl: time (in seconds) during which a response without
+        validator is reused.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_RESPONSE_TTL):
+        self.ttl = ttl
+        # NOTE: the responses with validators never expire since they are
+        # revalidated on every use
+        self._cache = TTLCache(maxsize=maxsize, ttl=float('inf'))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        utils.register_after_fork(self)
+
+    def after_fork(self):
+        """Replace the lock possibly held when the process forked."""
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url, version, scope):
+        return '%s %s %s' % (url, version, scope)
+
+    def lookup(self, url, version, scope=None):
+        """Find the cached response of a request.
+
+        :returns: a tuple with the cache entry, or None, and whether it can
+            be used without sending the request.
+        """
+        entry = self._cache.get(self._key(url, version, scope))
+        if entry is None:
+            return None, False
+        with self._lock:
+            if entry['etag'] or entry['last_modified']:
+                return entry, False
+            if time.time() - entry['timestamp'] <= self.ttl:
+                self.hits += 1
+                return entry, True
+        return None, False
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Return the headers revalidating a cache entry."""
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, version, resp, content, scope=None):
+        """Cache the response of a request and its raw body."""
+        with self._lock:
+            self.misses += 1
+        self._cache.set(self._key(url, version, scope), {
+            'timestamp': time.time(),
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'resp': resp,
+            'content': content})
+
+    def revalidated(self, entry):
+        """Record that the server confirmed a cache entry is up to date."""
+        with self._lock:
+            entry['timestamp'] = time.time()
+            self.revalidations += 1
+
+    def invalidate(self, url=None):
+        """Drop the responses of the collection of url, or all of them.
+
+        The responses of the collections affected by a change of this one
+        are dropped as well.
+        """
+        if url is None:
+            self._cache.invalidate()
+            return
+        # e.g. /v1/audits/<uuid>?... is in the /v1/audits collection
+        parts = url.split('?')[0].split('/')
+        prefix, collection = '/'.join(parts[:2]), '/'.join(parts[2:3])
+        for name in (collection,) + RELATED_COLLECTIONS.get(collection, ()):
+            self._cache.invalidate('%s/%s' % (prefix, name))
+
+    def stats(self):
+        """Return the counters of the cache as a dict."""
+        with self._lock:
+            return {'size': self._cache.stats()['size'],
+                    'hits': self.hits,
+                    'revalidations': self.revalidations,
+                    'misses': self.misses}
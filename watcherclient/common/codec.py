@@ -0,0 +1,127 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+JSON codecs encoding the request bodies and decoding the response bodies.
+
+The codec of the standard library is used by default. The ``orjson`` and
+``ujson`` codecs are faster and can be selected by name when these libraries
+are installed.
+"""
+
+import json
+
+from oslo_serialization import jsonutils
+from oslo_utils import importutils
+
+orjson = importutils.try_import('orjson')
+ujson = importutils.try_import('ujson')
+
+
+class JSONCodec(object):
+    """JSON codec of the standard library.
+
+    The values which are not JSON types, e.g. datetimes, are converted like
+    ``oslo_serialization.jsonutils`` does.
+    """
+
+    name = 'json'
+
+    def encode(self, obj):
+        """Return obj encoded as UTF-8 JSON bytes."""
+        return json.dumps(obj, default=jsonutils.to_primitive).encode(
+            'utf-8')
+
+    def decode(self, data):
+        """Return the object decoded from JSON bytes or string.
+
+        :raises ValueError: if data is not valid JSON.
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on ``orjson``.
+
+    The objects which ``orjson`` cannot encode, e.g. the integers larger
+    than 64 bits, and the data it cannot decode, e.g. ``NaN`` and
+    ``Infinity``, are handled by the codec of the standard library. Unlike
+    it, ``orjson`` encodes ``NaN`` and ``Infinity`` as ``null`` and decodes
+    the integers larger than 64 bits as floats.
+    """
+
+    name = 'orjson'
+
+    def encode(self, obj):
+        try:
+            # NOTE: the datetimes are converted by to_primitive, like with
+            # the other codecs
+            return orjson.dumps(obj, default=jsonutils.to_primitive,
+                                option=(orjson.OPT_NON_STR_KEYS |
+                                        orjson.OPT_PASSTHROUGH_DATETIME))
+        except TypeError:
+            return super(OrjsonCodec, self).encode(obj)
+
+    def decode(self, data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return super(OrjsonCodec, self).decode(data)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec based on ``ujson``.
+
+    The objects which ``ujson`` cannot encode, e.g. the integers larger
+    than 64 bits, ``NaN`` and ``Infinity``, and the data it cannot decode
+    are handled by the codec of the standard library.
+    """
+
+    name = 'ujson'
+
+    def encode(self, obj):
+        try:
+            return ujson.dumps(obj, default=jsonutils.to_primitive,
+                               escape_forward_slashes=False).encode('utf-8')
+        except (TypeError, OverflowError):
+            return super(UjsonCodec, self).encode(obj)
+
+    def decode(self, data):
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return super(UjsonCodec, self).decode(data)
+
+
+# The installed codecs by name
+CODECS = {codec.name: codec for codec, module in (
+    (JSONCodec, json), (OrjsonCodec, orjson), (UjsonCodec, ujson))
+    if module is not None}
+
+
+def get_codec(codec=None):
+    """Return a JSON codec.
+
+    :param codec: a codec, the name of a codec, or None for the codec of
+        the standard library.
+    :raises ValueError: if the codec is unknown or not installed.
+    """
+    if codec is None:
+        return JSONCodec()
+    if isinstance(codec, str):
+        try:
+            return CODECS[codec]()
+        except KeyError:
+            raise ValueError('Unknown or not installed JSON codec %s, '
+                             'expected one of %s'
+                             % (codec, ', '.join(CODECS)))
+    return codec
@@ -0,0 +1,148 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cache of the API versions negotiated with each Watcher endpoint.
+
+Entries are kept in memory for the life of the process and persisted to a
+JSON file in the user's cache directory, so that a new process talking to
+an older Watcher API can pick the negotiated version up front instead of
+paying for a 406 round trip.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from oslo_serialization import jsonutils
+
+
+LOG = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or
+    os.path.join(os.path.expanduser('~'), '.cache'),
+    'python-watcherclient')
+CACHE_FILENAME = 'api_versions.json'
+# Time (in seconds) after which a cached entry is ignored
+DEFAULT_EXPIRY = 300
+
+_lock = threading.Lock()
+_memory_cache = {}
+
+
+def _build_key(host, port):
+    return '%s:%s' % (host, port)
+
+
+def _cache_file():
+    return os.path.join(CACHE_DIR, CACHE_FILENAME)
+
+
+def read_json(path):
+    """Return the dict stored as JSON in a file, or an empty dict.
+
+    Missing, unreadable and corrupted files are all treated as empty.
+    """
+    try:
+        with open(path, 'rb') as cache:
+            data = jsonutils.loads(cache.read())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json(path, data):
+    """Atomically replace the content of a file with data as JSON."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # NOTE: write to a temporary file first so that concurrent processes
+    # never read a partially written cache.
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix='.' + os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(jsonutils.dump_as_bytes(data))
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+
+def _load_file():
+    return read_json(_cache_file())
+
+
+def _write_file(entries):
+    write_json(_cache_file(), entries)
+
+
+def save_data(host, port, data):
+    """Save the negotiated API version data for an endpoint.
+
+    :param host: the host of the Watcher API endpoint.
+    :param port: the port of the Watcher API endpoint.
+    :param data: a dict with the 'version', 'min_version' and
+        'max_version' strings.
+    """
+    key = _build_key(host, port)
+    entry = {'timestamp': time.time(), 'data': data}
+    with _lock:
+        _memory_cache[key] = entry
+        try:
+            entries = _load_file()
+            entries[key] = entry
+            _write_file(entries)
+        except OSError as e:
+            LOG.debug('Unable to write the API version cache %s: %s',
+                      _cache_file(), e)
+
+
+def retrieve_data(host, port, expiry=DEFAULT_EXPIRY):
+    """Retrieve the cached API version data for an endpoint.
+
+    :param host: the host of the Watcher API endpoint.
+    :param port: the port of the Watcher API endpoint.
+    :param expiry: age (in seconds) after which an entry is ignored.
+    :returns: the data saved by :func:`save_data`, or None if there is no
+        entry or it has expired.
+    """
+    key = _build_key(host, port)
+    with _lock:
+        entry = _memory_cache.get(key)
+        if entry is None:
+            entry = _load_file().get(key)
+            if isinstance(entry, dict):
+                _memory_cache[key] = entry
+
+    if not isinstance(entry, dict):
+        return None
+    if time.time() - entry.get('timestamp', 0) > expiry:
+        return None
+    return entry.get('data')
+
+
+def after_fork():
+    """Replace the lock possibly held when the process forked."""
+    global _lock
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=after_fork)
+
+
+def clear():
+    """Drop the in-memory entries; the cache file is left untouched."""
+    with _lock:
+        _memory_cache.clear()
@@ -20,21 +20,26 @@ import http.client
 import io
 import logging
 import os
+import random
 import re
 import socket
 import ssl
 import textwrap
+import threading
 import time
 from urllib import parse as urlparse
 
 from keystoneauth1 import adapter
 from keystoneauth1 import exceptions as kexceptions
-from oslo_serialization import jsonutils
+from oslo_utils import encodeutils
 from oslo_utils import strutils
 import requests
 
 from watcherclient._i18n import _
 from watcherclient.common import api_versioning
+from watcherclient.common import codec
+from watcherclient.common import filecache
+from watcherclient.common import utils
 from watcherclient import exceptions
 
 
@@ -54,7 +59,14 @@ API_VERSION_SELECTED_STATES = ('user', 'negotiated', 'cached', 'default')
 
 DEFAULT_MAX_RETRIES = 5
 DEFAULT_RETRY_INTERVAL = 2
+DEFAULT_MAX_RETRY_INTERVAL = 30
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
 SENSITIVE_HEADERS = ('X-Auth-Token',)
+# Maximum size (in characters) of a request or response body in debug logs
+DEFAULT_MAX_LOG_BODY_SIZE = 64 * 1024
+# Number of per-host connection pools and of connections kept per host
+DEFAULT_POOL_CONNECTIONS = requests.adapters.DEFAULT_POOLSIZE
+DEFAULT_POOL_MAXSIZE = requests.adapters.DEFAULT_POOLSIZE
 
 
 SUPPORTED_ENDPOINT_SCHEME = ('http', 'https')
@@ -65,20 +77,92 @@ def _trim_endpoint_api_version(url):
     return re.sub(f'{API_VERSION}$', '', url.rstrip('/'))
 
 
-def _extract_error_json(body):
+def _extract_error_json(body, json_codec=None):
     """Return  error_message from the HTTP response body."""
+    json_codec = json_codec or codec.get_codec()
     error_json = {}
     try:
-        body_json = jsonutils.loads(body)
+        body_json = json_codec.decode(body)
         if 'error_message' in body_json:
             raw_msg = body_json['error_message']
-            error_json = jsonutils.loads(raw_msg)
-    except ValueError:
+            error_json = json_codec.decode(raw_msg)
+    except (TypeError, ValueError):
         pass
 
     return error_json
 
 
+def _format_log_body(body, max_size):
+    """Return a masked, possibly truncated, body suitable for debug logs.
+
+    The body is truncated before masking so that the cost of the password
+    masking regexes does not grow with the size of the payload.
+    """
+    truncated = bool(max_size) and len(body) > max_size
+    if truncated:
+        total = len(body)
+        body = body[:max_size]
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    if truncated:
+        # NOTE: close a string value which may have been cut in the middle
+        # so that a partial secret is still masked.
+        body = strutils.mask_password(body + '"')[:-1]
+        return '%s... (truncated, %d bytes total)' % (body, total)
+    return strutils.mask_password(body)
+
+
+def _build_timeout(timeout=None, connect_timeout=None, read_timeout=None):
+    """Return the timeout to pass to requests.
+
+    :returns: None, a single timeout, or a (connect, read) tuple when
+              either connect_timeout or read_timeout is set.
+    """
+    if connect_timeout is None and read_timeout is None:
+        return timeout
+    return (timeout if connect_timeout is None else connect_timeout,
+            timeout if read_timeout is None else read_timeout)
+
+
+class PoolAdapter(requests.adapters.HTTPAdapter):
+    """HTTP adapter keeping the configuration of its connection pool."""
+
+    def __init__(self, pool_connections=None, pool_maxsize=None):
+        self.pool_config = {
+            'pool_connections': pool_connections or DEFAULT_POOL_CONNECTIONS,
+            'pool_maxsize': pool_maxsize or DEFAULT_POOL_MAXSIZE}
+        super(PoolAdapter, self).__init__(**self.pool_config)
+
+    def renew(self):
+        """Return a new adapter with the same configuration."""
+        return type(self)(**self.pool_config)
+
+
+def _build_pool_adapter(pool_connections=None, pool_maxsize=None):
+    return PoolAdapter(pool_connections, pool_maxsize)
+
+
+def _renew_adapters(session):
+    """Mount new adapters in a requests session.
+
+    The new adapters have new, empty connection pools. The adapters of the
+    client are built again with the same pool configuration; the others,
+    e.g. the default ones of a keystoneauth session, are built with their
+    default pool configuration and the same retries. The original adapters
+    are left untouched since, in a forked process, they are shared with
+    the parent.
+    """
+    renewed = {}
+    for prefix, old in list(session.adapters.items()):
+        if id(old) not in renewed:
+            if isinstance(old, PoolAdapter):
+                new = old.renew()
+            else:
+                new = type(old)(max_retries=old.max_retries)
+            renewed[id(old)] = new
+        session.adapters[prefix] = renewed[id(old)]
+
+
 def get_server(endpoint):
     """Extract and return the server & port that we're connecting to."""
     if endpoint is None:
@@ -133,12 +217,142 @@ class VersionNegotiationMixin(object):
             negotiated_ver = min_ver
         # server handles microversions, but doesn't support
         # the requested version, so try a negotiated version
-        self.api_version_select_state = 'negotiated'
         self.os_infra_optim_api_version = negotiated_ver.get_string()
+        self.api_version_select_state = 'negotiated'
         LOG.debug('Negotiated API version is %s', negotiated_ver.get_string())
+        self._negotiated_versions = {
+            'version': negotiated_ver.get_string(),
+            'min_version': min_ver.get_string(),
+            'max_version': max_ver.get_string()}
+
+        if not getattr(self, '_defer_version_cache', False):
+            self._save_negotiated_version()
 
         return negotiated_ver
 
+    def _version_cache_endpoint(self):
+        """Return the endpoint the negotiated versions are cached for."""
+        return self.endpoint
+
+    def _save_negotiated_version(self):
+        """Cache the negotiated version for the endpoint of the client.
+
+        New clients of the same endpoint can then use it up front instead
+        of negotiating again.
+        """
+        data = self.__dict__.pop('_negotiated_versions', None)
+        if data is None:
+            return
+        host, port = get_server(self._version_cache_endpoint())
+        if host:
+            filecache.save_data(host=host, port=port, data=data)
+
+    def _auth_token(self):
+        """Return the authentication token of the requests, if known."""
+        return None
+
+    def _cache_scope(self):
+        """Return the scope of the responses cached or shared by the client.
+
+        The responses are only reused by the clients sending their requests
+        to the same endpoint with the same token; the token is hashed so
+        that it is not kept in the caches.
+        """
+        token = self._auth_token()
+        if token:
+            token = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        return '%s %s' % (self._version_cache_endpoint(), token)
+
+    def use_cached_version(self, expiry=filecache.DEFAULT_EXPIRY):
+        """Use the version cached for the endpoint of the client, if any.
+
+        :param expiry: age (in seconds) after which a cached version is
+            ignored.
+        :returns: True if a cached version is used.
+        """
+        host, port = get_server(self._version_cache_endpoint())
+        if not host:
+            return False
+        saved_version = filecache.retrieve_data(host=host, port=port,
+                                                expiry=expiry)
+        if not saved_version or not saved_version.get('version'):
+            return False
+        self.os_infra_optim_api_version = saved_version['version']
+        self.api_version_select_state = 'cached'
+        return True
+
+    def reset_connections(self):
+        """Close the pooled connections of the client.
+
+        The next requests open new connections. This is done automatically,
+        without closing the connections, when the client is used by a
+        process forked from the one which created it.
+        """
+        self._requests_session().close()
+
+    def after_fork(self):
+        """Renew the state inherited from the parent process.
+
+        The sockets of the connection pool must not be used by both the
+        parent and the child, and the locks may have been held by another
+        thread of the parent when it forked. This is called in the child
+        right after os.fork().
+        """
+        pid = os.getpid()
+        LOG.debug('Process forked (pid %(old)s to %(new)s), renewing the '
+                  'connection pool', {'old': self._pid, 'new': pid})
+        self._negotiation_lock = threading.Lock()
+        self.retry_stats.after_fork()
+        _renew_adapters(self._requests_session())
+        self._pid = pid
+
+    def _check_pid(self):
+        """Renew the state inherited from a parent process, if not done."""
+        if os.getpid() != self._pid:
+            self.after_fork()
+
+    def _renegotiate_version(self, conn, resp, requested_header):
+        """Negotiate the version after a 406 and return the new header.
+
+        Concurrent requests sharing the client may all be rejected with the
+        version they were sent with; only the first one negotiates, the
+        others reuse its result instead of failing because the version has
+        already been negotiated.
+        """
+        with self._negotiation_lock:
+            if self._get_api_version_header() == requested_header:
+                # NOTE: the cache file is written once the lock is
+                # released, so that the concurrent requests do not wait
+                # for the filesystem
+                self._defer_version_cache = True
+                try:
+                    self.negotiate_version(conn, resp)
+                finally:
+                    self._defer_version_cache = False
+            header = self._get_api_version_header()
+        self._save_negotiated_version()
+        return header
+
+    def _get_api_version_header(self):
+        """Return the OpenStack-API-Version header value for a request.
+
+        The value is computed once per client and only recomputed when
+        os_infra_optim_api_version changes, e.g. after a negotiation.
+        """
+        version = getattr(self, 'os_infra_optim_api_version', None)
+        if not version:
+            return None
+        cached = getattr(self, '_api_version_header_cache', None)
+        if cached is None or cached[0] != version:
+            api_version = api_versioning.get_api_version(version)
+            if api_version.is_latest():
+                api_version = api_versioning.get_api_version(
+                    LATEST_VERSION)
+            cached = (version,
+                      ' '.join(['infra-optim', api_version.get_string()]))
+            self._api_version_header_cache = cached
+        return cached[1]
+
     def _generic_parse_version_headers(self, accessor_func):
         min_ver = accessor_func('OpenStack-API-Minimum-Version',
                                 None)
@@ -160,36 +374,358 @@ _RETRY_EXCEPTIONS = (exceptions.ServiceUnavailable,
                      kexceptions.RetriableConnectionFailure)
 
 
+class RetryPolicy(object):
+    """Decide whether, and after how long, a failed request is retried.
+
+    The delay before retry N is ``interval * backoff ** (N - 1)``, capped to
+    ``max_interval``. With jitter enabled, a random delay between 0 and that
+    value is used instead ("full jitter") so that clients failing at the
+    same time do not retry in lockstep. A Retry-After sent by the server is
+    used as the minimum delay.
+
+    Subclasses may override :meth:`get_delay` to implement another policy.
+
+    :param max_retries: maximum number of retries.
+    :param interval: base delay (in seconds) between retries.
+    :param backoff: multiplier applied to the delay after each retry.
+    :param max_interval: maximum delay (in seconds) between retries.
+    :param jitter: whether to randomize the delays.
+    :param max_elapsed: stop retrying once the next attempt would start more
+        than this many seconds after the first one. None means no limit.
+    :param methods: HTTP methods which may be retried, idempotent methods
+        by default. None allows every method.
+    """
+
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES,
+                 interval=DEFAULT_RETRY_INTERVAL, backoff=2,
+                 max_interval=DEFAULT_MAX_RETRY_INTERVAL, jitter=True,
+                 max_elapsed=None, methods=IDEMPOTENT_METHODS):
+        self.max_retries = max_retries
+        self.interval = interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.max_elapsed = max_elapsed
+        self.methods = (None if methods is None
+                        else frozenset(m.upper() for m in methods))
+
+    def get_delay(self, method, attempt, error, elapsed):
+        """Return the delay before the next attempt.
+
+        :param method: HTTP method of the failed request.
+        :param attempt: number of the attempt which failed, starting at 1.
+        :param error: the exception raised by the failed attempt.
+        :param elapsed: seconds elapsed since the first attempt started.
+        :returns: the delay in seconds, or None to stop retrying.
+        """
+        if attempt > self.max_retries:
+            return None
+        if self.methods is not None and method.upper() not in self.methods:
+            return None
+
+        delay = min(self.max_interval,
+                    self.interval * self.backoff ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        retry_after = getattr(error, 'retry_after', 0)
+        if retry_after:
+            delay = max(delay, retry_after)
+
+        if self.max_elapsed is not None and (
+                elapsed + delay > self.max_elapsed):
+            return None
+        return delay
+
+
+class _RetryBudget(object):
+    """Attempts made for one logical request.
+
+    The budget is shared by the nested _http_request calls made for version
+    negotiation and redirects, so that they do not each get a full set of
+    retries.
+    """
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self.attempts = 0
+        # The duration of the last attempt
+        self.latency = None
+        self.failures = 0
+        self.exhausted = False
+
+
+class RetryStats(object):
+    """Counters of the attempts consumed by the requests of a client.
+
+    Every logical request (including the retries, the version negotiation
+    and the redirects it needed) counts as one call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.calls = 0
+        self.attempts = 0
+
+    def after_fork(self):
+        """Replace the lock possibly held when the process forked."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def retries(self):
+        """Number of attempts made on top of the first one of each call."""
+        return self.attempts - self.calls
+
+    @property
+    def last_attempts(self):
+        """Attempts consumed by the last call made by the current thread."""
+        return getattr(self._local, 'last_attempts', 0)
+
+    @property
+    def last_latency(self):
+        """Duration of the last attempt of the last call of the thread.
+
+        In seconds, without the waits between the attempts, or None if the
+        current thread made no call since :meth:`clear_last`.
+        """
+        return getattr(self._local, 'last_latency', None)
+
+    def clear_last(self):
+        """Forget the last call made by the current thread."""
+        self._local.last_attempts = 0
+        self._local.last_latency = None
+
+    def _record(self, attempts, latency=None):
+        self._local.last_attempts = attempts
+        self._local.last_latency = latency
+        with self._lock:
+            self.calls += 1
+            self.attempts += attempts
+
+
+class _Flight(object):
+    """A request in flight, awaited by the identical requests."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces the identical requests sent at the same time.
+
+    While a GET request is in flight, the identical requests (same
+    endpoint, authentication token, URL, API version and headers) made by
+    other threads wait for it and share its result, or its error, instead
+    of sending their own request. Each of them gets its own response body,
+    decoded again from the raw response.
+
+    A single flight can be shared by several clients.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.calls = 0
+        self.coalesced = 0
+        utils.register_after_fork(self)
+
+    def after_fork(self):
+        """Forget the requests of the parent process and replace the lock."""
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, func):
+        """Call func, unless a call with the same key is in flight.
+
+        :returns: a tuple with the result of the call and whether it was
+            shared with another caller.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def stats(self):
+        """Return the counters of the single flight as a dict."""
+        with self._lock:
+            return {'calls': self.calls,
+                    'coalesced': self.coalesced,
+                    'in_flight': len(self._flights)}
+
+
 def with_retries(func):
     """Wrapper for _http_request adding support for retries."""
     @functools.wraps(func)
     def wrapper(self, url, method, **kwargs):
-        if self.conflict_max_retries is None:
-            self.conflict_max_retries = DEFAULT_MAX_RETRIES
-        if self.conflict_retry_interval is None:
-            self.conflict_retry_interval = DEFAULT_RETRY_INTERVAL
+        self._check_pid()
+        stats = self.retry_stats
+        budget = getattr(stats._local, 'budget', None)
+        if budget is not None:
+            # NOTE: nested call for a negotiation or a redirect, which
+            # consumes the budget of the outer request.
+            return _call_with_retries(func, self, budget, url, method,
+                                      **kwargs)
+
+        budget = stats._local.budget = _RetryBudget()
+        try:
+            return _call_with_retries(func, self, budget, url, method,
+                                      **kwargs)
+        finally:
+            stats._local.budget = None
+            stats._record(budget.attempts, budget.latency)
 
-        num_attempts = self.conflict_max_retries + 1
-        for attempt in range(1, num_attempts + 1):
+    return wrapper
+
+
+def with_single_flight(func):
+    """Wrapper for json_request coalescing the identical GET requests."""
+    @functools.wraps(func)
+    def wrapper(self, method, url, **kwargs):
+        single_flight = self.single_flight
+        if single_flight is None or method.upper() != 'GET':
+            return func(self, method, url, **kwargs)
+
+        headers = kwargs.get('headers') or {}
+        others = {k: v for k, v in kwargs.items() if k != 'headers'}
+        key = (self._cache_scope(), url, self._get_api_version_header(),
+               repr(sorted(headers.items())), repr(sorted(others.items())))
+        (resp, body), shared = single_flight.do(
+            key, lambda: func(self, method, url, **kwargs))
+        if shared and isinstance(body, (dict, list)):
+            # NOTE: decoding the raw body again is faster than copying the
+            # decoded one, and a non-empty body was decoded from it
+            body = (self.json_codec.decode(resp.content) if body
+                    else type(body)())
+        return resp, body
+
+    return wrapper
+
+
+def with_cache_invalidation(func):
+    """Wrapper for raw_request dropping the responses a request modifies."""
+    @functools.wraps(func)
+    def wrapper(self, method, url, **kwargs):
+        response_cache = self.response_cache
+        if response_cache is None or method.upper() == 'GET':
+            return func(self, method, url, **kwargs)
+        try:
+            return func(self, method, url, **kwargs)
+        finally:
+            response_cache.invalidate(url)
+
+    return wrapper
+
+
+def with_response_cache(func):
+    """Wrapper for json_request adding support for a response cache."""
+    @functools.wraps(func)
+    def wrapper(self, method, url, **kwargs):
+        response_cache = self.response_cache
+        if response_cache is None:
+            return func(self, method, url, **kwargs)
+
+        if method.upper() != 'GET':
             try:
-                return func(self, url, method, **kwargs)
-            except _RETRY_EXCEPTIONS as error:
-                msg = ("Error contacting Watcher server: %(error)s. "
-                       "Attempt %(attempt)d of %(total)d" %
-                       {'attempt': attempt,
-                        'total': num_attempts,
-                        'error': error})
-                if attempt == num_attempts:
-                    LOG.error(msg)
-                    raise
-                else:
-                    LOG.debug(msg)
-                    time.sleep(self.conflict_retry_interval)
+                return func(self, method, url, **kwargs)
+            finally:
+                response_cache.invalidate(url)
+
+        version = self._get_api_version_header()
+        scope = self._cache_scope()
+        entry, fresh = response_cache.lookup(url, version, scope)
+        if fresh:
+            return entry['resp'], self.json_codec.decode(entry['content'])
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {})
+            kwargs['headers'].update(
+                response_cache.conditional_headers(entry))
+
+        resp, body = func(self, method, url, **kwargs)
+        if resp.status_code == http.client.NOT_MODIFIED and entry:
+            response_cache.revalidated(entry)
+            return resp, self.json_codec.decode(entry['content'])
+        # NOTE: only the bodies decoded from JSON are cached
+        if resp.status_code == http.client.OK and isinstance(body, dict):
+            response_cache.store(url, version, resp, resp.content, scope)
+        return resp, body
 
     return wrapper
 
 
+def _call_with_retries(func, client, budget, url, method, **kwargs):
+    policy = client.retry_policy
+    while True:
+        if client.rate_limiter is not None:
+            client.rate_limiter.acquire(method)
+        budget.attempts += 1
+        start = time.monotonic()
+        try:
+            try:
+                return func(client, url, method, **kwargs)
+            finally:
+                budget.latency = time.monotonic() - start
+        except _RETRY_EXCEPTIONS as error:
+            if budget.exhausted:
+                raise
+            budget.failures += 1
+            delay = policy.get_delay(method, budget.failures, error,
+                                     time.monotonic() - budget.start)
+            msg = ("Error contacting Watcher server: %(error)s. "
+                   "Attempt %(attempt)d of %(total)d" %
+                   {'attempt': budget.failures,
+                    'total': policy.max_retries + 1,
+                    'error': error})
+            if delay is None:
+                budget.exhausted = True
+                LOG.error(msg)
+                raise
+            else:
+                LOG.debug(msg)
+                time.sleep(delay)
+
+
+def _build_retry_policy(retry_policy, max_retries, retry_interval):
+    if retry_policy is not None:
+        return retry_policy
+    return RetryPolicy(
+        max_retries=(DEFAULT_MAX_RETRIES if max_retries is None
+                     else max_retries),
+        interval=(DEFAULT_RETRY_INTERVAL if retry_interval is None
+                  else retry_interval))
+
+
 class HTTPClient(VersionNegotiationMixin):
+    """HTTP client based on a requests session.
+
+    A client can be shared by several threads: the state of a request is
+    kept in its own arguments, the API version negotiation is serialized
+    and the requests session is only read. Use a ``pool_maxsize`` at least
+    as large as the number of threads to keep one connection per thread.
+    """
 
     def __init__(self, endpoint, **kwargs):
         self.endpoint = endpoint
@@ -200,11 +736,33 @@ class HTTPClient(VersionNegotiationMixin):
             'os_infra_optim_api_version', DEFAULT_VER)
         self.api_version_select_state = kwargs.get(
             'api_version_select_state', 'default')
+        self._negotiation_lock = threading.Lock()
+        self._pid = os.getpid()
         self.conflict_max_retries = kwargs.pop('max_retries',
                                                DEFAULT_MAX_RETRIES)
         self.conflict_retry_interval = kwargs.pop('retry_interval',
                                                   DEFAULT_RETRY_INTERVAL)
+        self.retry_policy = _build_retry_policy(
+            kwargs.get('retry_policy'), self.conflict_max_retries,
+            self.conflict_retry_interval)
+        self.retry_stats = RetryStats()
+        utils.register_after_fork(self)
+        self.rate_limiter = kwargs.get('rate_limiter')
+        self.response_cache = kwargs.get('response_cache')
+        self.single_flight = kwargs.get('single_flight')
+        self.json_codec = codec.get_codec(kwargs.get('json_codec'))
+        self.max_log_body_size = kwargs.get('max_log_body_size',
+                                            DEFAULT_MAX_LOG_BODY_SIZE)
+        self.timeout = _build_timeout(kwargs.get('timeout'),
+                                      kwargs.get('connect_timeout'),
+                                      kwargs.get('read_timeout'))
         self.session = requests.Session()
+        pool_adapter = _build_pool_adapter(kwargs.get('pool_connections'),
+                                           kwargs.get('pool_maxsize'))
+        for scheme in SUPPORTED_ENDPOINT_SCHEME:
+            self.session.mount('%s://' % scheme, pool_adapter)
+        if not kwargs.get('keep_alive', True):
+            self.session.headers['Connection'] = 'close'
 
         parts = urlparse.urlparse(endpoint)
         if parts.scheme not in SUPPORTED_ENDPOINT_SCHEME:
@@ -219,6 +777,12 @@ class HTTPClient(VersionNegotiationMixin):
             self.session.cert = (kwargs.get('cert_file'),
                                  kwargs.get('key_file'))
 
+    def _requests_session(self):
+        return self.session
+
+    def _auth_token(self):
+        return self.auth_token
+
     def _process_header(self, name, value):
         """Redacts any sensitive header
 
@@ -242,6 +806,9 @@ class HTTPClient(VersionNegotiationMixin):
             return (name, value)
 
     def log_curl_request(self, method, url, kwargs):
+        if not LOG.isEnabledFor(logging.DEBUG):
+            return
+
         curl = ['curl -i -X %s' % method]
 
         for (key, value) in kwargs['headers'].items():
@@ -258,14 +825,18 @@ class HTTPClient(VersionNegotiationMixin):
             curl.append('--key %s' % self.session.cert[1])
 
         if 'body' in kwargs:
-            body = strutils.mask_password(kwargs['body'])
+            body = _format_log_body(kwargs['body'], self.max_log_body_size)
             curl.append('-d \'%s\'' % body)
 
         curl.append(urlparse.urljoin(self.endpoint_trimmed, url))
         LOG.debug(' '.join(curl))
 
     @staticmethod
-    def log_http_response(resp, body=None):
+    def log_http_response(resp, body=None,
+                          max_body_size=DEFAULT_MAX_LOG_BODY_SIZE):
+        if not LOG.isEnabledFor(logging.DEBUG):
+            return
+
         # NOTE(aarefiev): resp.raw is urllib3 response object, it's used
         # only to get 'version', response from request with 'stream = True'
         # should be used for raw reading.
@@ -274,8 +845,7 @@ class HTTPClient(VersionNegotiationMixin):
         dump.extend(['%s: %s' % (k, v) for k, v in resp.headers.items()])
         dump.append('')
         if body:
-            body = strutils.mask_password(body)
-            dump.extend([body, ''])
+            dump.extend([_format_log_body(body, max_body_size), ''])
         LOG.debug('\n'.join(dump))
 
     def _make_connection_url(self, url):
@@ -297,15 +867,10 @@ class HTTPClient(VersionNegotiationMixin):
         # Copy the kwargs so we can reuse the original in case of redirects
         kwargs['headers'] = copy.deepcopy(kwargs.get('headers', {}))
         kwargs['headers'].setdefault('User-Agent', USER_AGENT)
-        if self.os_infra_optim_api_version:
-            api_version = api_versioning.get_api_version(
-                self.os_infra_optim_api_version)
-            if api_version.is_latest():
-                api_version = api_versioning.get_api_version(
-                    LATEST_VERSION)
-            kwargs['headers'].setdefault(
-                'OpenStack-API-Version',
-                ' '.join(['infra-optim', api_version.get_string()]))
+        api_version_header = self._get_api_version_header()
+        if api_version_header:
+            kwargs['headers'].setdefault('OpenStack-API-Version',
+                                         api_version_header)
         if self.auth_token:
             kwargs['headers'].setdefault('X-Auth-Token', self.auth_token)
 
@@ -317,6 +882,8 @@ class HTTPClient(VersionNegotiationMixin):
         body = kwargs.pop('body', None)
         if body:
             kwargs['data'] = body
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
 
         conn_url = self._make_connection_url(url)
         try:
@@ -329,9 +896,10 @@ class HTTPClient(VersionNegotiationMixin):
             # http://specs.openstack.org/openstack/watcher-specs/specs/kilo/api-microversions.html#use-case-3b-new-client-communicating-with-a-old-watcher-user-specified  # noqa
 
             if resp.status_code == http.client.NOT_ACCEPTABLE:
-                negotiated_ver = self.negotiate_version(self.session, resp)
                 kwargs['headers']['OpenStack-API-Version'] = (
-                    ' '.join(['infra-optim', negotiated_ver]))
+                    self._renegotiate_version(
+                        self.session, resp,
+                        kwargs['headers'].get('OpenStack-API-Version')))
                 return self._http_request(url, method, **kwargs)
 
         except requests.exceptions.RequestException as e:
@@ -345,27 +913,20 @@ class HTTPClient(VersionNegotiationMixin):
 
             raise exceptions.ConnectionRefused(message)
 
-        body_iter = resp.iter_content(chunk_size=CHUNKSIZE)
-
-        # Read body into string if it isn't obviously image data
-        body_str = None
+        # Read body into memory if it isn't obviously image data
+        body = None
         if resp.headers.get('Content-Type') != 'application/octet-stream':
-            # decoding byte to string is necessary for Python 3 compatibility
-            # this issues has not been found with Python 3 unit tests
-            # because the test creates a fake http response of type str
-            # the if statement satisfies test (str) and real (bytes) behavior
-            body_list = [
-                chunk.decode("utf-8") if isinstance(chunk, bytes)
-                else chunk for chunk in body_iter
-            ]
-            body_str = ''.join(body_list)
-            self.log_http_response(resp, body_str)
-            body_iter = io.StringIO(body_str)
+            # NOTE: requests reads the payload once into a single bytes
+            # object. It is handed as-is to the JSON decoder and is only
+            # decoded to text here when it is actually logged.
+            body = resp.content
+            self.log_http_response(resp, body, self.max_log_body_size)
         else:
             self.log_http_response(resp)
+            body = resp.iter_content(chunk_size=CHUNKSIZE)
 
         if resp.status_code >= http.client.BAD_REQUEST:
-            error_json = _extract_error_json(body_str)
+            error_json = _extract_error_json(body, self.json_codec)
             raise exceptions.from_response(
                 resp, error_json.get('faultstring'),
                 error_json.get('debuginfo'), method, url)
@@ -373,21 +934,24 @@ class HTTPClient(VersionNegotiationMixin):
                                   http.client.FOUND,
                                   http.client.USE_PROXY):
             # Redirected. Reissue the request to the new location.
-            return self._http_request(resp['location'], method, **kwargs)
+            return self._http_request(resp.headers['location'], method,
+                                      **kwargs)
         elif resp.status_code == http.client.MULTIPLE_CHOICES:
             raise exceptions.from_response(resp, method=method, url=url)
 
-        return resp, body_iter
+        return resp, body
 
+    @with_response_cache
+    @with_single_flight
     def json_request(self, method, url, **kwargs):
-        kwargs.setdefault('headers', {})
+        kwargs['headers'] = dict(kwargs.get('headers') or {})
         kwargs['headers'].setdefault('Content-Type', 'application/json')
         kwargs['headers'].setdefault('Accept', 'application/json')
 
         if 'body' in kwargs:
-            kwargs['body'] = jsonutils.dumps(kwargs['body'])
+            kwargs['body'] = self.json_codec.encode(kwargs['body'])
 
-        resp, body_iter = self._http_request(url, method, **kwargs)
+        resp, body = self._http_request(url, method, **kwargs)
         content_type = resp.headers.get('Content-Type')
 
         if (resp.status_code in (http.client.NO_CONTENT,
@@ -396,9 +960,8 @@ class HTTPClient(VersionNegotiationMixin):
             return resp, list()
 
         if 'application/json' in content_type:
-            body = ''.join([chunk for chunk in body_iter])
             try:
-                body = jsonutils.loads(body)
+                body = self.json_codec.decode(body)
             except ValueError:
                 LOG.error('Could not decode response body as JSON')
         else:
@@ -406,11 +969,15 @@ class HTTPClient(VersionNegotiationMixin):
 
         return resp, body
 
+    @with_cache_invalidation
     def raw_request(self, method, url, **kwargs):
-        kwargs.setdefault('headers', {})
+        kwargs['headers'] = dict(kwargs.get('headers') or {})
         kwargs['headers'].setdefault('Content-Type',
                                      'application/octet-stream')
-        return self._http_request(url, method, **kwargs)
+        resp, body = self._http_request(url, method, **kwargs)
+        if isinstance(body, (bytes, str)):
+            body = io.StringIO(encodeutils.safe_decode(body))
+        return resp, body
 
 
 class VerifiedHTTPSConnection(http.client.HTTPSConnection):
@@ -476,7 +1043,10 @@ class VerifiedHTTPSConnection(http.client.HTTPSConnection):
 
 
 class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
-    """HTTP client based on Keystone client session."""
+    """HTTP client based on Keystone client session.
+
+    Like :class:`HTTPClient`, a client can be shared by several threads.
+    """
 
     def __init__(self,
                  os_infra_optim_api_version,
@@ -484,15 +1054,76 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
                  max_retries,
                  retry_interval,
                  endpoint,
+                 connect_timeout=None,
+                 read_timeout=None,
+                 pool_connections=None,
+                 pool_maxsize=None,
+                 keep_alive=True,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 response_cache=None,
+                 single_flight=None,
+                 json_codec=None,
                  **kwargs):
         self.os_infra_optim_api_version = os_infra_optim_api_version
         self.api_version_select_state = api_version_select_state
+        self._negotiation_lock = threading.Lock()
+        self._pid = os.getpid()
         self.conflict_max_retries = max_retries
         self.conflict_retry_interval = retry_interval
+        self.retry_policy = _build_retry_policy(retry_policy, max_retries,
+                                                retry_interval)
+        self.retry_stats = RetryStats()
+        utils.register_after_fork(self)
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.single_flight = single_flight
+        self.json_codec = codec.get_codec(json_codec)
         self.endpoint = endpoint
+        self.request_timeout = _build_timeout(
+            connect_timeout=connect_timeout, read_timeout=read_timeout)
+        self.keep_alive = keep_alive
 
         super(SessionClient, self).__init__(**kwargs)
 
+        if pool_connections or pool_maxsize:
+            self._mount_pool_adapter(pool_connections, pool_maxsize)
+
+    def _mount_pool_adapter(self, pool_connections, pool_maxsize):
+        # NOTE: the keystoneauth session may be shared with other service
+        # clients, so the adapter is only mounted for the Watcher endpoint.
+        endpoint = self.endpoint_override or self.endpoint
+        parts = urlparse.urlparse(endpoint or '')
+        if parts.scheme not in SUPPORTED_ENDPOINT_SCHEME:
+            LOG.warning('Unable to configure the connection pool since the '
+                        'Watcher endpoint is unknown')
+            return
+        self.session.session.mount(
+            '%s://%s/' % (parts.scheme, parts.netloc),
+            _build_pool_adapter(pool_connections, pool_maxsize))
+
+    def _requests_session(self):
+        return self.session.session
+
+    def _version_cache_endpoint(self):
+        # NOTE: without an endpoint override, e.g. with the openstack CLI,
+        # the endpoint is resolved from the service catalog
+        endpoint = self.endpoint_override or self.endpoint
+        if not endpoint:
+            try:
+                endpoint = self.get_endpoint()
+            except kexceptions.ClientException as e:
+                LOG.debug('Unable to resolve the Watcher endpoint: %s', e)
+                return None
+        return endpoint if isinstance(endpoint, str) else None
+
+    def _auth_token(self):
+        try:
+            token = self.get_token()
+        except kexceptions.ClientException:
+            return None
+        return token if isinstance(token, str) else None
+
     def _parse_version_headers(self, resp):
         return self._generic_parse_version_headers(resp.headers.get)
 
@@ -502,6 +1133,10 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
 
     @with_retries
     def _http_request(self, url, method, **kwargs):
+        # Copy the mutable arguments so that neither the caller's ones nor
+        # the ones reused for retries and redirects are shared
+        kwargs['headers'] = dict(kwargs.get('headers') or {})
+        kwargs['endpoint_filter'] = dict(kwargs.get('endpoint_filter') or {})
         kwargs.setdefault('user_agent', USER_AGENT)
         kwargs.setdefault('auth', self.auth)
         if isinstance(self.endpoint_override, str):
@@ -510,18 +1145,17 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
                 _trim_endpoint_api_version(self.endpoint_override)
             )
 
-        if getattr(self, 'os_infra_optim_api_version', None):
-            api_version = api_versioning.get_api_version(
-                self.os_infra_optim_api_version)
-            if api_version.is_latest():
-                api_version = api_versioning.get_api_version(
-                    LATEST_VERSION)
-            kwargs['headers'].setdefault(
-                'OpenStack-API-Version',
-                ' '.join(['infra-optim',
-                          api_version.get_string()]))
+        api_version_header = self._get_api_version_header()
+        if api_version_header:
+            kwargs['headers'].setdefault('OpenStack-API-Version',
+                                         api_version_header)
+
+        if self.request_timeout is not None:
+            kwargs.setdefault('timeout', self.request_timeout)
+        if not self.keep_alive:
+            kwargs['headers'].setdefault('Connection', 'close')
 
-        endpoint_filter = kwargs.setdefault('endpoint_filter', {})
+        endpoint_filter = kwargs['endpoint_filter']
         endpoint_filter.setdefault('interface', self.interface)
         endpoint_filter.setdefault('service_type', self.service_type)
         endpoint_filter.setdefault('region_name', self.region_name)
@@ -529,12 +1163,14 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
         resp = self.session.request(url, method,
                                     raise_exc=False, **kwargs)
         if resp.status_code == http.client.NOT_ACCEPTABLE:
-            negotiated_ver = self.negotiate_version(self.session, resp)
             kwargs['headers']['OpenStack-API-Version'] = (
-                ' '.join(['infra-optim', negotiated_ver]))
+                self._renegotiate_version(
+                    self.session, resp,
+                    kwargs['headers'].get('OpenStack-API-Version')))
             return self._http_request(url, method, **kwargs)
         if resp.status_code >= http.client.BAD_REQUEST:
-            error_json = _extract_error_json(resp.content)
+            error_json = _extract_error_json(resp.content,
+                                             self.json_codec)
             raise exceptions.from_response(
                 resp, error_json.get('faultstring'),
                 error_json.get('debuginfo'), method, url)
@@ -547,13 +1183,15 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
             raise exceptions.from_response(resp, method=method, url=url)
         return resp
 
+    @with_response_cache
+    @with_single_flight
     def json_request(self, method, url, **kwargs):
-        kwargs.setdefault('headers', {})
+        kwargs['headers'] = dict(kwargs.get('headers') or {})
         kwargs['headers'].setdefault('Content-Type', 'application/json')
         kwargs['headers'].setdefault('Accept', 'application/json')
 
         if 'body' in kwargs:
-            kwargs['data'] = jsonutils.dumps(kwargs.pop('body'))
+            kwargs['data'] = self.json_codec.encode(kwargs.pop('body'))
 
         resp = self._http_request(url, method, **kwargs)
         body = resp.content
@@ -564,7 +1202,7 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
             return resp, list()
         if 'application/json' in content_type:
             try:
-                body = resp.json()
+                body = self.json_codec.decode(body)
             except ValueError:
                 LOG.error('Could not decode response body as JSON')
         else:
@@ -572,8 +1210,9 @@ class SessionClient(VersionNegotiationMixin, adapter.LegacyJsonAdapter):
 
         return resp, body
 
+    @with_cache_invalidation
     def raw_request(self, method, url, **kwargs):
-        kwargs.setdefault('headers', {})
+        kwargs['headers'] = dict(kwargs.get('headers') or {})
         kwargs['headers'].setdefault('Content-Type',
                                      'application/octet-stream')
         return self._http_request(url, method, **kwargs)
@@ -592,6 +1231,17 @@ def _construct_http_client(endpoint=None,
                            cert_file=None,
                            key_file=None,
                            insecure=None,
+                           max_log_body_size=DEFAULT_MAX_LOG_BODY_SIZE,
+                           connect_timeout=None,
+                           read_timeout=None,
+                           pool_connections=None,
+                           pool_maxsize=None,
+                           keep_alive=True,
+                           retry_policy=None,
+                           rate_limiter=None,
+                           response_cache=None,
+                           single_flight=None,
+                           json_codec=None,
                            **kwargs):
     if session:
         kwargs.setdefault('service_type', 'infra-optim')
@@ -605,7 +1255,9 @@ def _construct_http_client(endpoint=None,
                    'ca_file': ca_file,
                    'cert_file': cert_file,
                    'key_file': key_file,
-                   'insecure': insecure}
+                   'insecure': insecure,
+                   'max_log_body_size': (
+                       max_log_body_size != DEFAULT_MAX_LOG_BODY_SIZE)}
 
         dvars = [k for k, v in ignored.items() if v]
 
@@ -621,6 +1273,16 @@ def _construct_http_client(endpoint=None,
             max_retries=max_retries,
             retry_interval=retry_interval,
             endpoint=endpoint,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+            single_flight=single_flight,
+            json_codec=json_codec,
             **kwargs)
     else:
         if kwargs:
@@ -639,4 +1301,15 @@ def _construct_http_client(endpoint=None,
             ca_file=ca_file,
             cert_file=cert_file,
             key_file=key_file,
-            insecure=insecure)
+            insecure=insecure,
+            max_log_body_size=max_log_body_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+            single_flight=single_flight,
+            json_codec=json_codec)
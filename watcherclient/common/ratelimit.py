@@ -0,0 +1,269 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Client-side rate and concurrency limiting of the requests sent to the
+Watcher API.
+"""
+
+import collections
+import threading
+import time
+
+from watcherclient.common import httpclient
+from watcherclient.common import utils
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket.
+
+    Tokens are added at ``rate`` per second, up to ``burst`` tokens. Each
+    call to :meth:`acquire` takes one token, waiting for it if the bucket is
+    empty. Callers are served in the order they call :meth:`acquire`.
+
+    :param rate: number of tokens added per second.
+    :param burst: maximum number of tokens, i.e. of calls which can be made
+        at once after an idle period. Defaults to ``rate``, and at least 1.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive, got %s' % rate)
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self.acquired = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        utils.register_after_fork(self)
+
+    def after_fork(self):
+        """Replace the lock possibly held when the process forked."""
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting until one is available.
+
+        :returns: the number of seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # NOTE: the token is reserved before waiting, so that the
+            # concurrent callers wait for the next ones in turn.
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            self.acquired += 1
+            if wait:
+                self.waited += 1
+                self.wait_time += wait
+                self.max_wait = max(self.max_wait, wait)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def stats(self):
+        """Return the wait metrics of the bucket as a dict."""
+        with self._lock:
+            return {'rate': self.rate,
+                    'burst': self.burst,
+                    'acquired': self.acquired,
+                    'waited': self.waited,
+                    'wait_time': self.wait_time,
+                    'max_wait': self.max_wait}
+
+
+class RateLimiter(object):
+    """Limits the rate of the requests sent by a client.
+
+    Reads (``GET``, ``HEAD`` and ``OPTIONS`` requests) and writes (the other
+    methods) are limited separately. A limiter is shared by all the threads
+    using a client, and can be shared by several clients.
+
+    :param read_rate: maximum number of reads per second. None does not
+        limit reads.
+    :param write_rate: maximum number of writes per second. None does not
+        limit writes.
+    :param read_burst: number of reads which can be sent at once after an
+        idle period. Defaults to ``read_rate``.
+    :param write_burst: number of writes which can be sent at once after an
+        idle period. Defaults to ``write_rate``.
+    """
+
+    def __init__(self, read_rate=None, write_rate=None, read_burst=None,
+                 write_burst=None):
+        self.read_bucket = (TokenBucket(read_rate, read_burst)
+                            if read_rate else None)
+        self.write_bucket = (TokenBucket(write_rate, write_burst)
+                             if write_rate else None)
+
+    def acquire(self, method):
+        """Wait until a request with ``method`` can be sent.
+
+        :returns: the number of seconds waited.
+        """
+        if method.upper() in READ_METHODS:
+            bucket = self.read_bucket
+        else:
+            bucket = self.write_bucket
+        return bucket.acquire() if bucket else 0.0
+
+    def stats(self):
+        """Return the wait metrics of the reads and writes as a dict."""
+        return {'read': self.read_bucket and self.read_bucket.stats(),
+                'write': self.write_bucket and self.write_bucket.stats()}
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """Limits the number of concurrent calls with AIMD.
+
+    The limit is raised additively, by about one for every ``limit``
+    successful calls, as long as the latency of the calls stays below
+    ``latency_tolerance`` times the baseline latency. It is multiplied by
+    ``backoff`` when a call fails because the Watcher API is overloaded or
+    unreachable (the errors which are retried), or when the latency rises
+    above that threshold. Only one decrease is made for the calls which
+    were running when the limit was lowered.
+
+    The latency compared to the baseline is a moving average of the
+    latencies of the successful calls, so that the jitter of a single call
+    does not lower the limit. The baseline is the lowest latency of the
+    last ``latency_window`` successful calls, so that it follows the
+    latency of the Watcher API when it durably changes.
+
+    A limiter can be shared by several bulk operations, e.g. ``get_many``
+    and ``delete_many``, run at the same time.
+
+    :param initial_limit: the initial number of concurrent calls.
+    :param min_limit: the lowest limit.
+    :param max_limit: the highest limit.
+    :param backoff: the factor applied to the limit on overload.
+    :param latency_tolerance: ratio to the baseline latency above which the
+        calls are considered slowed down by overload.
+    :param latency_window: number of successful calls whose lowest latency
+        is the baseline.
+    :param smoothing: weight of the latency of a call in the moving
+        average, between 0 and 1.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=32,
+                 backoff=0.5, latency_tolerance=2.0, latency_window=100,
+                 smoothing=0.3):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('Expected 1 <= min_limit <= initial_limit <= '
+                             'max_limit')
+        if not 0 < smoothing <= 1:
+            raise ValueError('Expected 0 < smoothing <= 1')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self._limit = float(initial_limit)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._latencies = collections.deque(maxlen=latency_window)
+        self._avg_latency = None
+        self._last_decrease = None
+        self.increases = 0
+        self.decreases = 0
+        utils.register_after_fork(self)
+
+    def after_fork(self):
+        """Forget the calls of the parent process and replace the lock."""
+        self._cond = threading.Condition()
+        self._in_flight = 0
+
+    @property
+    def limit(self):
+        """The current number of concurrent calls allowed."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """The number of calls currently running."""
+        return self._in_flight
+
+    def acquire(self):
+        """Wait until a call can start.
+
+        :returns: an opaque token to pass to :meth:`release`.
+        """
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            return time.monotonic()
+
+    def release(self, token, error=None, latency=None):
+        """Record the end of a call and adapt the limit.
+
+        :param token: the value returned by :meth:`acquire`.
+        :param error: the exception raised by the call, if any.
+        :param latency: the duration of the call, in seconds. Defaults to
+            the time elapsed since :meth:`acquire`; the duration of the last
+            attempt of a request, without the retries, is more accurate.
+        """
+        now = time.monotonic()
+        if latency is None:
+            latency = now - token
+        with self._cond:
+            self._in_flight -= 1
+            overloaded = isinstance(error, httpclient._RETRY_EXCEPTIONS)
+            if not overloaded and error is None:
+                self._latencies.append(latency)
+                if self._avg_latency is None:
+                    self._avg_latency = latency
+                else:
+                    self._avg_latency += self.smoothing * (
+                        latency - self._avg_latency)
+                overloaded = (self._avg_latency >
+                              self.baseline_latency * self.latency_tolerance)
+            if overloaded:
+                # NOTE: the calls started before the last decrease were
+                # already running when it happened, so they are not a
+                # sign that the new limit is still too high.
+                if (self._last_decrease is None or
+                        token > self._last_decrease):
+                    self._limit = max(self.min_limit,
+                                      self._limit * self.backoff)
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif error is None and self._limit < self.max_limit:
+                self._limit = min(self.max_limit,
+                                  self._limit + 1.0 / self._limit)
+                self.increases += 1
+            self._cond.notify_all()
+
+    @property
+    def baseline_latency(self):
+        """The lowest latency of the last successful calls, or None."""
+        with self._cond:
+            return min(self._latencies) if self._latencies else None
+
+    def stats(self):
+        """Return the state of the limiter as a dict."""
+        with self._cond:
+            return {'limit': self.limit,
+                    'in_flight': self._in_flight,
+                    'baseline_latency': self.baseline_latency,
+                    'avg_latency': self._avg_latency,
+                    'increases': self.increases,
+                    'decreases': self.decreases}
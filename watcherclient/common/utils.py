@@ -15,8 +15,10 @@
 #    under the License.
 
 import argparse
+import logging
 import os
 import uuid
+import weakref
 import yaml
 
 from oslo_serialization import jsonutils
@@ -26,6 +28,35 @@ from watcherclient._i18n import _
 from watcherclient import exceptions as exc
 
 
+LOG = logging.getLogger(__name__)
+
+# The objects whose after_fork method is called in forked processes
+_after_fork_objects = weakref.WeakSet()
+
+
+def register_after_fork(obj):
+    """Call the after_fork method of obj in the processes forked later.
+
+    The method is called in the child process right after the fork, while
+    it only has one thread, so that it can replace the locks which were
+    possibly held by other threads of the parent.
+    """
+    _after_fork_objects.add(obj)
+
+
+def _run_after_fork():
+    for obj in list(_after_fork_objects):
+        try:
+            obj.after_fork()
+        except Exception as e:
+            LOG.warning('Unable to reset %(obj)r after fork: %(error)s',
+                        {'obj': obj, 'error': e})
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_run_after_fork)
+
+
 class HelpFormatter(argparse.HelpFormatter):
     def start_section(self, heading):
         # Title-case the headings
@@ -162,11 +193,86 @@ def common_params_for_list(args, fields, field_labels):
     marker = getattr(args, 'marker', None)
     if marker is not None:
         params['marker'] = marker
+
+    prefetch = getattr(args, 'prefetch', None)
+    if prefetch is not None:
+        if prefetch < 0:
+            raise exc.CommandError(
+                _('Expected non-negative --prefetch, got %s') % prefetch)
+        params['prefetch'] = prefetch
     params['detail'] = args.detail
 
     return params
 
 
+def add_bulk_arguments(parser):
+    """Add the arguments of the commands acting on several resources."""
+    parser.add_argument(
+        '--concurrency',
+        metavar='<concurrency>',
+        type=int,
+        default=1,
+        help=_('Number of requests to run concurrently. Defaults to 1.'))
+    parser.add_argument(
+        '--rate',
+        metavar='<rate>',
+        type=float,
+        default=None,
+        help=_('Maximum number of requests started per second. Not '
+               'limited by default.'))
+
+
+def delete_many(manager, ids, args, resource, log, stdout=None):
+    """Delete resources as configured by the arguments of a command.
+
+    When several resources are deleted, a summary is written to stdout.
+
+    :param manager: the manager of the resources.
+    :param ids: the UUIDs (or names) of the resources to delete.
+    :param args: arguments from command line, see add_bulk_arguments().
+    :param resource: name of the type of resource, for the messages.
+    :param log: the logger of the command.
+    :param stdout: the file the summary is written to.
+    :raises: CommandError with the errors of the deletions which failed, if
+             any, once all the resources have been processed.
+    """
+    if args.concurrency < 1:
+        raise exc.CommandError(
+            _('Expected positive --concurrency, got %s') % args.concurrency)
+    if args.rate is not None and args.rate <= 0:
+        raise exc.CommandError(
+            _('Expected positive --rate, got %s') % args.rate)
+
+    results = manager.delete_many(ids, max_workers=args.concurrency,
+                                  rate=args.rate)
+    errors = []
+    for id, result in zip(ids, results):
+        if isinstance(result, Exception):
+            errors.append(_('Failed to delete %(resource)s %(id)s: '
+                            '%(error)s') %
+                          {'resource': resource, 'id': id, 'error': result})
+    for error in errors:
+        log.debug(error)
+
+    if len(ids) == 1:
+        # NOTE: like the other delete commands, nothing is written when a
+        # single resource is deleted, and its error is the one reported.
+        if errors:
+            raise exc.CommandError(str(results[0]))
+        return
+
+    if stdout is not None:
+        stdout.write(_('Deleted %(deleted)s of %(total)s %(resource)s(s)\n') %
+                     {'deleted': len(ids) - len(errors), 'total': len(ids),
+                      'resource': resource})
+    if errors:
+        raise exc.CommandError('\n'.join(
+            errors + [_('%(failed)s of %(total)s %(resource)s(s) failed to '
+                        'delete.') %
+                      {'failed': len(errors), 'total': len(ids),
+                       'resource': resource}]))
+
+
 def common_filters(limit=None, sort_key=None, sort_dir=None, marker=None):
     """Generate common filters for any list request.
 
@@ -188,6 +294,19 @@ def common_filters(limit=None, sort_key=None, sort_dir=None, marker=None):
     return filters
 
 
+def get_api_version(client):
+    """Return the API version of the requests sent by a client.
+
+    This is the version negotiated with the Watcher API, or cached for its
+    endpoint, rather than the one requested by the user, e.g. ``1.latest``
+    or a version newer than the one of the server.
+
+    :param client: a :class:`watcherclient.v1.client.Client`.
+    :returns: the API version, e.g. '1.5'.
+    """
+    return client.http_client.os_infra_optim_api_version
+
+
 def is_uuid_like(val):
     """Returns validation of a value as a UUID.
 
@@ -22,7 +22,10 @@ from watcherclient import exceptions
 
 LOG = logging.getLogger(__name__)
 
-DEFAULT_API_VERSION = httpclient.LATEST_VERSION
+# NOTE: the client negotiates the version with the Watcher API, and uses
+# the version cached by the previous commands, unless the user pins one,
+# e.g. with --os-infra-optim-api-version 1.5
+DEFAULT_API_VERSION = httpclient.DEFAULT_VER
 API_VERSION_OPTION = 'os_infra_optim_api_version'
 API_NAME = 'infra-optim'
 API_VERSIONS = {
@@ -59,6 +62,8 @@ def build_option_parser(parser):
                             default=DEFAULT_API_VERSION),
                         help=('Watcher API version, default=' +
                               DEFAULT_API_VERSION +
+                              ', the highest version supported by both the '
+                              'client and the server'
                               ' (Env: OS_INFRA_OPTIM_API_VERSION)'))
     return parser
 
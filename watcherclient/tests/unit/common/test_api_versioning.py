@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import pkgutil
 from unittest import mock
 
 from watcherclient.common import api_versioning
@@ -127,6 +128,21 @@ class GetAPIVersionTestCase(utils.BaseTestCase):
         output = api_versioning.get_available_major_versions()
         self.assertNotEqual([], output)
 
+    @mock.patch("pkgutil.iter_modules", wraps=pkgutil.iter_modules)
+    def test_get_available_client_versions_cached(self, mock_iter_modules):
+        api_versioning._discover_major_versions.cache_clear()
+        self.addCleanup(api_versioning._discover_major_versions.cache_clear)
+        first = api_versioning.get_available_major_versions()
+        second = api_versioning.get_available_major_versions()
+        self.assertEqual(first, second)
+        self.assertEqual(1, mock_iter_modules.call_count)
+
+    def test_get_interned_version(self):
+        v1 = api_versioning.get_interned_version("1.5")
+        v2 = api_versioning.get_interned_version("1.5")
+        self.assertIs(v1, v2)
+        self.assertEqual(api_versioning.APIVersion("1.5"), v1)
+
     def test_wrong_format(self):
         self.assertRaises(exceptions.UnsupportedVersion,
                           api_versioning.get_api_version, "something_wrong")
@@ -0,0 +1,598 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import copy
+import pickle
+import threading
+import time
+from unittest import mock
+
+from oslo_serialization import jsonutils
+import yaml
+
+from watcherclient.common import base
+from watcherclient.common import httpclient
+from watcherclient import exceptions
+from watcherclient.tests.unit import utils
+
+
+def _paginated_responses(num_pages):
+    responses = {}
+    for page in range(num_pages):
+        url = '/v1/things' if page == 0 else '/v1/things?page=%d' % page
+        body = {'things': [{'uuid': str(page)}]}
+        if page < num_pages - 1:
+            body['next'] = 'http://127.0.0.1:9322/v1/things?page=%d' % (
+                page + 1)
+        responses[url] = {'GET': ({}, body)}
+    return responses
+
+
+class FakeManager(base.Manager):
+    resource_class = base.Resource
+
+    def get(self, thing):
+        return self._list('/v1/things/%s' % thing)[0]
+
+
+class ManagerPaginationTest(utils.BaseTestCase):
+
+    def test_iter_pagination_prefetch(self):
+        api = utils.FakeAPI(_paginated_responses(5))
+        mgr = FakeManager(api)
+        things = mgr._iter_pagination('/v1/things', 'things', limit=0,
+                                      prefetch=2)
+        self.assertEqual(['0', '1', '2', '3', '4'],
+                         [thing.uuid for thing in things])
+        self.assertEqual(5, len(api.calls))
+
+    def test_iter_pagination_prefetch_error(self):
+        responses = _paginated_responses(3)
+        del responses['/v1/things?page=2']
+        api = utils.FakeAPI(responses)
+
+        def _request(method, url, headers=None, body=None):
+            if url not in responses:
+                raise exceptions.ServiceUnavailable()
+            return responses[url][method]
+        api._request = _request
+
+        mgr = FakeManager(api)
+        things = mgr._iter_pagination('/v1/things', 'things', limit=0,
+                                      prefetch=1)
+        self.assertEqual('0', next(things).uuid)
+        self.assertEqual('1', next(things).uuid)
+        self.assertRaises(exceptions.ServiceUnavailable, next, things)
+
+    def test_iter_pagination_prefetch_stops_at_limit(self):
+        api = utils.FakeAPI(_paginated_responses(10))
+        mgr = FakeManager(api)
+        things = list(mgr._iter_pagination('/v1/things', 'things', limit=2,
+                                           prefetch=1))
+        self.assertEqual(['0', '1'], [thing.uuid for thing in things])
+        self.assertLess(len(api.calls), 10)
+
+    def _assert_worker_stopped(self):
+        for thread in threading.enumerate():
+            if getattr(thread, '_target', None) is not None and (
+                    thread._target.__qualname__.endswith(
+                        '_iter_pages_prefetch.<locals>._fetch')):
+                self.fail('The prefetching thread is still running')
+
+    def test_iter_pagination_prefetch_close(self):
+        api = utils.FakeAPI(_paginated_responses(10))
+        mgr = FakeManager(api)
+        things = mgr._iter_pagination('/v1/things', 'things', limit=0,
+                                      prefetch=1)
+        self.assertEqual('0', next(things).uuid)
+        # NOTE: the iterator is still referenced, only close() stops the
+        # worker
+        things.close()
+        self._assert_worker_stopped()
+        self.assertRaises(StopIteration, next, things)
+        self.assertLess(len(api.calls), 10)
+
+    def test_iter_pagination_prefetch_context_manager(self):
+        api = utils.FakeAPI(_paginated_responses(10))
+        mgr = FakeManager(api)
+        with mgr._iter_pagination('/v1/things', 'things', limit=0,
+                                  prefetch=1) as things:
+            self.assertEqual('0', next(things).uuid)
+        self._assert_worker_stopped()
+
+    def test_iter_pagination_prefetch_limit_stops_worker(self):
+        api = utils.FakeAPI(_paginated_responses(10))
+        mgr = FakeManager(api)
+        things = mgr._iter_pagination('/v1/things', 'things', limit=2,
+                                      prefetch=1)
+        self.assertEqual(['0', '1'], [thing.uuid for thing in things])
+        # NOTE: things is still referenced, the worker was stopped when
+        # the limit was reached
+        self._assert_worker_stopped()
+
+
+class LazyListTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(LazyListTest, self).setUp()
+        self.obj_class = mock.Mock(side_effect=base.Resource)
+        self.mgr = FakeManager(utils.FakeAPI(_paginated_responses(3)),
+                               lazy_lists=True)
+        self.things = self.mgr._list_pagination('/v1/things', 'things',
+                                                obj_class=self.obj_class,
+                                                limit=0)
+
+    def test_built_on_access(self):
+        self.assertEqual(3, len(self.things))
+        self.assertFalse(self.obj_class.called)
+
+        self.assertEqual('2', self.things[-1].uuid)
+        self.assertIs(self.things[2], self.things[-1])
+        self.assertEqual(1, self.obj_class.call_count)
+
+        self.assertEqual(['0', '1', '2'],
+                         [thing.uuid for thing in self.things])
+        self.assertEqual(3, self.obj_class.call_count)
+
+    def test_sequence(self):
+        self.assertEqual(['1', '2'],
+                         [thing.uuid for thing in self.things[1:]])
+        self.assertRaises(IndexError, self.things.__getitem__, 3)
+        self.assertEqual(list(self.things), self.things)
+        self.assertEqual(4, len(self.things + [None]))
+        self.assertIn(self.things[0], self.things)
+
+    def test_built_once_by_concurrent_threads(self):
+        building = threading.Event()
+        release = threading.Event()
+        waiting = []
+
+        class _Lock(object):
+            lock = threading.Lock()
+
+            def __enter__(self):
+                waiting.append(threading.current_thread())
+                return self.lock.__enter__()
+
+            def __exit__(self, *args):
+                return self.lock.__exit__(*args)
+
+        def build(*args, **kwargs):
+            building.set()
+            release.wait()
+            return base.Resource(*args, **kwargs)
+
+        self.obj_class.side_effect = build
+        self.things._lock = _Lock()
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(self.things[0]))
+            for _ in range(2)]
+        threads[0].start()
+        building.wait()
+        threads[1].start()
+        while len(waiting) < 2:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, self.obj_class.call_count)
+        self.assertIs(results[0], results[1])
+
+    def test_list_lazy(self):
+        things = self.mgr._list('/v1/things', 'things',
+                                obj_class=self.obj_class)
+        self.assertIsInstance(things, base.LazyList)
+        self.assertEqual(1, len(things))
+        self.assertFalse(self.obj_class.called)
+
+    def test_list_not_lazy(self):
+        mgr = FakeManager(utils.FakeAPI(_paginated_responses(3)))
+        things = mgr._list_pagination('/v1/things', 'things',
+                                      obj_class=self.obj_class, limit=0)
+        self.assertIsInstance(things, list)
+        self.assertEqual(3, self.obj_class.call_count)
+        things = mgr._list('/v1/things', 'things', obj_class=self.obj_class)
+        self.assertIsInstance(things, list)
+
+
+class RecordTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(RecordTest, self).setUp()
+        responses = _paginated_responses(2)
+        responses['/v1/things/0'] = {'GET': ({}, {'uuid': '0'})}
+        self.mgr = FakeManager(utils.FakeAPI(responses), compact=True)
+
+    def test_list_compact(self):
+        things = self.mgr._list_pagination('/v1/things', 'things', limit=0)
+        for thing in things:
+            self.assertIsInstance(thing, base.Record)
+        self.assertEqual(['0', '1'], [thing.uuid for thing in things])
+        # NOTE: the records of a list share their fields
+        self.assertIs(type(things[0]), type(things[1]))
+
+    def test_get_not_compact(self):
+        self.assertIsInstance(self.mgr.get('0'), base.Resource)
+
+    def test_read_only(self):
+        record = self.mgr._list('/v1/things', 'things')[0]
+        self.assertRaises(AttributeError, setattr, record, 'uuid', '1')
+        self.assertRaises(AttributeError, delattr, record, 'uuid')
+        self.assertRaises(AttributeError, getattr, record, 'name')
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_to_dict(self):
+        record = base.RecordFactory()(None, {'uuid': '0', 'parents': ['1']})
+        info = record.to_dict()
+        self.assertEqual({'uuid': '0', 'parents': ['1']}, info)
+        self.assertRaises(TypeError, info['parents'].append, '2')
+        info = record.to_dict(copy=True)
+        info['parents'].append('2')
+        self.assertEqual(['1'], record.parents)
+        self.assertEqual(record, pickle.loads(pickle.dumps(record)))
+        self.assertEqual("<Record parents=['1'], uuid=0>", repr(record))
+
+    def test_tuple_method_fields(self):
+        record = base.RecordFactory()(None, {'uuid': '0', 'count': 3,
+                                             'index': 1})
+        self.assertEqual(3, record.count)
+        self.assertEqual(1, record.index)
+        self.assertEqual({'uuid': '0', 'count': 3, 'index': 1},
+                         record.to_dict())
+        self.assertEqual(3, pickle.loads(pickle.dumps(record)).count)
+
+    def test_reserved_fields_not_compact(self):
+        factory = base.RecordFactory()
+        for info in ({'uuid': '0', 'to_dict': 'dummy'},
+                     {'uuid': '0', '_fields': 'dummy'}):
+            thing = factory(self.mgr, info)
+            self.assertNotIsInstance(thing, base.Record)
+            self.assertIsInstance(thing, base.Resource)
+
+
+class FakeDetailManager(FakeManager):
+
+    @staticmethod
+    def _path(id=None):
+        return '/v1/things/%s' % id if id else '/v1/things'
+
+
+class HydrateTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(HydrateTest, self).setUp()
+        short = {'things': [{'uuid': '0'}, {'uuid': '1'}]}
+        detail = {'things': [{'uuid': '1', 'state': 'B'},
+                             {'uuid': '2', 'state': 'C'}],
+                  'next': 'http://127.0.0.1:9322/v1/things/detail?page=1'}
+        detail_page = {'things': [{'uuid': '0', 'state': 'A'}]}
+        self.api = utils.FakeAPI({
+            '/v1/things': {'GET': ({}, short)},
+            '/v1/things/?limit=2': {'GET': ({}, short)},
+            '/v1/things/detail': {'GET': ({}, detail)},
+            '/v1/things/detail?limit=2': {'GET': ({}, detail)},
+            '/v1/things/detail?page=1': {'GET': ({}, detail_page)},
+        })
+
+    def test_hydrate(self):
+        mgr = FakeDetailManager(self.api)
+        things = mgr._list('/v1/things', 'things')
+        self.assertRaises(AttributeError, getattr, things[0], 'state')
+
+        self.assertIs(things, mgr.hydrate(things))
+
+        self.assertEqual(['A', 'B'], [thing.state for thing in things])
+        self.assertEqual(['/v1/things', '/v1/things/detail',
+                          '/v1/things/detail?page=1'],
+                         [call[1] for call in self.api.calls])
+
+    def test_hydrate_resources(self):
+        mgr = FakeDetailManager(self.api)
+        things = list(mgr._list('/v1/things', 'things'))[1:]
+
+        mgr.hydrate(things)
+
+        self.assertEqual('B', things[0].state)
+        # NOTE: the pagination stops once all the resources are found
+        self.assertEqual(2, len(self.api.calls))
+
+    def test_lazy_detail(self):
+        mgr = FakeDetailManager(self.api, lazy_detail=True)
+        things = mgr._list('/v1/things/?limit=2', 'things')
+
+        self.assertEqual('A', things[0].state)
+        self.assertEqual('B', things[1].state)
+        self.assertRaises(AttributeError, getattr, things[1], 'name')
+        self.assertEqual(['/v1/things/?limit=2',
+                          '/v1/things/detail?limit=2',
+                          '/v1/things/detail?page=1'],
+                         [call[1] for call in self.api.calls])
+
+    def test_lazy_detail_probes(self):
+        mgr = FakeDetailManager(self.api, lazy_detail=True)
+        things = mgr._list('/v1/things', 'things')
+
+        self.assertNotEqual(things[0], things[1])
+        self.assertEqual(things[0], things[0])
+        self.assertIs(things[0], base.getid(things[0]))
+        self.assertFalse(hasattr(things[0], 'id'))
+        self.assertFalse(hasattr(things[0], '_private'))
+        self.assertEqual(['/v1/things'],
+                         [call[1] for call in self.api.calls])
+
+        self.assertEqual('A', things[0].state)
+        self.assertEqual(3, len(self.api.calls))
+
+    def test_lazy_detail_records(self):
+        mgr = FakeDetailManager(self.api, compact=True, lazy_detail=True,
+                                lazy_lists=True)
+        things = mgr._list('/v1/things', 'things')
+        self.assertRaises(AttributeError, getattr, things[0], 'state')
+
+        mgr.hydrate(things)
+
+        self.assertEqual('A', things[0].state)
+
+
+class InternFieldsTest(utils.BaseTestCase):
+
+    def _list(self, intern):
+        # NOTE: build distinct strings, like the JSON decoder does
+        things = [{'uuid': str(i), 'state': ''.join(['PEN', 'DING']),
+                   'parents': [''.join(['pa', 'rent'])]}
+                  for i in range(2)]
+        api = utils.FakeAPI({'/v1/things': {'GET': ({}, {'things': things})}})
+        mgr = FakeManager(api, intern=intern)
+        mgr.interned_fields = ('state', 'parents', 'missing')
+        return mgr._list('/v1/things', 'things')
+
+    def test_interned(self):
+        things = self._list(intern=True)
+        self.assertEqual('PENDING', things[0].state)
+        self.assertIs(things[0].state, things[1].state)
+        self.assertIs(things[0].parents[0], things[1].parents[0])
+
+    def test_not_interned_by_default(self):
+        things = self._list(intern=False)
+        self.assertIsNot(things[0].state, things[1].state)
+
+
+class ResourceToDictTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(ResourceToDictTest, self).setUp()
+        self.resource = base.Resource(
+            None, {'uuid': '0', 'parents': ['1'],
+                   'input_parameters': {'nodes': [{'name': 'node'}]}},
+            loaded=True)
+
+    def test_read_only(self):
+        info = self.resource.to_dict()
+        self.assertEqual({'uuid': '0', 'parents': ['1'],
+                          'input_parameters': {'nodes': [{'name': 'node'}]}},
+                         info)
+        self.assertIsInstance(info, dict)
+        self.assertRaises(TypeError, info.__setitem__, 'uuid', '1')
+        self.assertRaises(TypeError, info.update, {'uuid': '1'})
+        self.assertRaises(TypeError, info['parents'].append, '2')
+        nodes = info['input_parameters']['nodes']
+        self.assertRaises(TypeError, nodes[0].__setitem__, 'name', 'other')
+        for node in nodes:
+            self.assertRaises(TypeError, node.pop, 'name')
+        self.assertEqual('{"nodes": [{"name": "node"}]}',
+                         jsonutils.dumps(info['input_parameters']))
+
+    def test_copy(self):
+        info = self.resource.to_dict(copy=True)
+        info['parents'].append('2')
+        info['input_parameters']['nodes'][0]['name'] = 'other'
+        self.assertEqual(['1'], self.resource.parents)
+        self.assertEqual({'nodes': [{'name': 'node'}]},
+                         self.resource.input_parameters)
+
+        info = copy.deepcopy(self.resource.to_dict())
+        info['parents'].append('2')
+        self.assertEqual(['1'], self.resource.parents)
+
+    def test_shallow_copies_keep_nested_values_read_only(self):
+        info = self.resource.to_dict()
+        for shallow in (dict(info), info.copy(), copy.copy(info), {**info},
+                        info | {}, {} | info):
+            self.assertEqual(info, shallow)
+            shallow['uuid'] = '1'
+            self.assertRaises(TypeError, shallow['parents'].append, '2')
+            nodes = shallow['input_parameters']['nodes']
+            self.assertRaises(TypeError, nodes[0].__setitem__, 'name', 'x')
+            for copied in (list(nodes), nodes.copy(), nodes + [],
+                           [] + nodes, nodes * 1, list(reversed(nodes))):
+                self.assertRaises(TypeError, copied[0].__setitem__,
+                                  'name', 'x')
+        self.assertEqual('0', self.resource.uuid)
+        self.assertEqual({'nodes': [{'name': 'node'}]},
+                         self.resource.input_parameters)
+
+    def test_yaml_dump(self):
+        info = self.resource.to_dict()
+        expected = {'uuid': '0', 'parents': ['1'],
+                    'input_parameters': {'nodes': [{'name': 'node'}]}}
+        for dump in (yaml.safe_dump, yaml.dump):
+            dumped = dump(info)
+            self.assertNotIn('!!python', dumped)
+            self.assertEqual(expected, yaml.safe_load(dumped))
+
+    def test_record_shallow_copies(self):
+        record = base.RecordFactory()(None, {'uuid': '0', 'parents': ['1']})
+        for shallow in (dict(record.to_dict()), record.to_dict().copy(),
+                        {**record.to_dict()}):
+            self.assertRaises(TypeError, shallow['parents'].append, '2')
+        self.assertEqual(['1'], record.parents)
+
+
+class ManagerGetManyTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(ManagerGetManyTest, self).setUp()
+        responses = {}
+        for i in range(20):
+            responses['/v1/things/%d' % i] = {
+                'GET': ({}, {'uuid': str(i)})}
+        self.api = utils.FakeAPI(responses)
+        self.mgr = FakeManager(self.api)
+
+    def test_get_many_preserves_order(self):
+        ids = [str(i) for i in reversed(range(20))]
+        things = self.mgr.get_many(ids, max_workers=4)
+        self.assertEqual(ids, [thing.uuid for thing in things])
+        self.assertEqual(20, len(self.api.calls))
+
+    def test_get_many_reports_errors(self):
+        error = exceptions.HTTPNotFound()
+        orig_get = self.mgr.get
+
+        def _get(thing):
+            if thing == '1':
+                raise error
+            return orig_get(thing)
+        self.mgr.get = _get
+
+        things = self.mgr.get_many(['0', '1', '2'])
+        self.assertEqual('0', things[0].uuid)
+        self.assertIs(error, things[1])
+        self.assertEqual('2', things[2].uuid)
+
+    def test_get_many_empty(self):
+        self.assertEqual([], self.mgr.get_many([]))
+        self.assertEqual([], self.api.calls)
+
+    def test_get_many_limiter(self):
+        limiter = mock.Mock(max_limit=4)
+        limiter.acquire.return_value = 'token'
+        error = exceptions.ServiceUnavailable()
+        self.mgr.get = mock.Mock(side_effect=['thing', error])
+
+        self.assertEqual(['thing', error],
+                         self.mgr.get_many(['0', '1'], limiter=limiter))
+        self.assertEqual(2, limiter.acquire.call_count)
+        limiter.release.assert_has_calls(
+            [mock.call('token', None, latency=None),
+             mock.call('token', error, latency=None)],
+            any_order=True)
+
+    def test_get_many_limiter_attempt_latency(self):
+        self.api.retry_stats = httpclient.RetryStats()
+        limiter = mock.Mock(max_limit=4)
+        limiter.acquire.return_value = 'token'
+
+        def _get(thing):
+            self.api.retry_stats._record(3, 0.25)
+            return thing
+        self.mgr.get = _get
+
+        self.mgr.get_many(['0'], limiter=limiter)
+        limiter.release.assert_called_once_with('token', None,
+                                                latency=0.25)
+
+
+class ManagerDeleteManyTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(ManagerDeleteManyTest, self).setUp()
+        self.mgr = FakeManager(mock.Mock())
+        self.deleted = []
+        self.mgr.delete = self.deleted.append
+
+    def test_delete_many(self):
+        ids = [str(i) for i in range(10)]
+        self.assertEqual([None] * 10, self.mgr.delete_many(ids))
+        self.assertEqual(sorted(ids), sorted(self.deleted))
+
+    def test_delete_many_reports_errors(self):
+        error = exceptions.Conflict()
+        self.mgr.delete = mock.Mock(side_effect=[None, error])
+
+        self.assertEqual([None, error],
+                         self.mgr.delete_many(['0', '1'], max_workers=1))
+
+    def test_update_many(self):
+        self.mgr.update = mock.Mock(side_effect=lambda id, patch: (id, patch))
+
+        self.assertEqual([('0', 'p0'), ('1', 'p1')],
+                         self.mgr.update_many([('0', 'p0'), ('1', 'p1')]))
+        self.assertEqual([('0', 'p0')], self.mgr.update_many({'0': 'p0'}))
+
+    @mock.patch('time.sleep')
+    def test_delete_many_rate(self, mock_sleep):
+        with mock.patch('time.monotonic', return_value=100.0):
+            self.mgr.delete_many(['0', '1', '2'], max_workers=1, rate=2)
+
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         mock_sleep.call_args_list)
+
+
+class ExecutorManagerTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(ExecutorManagerTest, self).setUp()
+        self.api = utils.FakeAPI(_paginated_responses(3))
+        self.mgr = FakeManager(self.api)
+        self.mgr.list = lambda limit=None: self.mgr._list_pagination(
+            '/v1/things', 'things', limit=limit)
+
+    def test_method(self):
+        async_mgr = base.ExecutorManager(self.mgr)
+        things = asyncio.run(async_mgr.list(limit=0))
+        self.assertEqual(['0', '1', '2'], [thing.uuid for thing in things])
+        self.assertEqual(3, len(self.api.calls))
+
+    def test_attribute(self):
+        async_mgr = base.ExecutorManager(self.mgr)
+        self.assertIs(self.api, async_mgr.api)
+
+    def test_iter(self):
+        self.mgr.iter = lambda limit=None: self.mgr._iter_pagination(
+            '/v1/things', 'things', limit=limit)
+        async_mgr = base.ExecutorManager(self.mgr, chunk_size=2)
+
+        async def _collect():
+            return [thing.uuid async for thing in async_mgr.iter(limit=0)]
+
+        self.assertEqual(['0', '1', '2'], asyncio.run(_collect()))
+
+    def test_iter_closes_iterator(self):
+        closed = []
+
+        def _items(limit=None):
+            try:
+                yield from ['0', '1', '2']
+            finally:
+                closed.append(True)
+
+        self.mgr.iter = _items
+        async_mgr = base.ExecutorManager(self.mgr, chunk_size=2)
+
+        async def _first():
+            async for thing in async_mgr.iter(limit=0):
+                return thing
+
+        self.assertEqual('0', asyncio.run(_first()))
+        self.assertEqual([True], closed)
+
+    def test_iter_falls_back_to_list(self):
+        async_mgr = base.ExecutorManager(self.mgr)
+
+        async def _collect():
+            return [thing.uuid async for thing in async_mgr.iter(limit=2)]
+
+        self.assertEqual(['0', '1'], asyncio.run(_collect()))
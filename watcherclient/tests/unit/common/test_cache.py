@@ -0,0 +1,217 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import time
+from unittest import mock
+
+from watcherclient.common import cache
+from watcherclient.common import filecache
+from watcherclient.tests.unit import utils
+
+
+class TTLCacheTest(utils.BaseTestCase):
+
+    def test_get_and_set(self):
+        ttl_cache = cache.TTLCache()
+        self.assertIsNone(ttl_cache.get('key'))
+        ttl_cache.set('key', {'name': 'value'})
+        self.assertEqual({'name': 'value'}, ttl_cache.get('key'))
+        self.assertEqual({'size': 1, 'hits': 1, 'misses': 1,
+                          'evictions': 0}, ttl_cache.stats())
+
+    def test_expiry(self):
+        ttl_cache = cache.TTLCache(ttl=10)
+        ttl_cache.set('key', 'value')
+        later = time.time() + 11
+        with mock.patch.object(time, 'time', return_value=later):
+            self.assertIsNone(ttl_cache.get('key'))
+        self.assertEqual(0, ttl_cache.stats()['size'])
+
+    def test_lru_eviction(self):
+        ttl_cache = cache.TTLCache(maxsize=2)
+        ttl_cache.set('a', 1)
+        ttl_cache.set('b', 2)
+        ttl_cache.get('a')
+        ttl_cache.set('c', 3)
+
+        self.assertEqual(1, ttl_cache.get('a'))
+        self.assertIsNone(ttl_cache.get('b'))
+        self.assertEqual(3, ttl_cache.get('c'))
+        self.assertEqual(1, ttl_cache.evictions)
+
+    def test_invalidate(self):
+        ttl_cache = cache.TTLCache()
+        ttl_cache.set('/v1/goals 1.0', 1)
+        ttl_cache.set('/v1/goals/dummy 1.0', 2)
+        ttl_cache.set('/v1/strategies 1.0', 3)
+
+        ttl_cache.invalidate('/v1/goals')
+        self.assertIsNone(ttl_cache.get('/v1/goals 1.0'))
+        self.assertIsNone(ttl_cache.get('/v1/goals/dummy 1.0'))
+        self.assertEqual(3, ttl_cache.get('/v1/strategies 1.0'))
+
+        ttl_cache.invalidate()
+        self.assertEqual(0, ttl_cache.stats()['size'])
+
+    def test_persist(self):
+        ttl_cache = cache.TTLCache(persist=True)
+        ttl_cache.set('key', {'name': 'value'})
+        self.assertTrue(os.path.exists(
+            os.path.join(filecache.CACHE_DIR, cache.CACHE_FILENAME)))
+
+        # NOTE: simulate a new process
+        self.assertEqual({'name': 'value'},
+                         cache.TTLCache(persist=True).get('key'))
+
+    def test_persist_expired(self):
+        cache.TTLCache(persist=True, ttl=10).set('key', 'value')
+        later = time.time() + 11
+        with mock.patch.object(time, 'time', return_value=later):
+            ttl_cache = cache.TTLCache(persist=True, ttl=10)
+        self.assertEqual(0, ttl_cache.stats()['size'])
+
+    def test_persist_merge(self):
+        # NOTE: two processes sharing the cache file
+        first = cache.TTLCache(persist=True)
+        second = cache.TTLCache(persist=True)
+        first.set('a', 1)
+        second.set('b', 2)
+
+        ttl_cache = cache.TTLCache(persist=True)
+        self.assertEqual(1, ttl_cache.get('a'))
+        self.assertEqual(2, ttl_cache.get('b'))
+
+    def test_persist_invalidate(self):
+        cache.TTLCache(persist=True).set('/v1/goals 1.0', 1)
+        ttl_cache = cache.TTLCache(persist=True)
+        cache.TTLCache(persist=True).set('/v1/strategies 1.0', 2)
+
+        ttl_cache.invalidate('/v1/goals')
+
+        ttl_cache = cache.TTLCache(persist=True)
+        self.assertIsNone(ttl_cache.get('/v1/goals 1.0'))
+        self.assertEqual(2, ttl_cache.get('/v1/strategies 1.0'))
+
+    @mock.patch.object(filecache, 'write_json')
+    def test_persist_save_interval(self, mock_write):
+        ttl_cache = cache.TTLCache(persist=True, save_interval=60)
+        ttl_cache.set('a', 1)
+        ttl_cache.set('b', 2)
+        ttl_cache.set('c', 3)
+        self.assertEqual(1, mock_write.call_count)
+
+        ttl_cache.flush()
+        self.assertEqual(2, mock_write.call_count)
+        self.assertEqual({'a', 'b', 'c'},
+                         set(mock_write.call_args[0][1]))
+
+        ttl_cache.flush()
+        self.assertEqual(2, mock_write.call_count)
+
+    def test_persist_corrupted_entries(self):
+        path = os.path.join(filecache.CACHE_DIR, cache.CACHE_FILENAME)
+        filecache.write_json(path, {
+            'k1': {'data': 1},
+            'k2': {'timestamp': time.time(), 'data': 2},
+            'k3': {'timestamp': 'dummy', 'data': 3},
+            'k4': ['dummy']})
+
+        ttl_cache = cache.TTLCache(path=path)
+        self.assertEqual(1, ttl_cache.stats()['size'])
+        self.assertEqual(2, ttl_cache.get('k2'))
+
+        ttl_cache.set('k5', 5)
+        self.assertEqual({'k2', 'k5'}, set(filecache.read_json(path)))
+
+    @mock.patch.object(filecache, 'write_json', side_effect=OSError)
+    def test_persist_unwritable(self, mock_write):
+        ttl_cache = cache.TTLCache(persist=True)
+        ttl_cache.set('key', 'value')
+        self.assertEqual('value', ttl_cache.get('key'))
+
+
+class ResponseCacheTest(utils.BaseTestCase):
+
+    def _resp(self, headers=None):
+        return mock.Mock(headers=headers or {})
+
+    def test_lookup_with_validator(self):
+        response_cache = cache.ResponseCache()
+        response_cache.store('/v1/audits', '1.0',
+                             self._resp({'ETag': '"abc"'}), b'{"audits": []}')
+
+        entry, fresh = response_cache.lookup('/v1/audits', '1.0')
+
+        self.assertFalse(fresh)
+        self.assertEqual({'If-None-Match': '"abc"'},
+                         response_cache.conditional_headers(entry))
+        self.assertEqual((None, False),
+                         response_cache.lookup('/v1/audits', '1.1'))
+
+    def test_lookup_without_validator(self):
+        response_cache = cache.ResponseCache(ttl=10)
+        response_cache.store('/v1/audits', '1.0', self._resp(),
+                             b'{"audits": []}')
+
+        entry, fresh = response_cache.lookup('/v1/audits', '1.0')
+        self.assertTrue(fresh)
+        self.assertEqual(b'{"audits": []}', entry['content'])
+
+        later = time.time() + 11
+        with mock.patch.object(time, 'time', return_value=later):
+            self.assertEqual((None, False),
+                             response_cache.lookup('/v1/audits', '1.0'))
+
+    def test_invalidate_collection(self):
+        response_cache = cache.ResponseCache()
+        for url in ('/v1/audits', '/v1/audits/dummy?fields=uuid',
+                    '/v1/audit_templates'):
+            response_cache.store(url, '1.0', self._resp(), b'{}')
+
+        response_cache.invalidate('/v1/audits/dummy')
+
+        self.assertEqual((None, False),
+                         response_cache.lookup('/v1/audits', '1.0'))
+        self.assertEqual(
+            (None, False),
+            response_cache.lookup('/v1/audits/dummy?fields=uuid', '1.0'))
+        self.assertTrue(
+            response_cache.lookup('/v1/audit_templates', '1.0')[1])
+        self.assertEqual({'size': 1, 'hits': 1, 'revalidations': 0,
+                          'misses': 3}, response_cache.stats())
+
+    def test_invalidate_related_collections(self):
+        response_cache = cache.ResponseCache()
+        for url in ('/v1/actions?action_plan_uuid=dummy', '/v1/action_plans',
+                    '/v1/goals'):
+            response_cache.store(url, '1.0', self._resp(), b'{}')
+
+        response_cache.invalidate('/v1/action_plans/dummy/start')
+
+        self.assertEqual(
+            (None, False),
+            response_cache.lookup('/v1/actions?action_plan_uuid=dummy',
+                                  '1.0'))
+        self.assertEqual((None, False),
+                         response_cache.lookup('/v1/action_plans', '1.0'))
+        self.assertTrue(response_cache.lookup('/v1/goals', '1.0')[1])
+
+    def test_lookup_keyed_by_scope(self):
+        response_cache = cache.ResponseCache()
+        response_cache.store('/v1/audits', '1.0', self._resp(), b'{}',
+                             scope='http://watcher:9322 user1')
+
+        self.assertTrue(response_cache.lookup(
+            '/v1/audits', '1.0', 'http://watcher:9322 user1')[1])
+        self.assertEqual((None, False), response_cache.lookup(
+            '/v1/audits', '1.0', 'http://watcher:9322 user2'))
@@ -0,0 +1,82 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import math
+
+from watcherclient.common.apiclient import base as apiclient_base
+from watcherclient.common import codec
+from watcherclient.common import httpclient
+from watcherclient.tests.unit import utils
+
+
+class CodecTest(utils.BaseTestCase):
+
+    def test_round_trip(self):
+        obj = {'uuid': 'dummy', 'parents': ['1', '2'], 'value': 1.5,
+               'description': 'café', 'deleted_at': None}
+        for name in codec.CODECS:
+            json_codec = codec.get_codec(name)
+            encoded = json_codec.encode(obj)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(obj, json_codec.decode(encoded))
+            self.assertEqual(obj, json_codec.decode(encoded.decode('utf-8')))
+
+    def test_encode_non_json_types(self):
+        obj = {'start_time': datetime.datetime(2026, 10, 18, 10, 0),
+               'parameters': apiclient_base.ReadOnlyDict({'period': 10})}
+        for name in codec.CODECS:
+            self.assertEqual(
+                {'start_time': '2026-10-18T10:00:00.000000',
+                 'parameters': {'period': 10}},
+                codec.get_codec(name).decode(
+                    codec.get_codec(name).encode(obj)))
+
+    def test_large_integers(self):
+        obj = {'size': 2 ** 70}
+        for name in codec.CODECS:
+            self.assertEqual(obj, codec.JSONCodec().decode(
+                codec.get_codec(name).encode(obj)))
+
+    def test_decode_nan_and_infinity(self):
+        for name in codec.CODECS:
+            value = codec.get_codec(name).decode(b'[NaN, Infinity]')
+            self.assertTrue(math.isnan(value[0]))
+            self.assertEqual(float('inf'), value[1])
+
+    def test_invalid_json(self):
+        for name in codec.CODECS:
+            self.assertRaises(ValueError, codec.get_codec(name).decode,
+                              b'{"uuid":')
+
+    def test_get_codec(self):
+        self.assertEqual('json', codec.get_codec().name)
+        self.assertEqual('json', codec.get_codec('json').name)
+        json_codec = codec.JSONCodec()
+        self.assertIs(json_codec, codec.get_codec(json_codec))
+        self.assertRaises(ValueError, codec.get_codec, 'dummy')
+
+    def test_extract_error_json(self):
+        body = (b'{"error_message": "{\\"faultstring\\": \\"Not Found\\", '
+                b'\\"debuginfo\\": null}"}')
+        for name in codec.CODECS:
+            self.assertEqual(
+                {'faultstring': 'Not Found', 'debuginfo': None},
+                httpclient._extract_error_json(body, codec.get_codec(name)))
+        self.assertEqual({}, httpclient._extract_error_json(b'<html>'))
+
+    def test_client_codec(self):
+        client = httpclient.HTTPClient('http://localhost:9322/',
+                                       json_codec='json')
+        self.assertEqual('json', client.json_codec.name)
+        self.assertEqual('json', httpclient.HTTPClient(
+            'http://localhost:9322/').json_codec.name)
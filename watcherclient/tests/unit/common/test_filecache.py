@@ -0,0 +1,57 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import time
+from unittest import mock
+
+from watcherclient.common import filecache
+from watcherclient.tests.unit import utils
+
+DATA = {'version': '1.1', 'min_version': '1.0', 'max_version': '1.1'}
+
+
+class FileCacheTest(utils.BaseTestCase):
+
+    def test_retrieve_no_data(self):
+        self.assertIsNone(filecache.retrieve_data('localhost', '9322'))
+
+    def test_save_and_retrieve(self):
+        filecache.save_data('localhost', '9322', DATA)
+        self.assertEqual(DATA, filecache.retrieve_data('localhost', '9322'))
+        self.assertIsNone(filecache.retrieve_data('localhost', '9323'))
+
+    def test_retrieve_from_file(self):
+        filecache.save_data('localhost', '9322', DATA)
+        self.assertTrue(os.path.exists(
+            os.path.join(filecache.CACHE_DIR, filecache.CACHE_FILENAME)))
+        # NOTE: simulate a new process
+        filecache.clear()
+        self.assertEqual(DATA, filecache.retrieve_data('localhost', '9322'))
+
+    def test_retrieve_expired(self):
+        filecache.save_data('localhost', '9322', DATA)
+        later = time.time() + filecache.DEFAULT_EXPIRY + 1
+        with mock.patch.object(time, 'time', return_value=later):
+            self.assertIsNone(filecache.retrieve_data('localhost', '9322'))
+
+    def test_retrieve_corrupted_file(self):
+        os.makedirs(filecache.CACHE_DIR, exist_ok=True)
+        with open(os.path.join(filecache.CACHE_DIR,
+                               filecache.CACHE_FILENAME), 'w') as f:
+            f.write('not json')
+        self.assertIsNone(filecache.retrieve_data('localhost', '9322'))
+
+    @mock.patch.object(filecache, '_write_file', side_effect=OSError)
+    def test_save_unwritable(self, mock_write):
+        filecache.save_data('localhost', '9322', DATA)
+        self.assertEqual(DATA, filecache.retrieve_data('localhost', '9322'))
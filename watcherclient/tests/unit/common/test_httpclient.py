@@ -0,0 +1,874 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import http.server
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from unittest import mock
+
+import fixtures
+from keystoneauth1 import session as ks_session
+from oslo_serialization import jsonutils
+from oslo_utils import strutils
+
+from watcherclient.common import api_versioning
+from watcherclient.common import cache
+from watcherclient.common import codec
+from watcherclient.common import filecache
+from watcherclient.common import httpclient
+from watcherclient import exceptions
+from watcherclient.tests.unit import utils
+
+
+def _session_response(content, status_code=200,
+                      content_type='application/json', headers=None):
+    all_headers = {'Content-Type': content_type}
+    all_headers.update(headers or {})
+    return utils.FakeSessionResponse(all_headers, content=content,
+                                     status_code=status_code, version=11)
+
+
+class HTTPClientTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(HTTPClientTest, self).setUp()
+        self.client = httpclient.HTTPClient('http://localhost:9322/')
+        self.client.session = mock.Mock(verify=True, cert=None)
+
+    def test_json_request_decodes_bytes_body(self):
+        body = {'goals': [{'uuid': 'fake-uuid', 'name': 'dummy'}]}
+        self.client.session.request.return_value = _session_response(
+            jsonutils.dump_as_bytes(body))
+
+        resp, result = self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(body, result)
+
+    def test_raw_request_returns_text_body(self):
+        self.client.session.request.return_value = _session_response(
+            b'{"result": "ok"}')
+
+        resp, body_iter = self.client.raw_request('DELETE', '/v1/audits/1')
+
+        self.assertEqual('{"result": "ok"}', ''.join(body_iter))
+
+    def test_error_response_extracts_fault(self):
+        error = {'error_message': jsonutils.dumps(
+            {'faultstring': 'Audit not found', 'debuginfo': None})}
+        self.client.session.request.return_value = _session_response(
+            jsonutils.dump_as_bytes(error), status_code=404)
+
+        exc = self.assertRaises(exceptions.HTTPNotFound,
+                                self.client.json_request,
+                                'GET', '/v1/audits/1')
+        self.assertIn('Audit not found', str(exc))
+
+    @mock.patch.object(api_versioning, 'get_api_version',
+                       wraps=api_versioning.get_api_version)
+    def test_api_version_header_cached(self, mock_get_api_version):
+        self.client.os_infra_optim_api_version = '1.latest'
+        self.assertEqual('infra-optim %s' % httpclient.LATEST_VERSION,
+                         self.client._get_api_version_header())
+        calls = mock_get_api_version.call_count
+        self.client._get_api_version_header()
+        self.assertEqual(calls, mock_get_api_version.call_count)
+
+        self.client.os_infra_optim_api_version = '1.1'
+        self.assertEqual('infra-optim 1.1',
+                         self.client._get_api_version_header())
+        self.assertGreater(mock_get_api_version.call_count, calls)
+
+    def test_negotiated_version_used_on_retry(self):
+        not_acceptable = _session_response(
+            b'', status_code=406,
+            headers={'OpenStack-API-Minimum-Version': '1.0',
+                     'OpenStack-API-Maximum-Version': '1.1'})
+        ok = _session_response(b'{}')
+        self.client.session.request.side_effect = [not_acceptable, ok]
+
+        self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual('1.1', self.client.os_infra_optim_api_version)
+        headers = self.client.session.request.call_args[1]['headers']
+        self.assertEqual('infra-optim 1.1', headers['OpenStack-API-Version'])
+
+    @mock.patch.object(strutils, 'mask_password')
+    def test_no_logging_work_when_debug_disabled(self, mock_mask):
+        self.client.session.request.return_value = _session_response(
+            b'{"password": "secret"}')
+
+        with mock.patch.object(self.client, '_process_header') as m_header:
+            self.client.json_request('POST', '/v1/audits',
+                                     body={'password': 'secret'})
+
+        self.assertFalse(m_header.called)
+        self.assertFalse(mock_mask.called)
+
+    def test_debug_logging_truncates_and_masks_body(self):
+        logger = self.useFixture(fixtures.FakeLogger(level=logging.DEBUG))
+        self.client.max_log_body_size = 40
+        body = b'{"password": "secret", "data": "' + b'x' * 100 + b'"}'
+        self.client.session.request.return_value = _session_response(body)
+
+        self.client.json_request('GET', '/v1/audits')
+
+        self.assertIn('"password": "***"', logger.output)
+        self.assertNotIn('secret', logger.output)
+        self.assertIn('(truncated, %d bytes total)' % len(body),
+                      logger.output)
+
+
+class HTTPClientConnectionTest(utils.BaseTestCase):
+
+    def test_default_pool(self):
+        client = httpclient.HTTPClient('http://localhost:9322/')
+        adapter = client.session.get_adapter('http://localhost:9322/')
+        self.assertEqual(httpclient.DEFAULT_POOL_MAXSIZE,
+                         adapter._pool_maxsize)
+        self.assertEqual('keep-alive', client.session.headers['Connection'])
+
+    def test_pool_options(self):
+        client = httpclient.HTTPClient('https://localhost:9322/',
+                                       pool_connections=2, pool_maxsize=50,
+                                       keep_alive=False)
+        adapter = client.session.get_adapter('https://localhost:9322/')
+        self.assertEqual(2, adapter._pool_connections)
+        self.assertEqual(50, adapter._pool_maxsize)
+        self.assertEqual('close', client.session.headers['Connection'])
+
+    def _request_kwargs(self, **client_kwargs):
+        client = httpclient.HTTPClient('http://localhost:9322/',
+                                       **client_kwargs)
+        client.session = mock.Mock(verify=True, cert=None)
+        client.session.request.return_value = _session_response(b'{}')
+        client.json_request('GET', '/v1/goals')
+        return client.session.request.call_args[1]
+
+    def test_timeout_applied(self):
+        self.assertEqual(30, self._request_kwargs(timeout=30)['timeout'])
+
+    def test_connect_and_read_timeouts(self):
+        kwargs = self._request_kwargs(timeout=30, connect_timeout=5)
+        self.assertEqual((5, 30), kwargs['timeout'])
+
+    def test_no_timeout(self):
+        self.assertNotIn('timeout', self._request_kwargs())
+
+
+class SessionClientConnectionTest(utils.BaseTestCase):
+
+    def _get_client(self, **kwargs):
+        session = mock.Mock()
+        session.request.return_value = _session_response(b'{}')
+        return httpclient.SessionClient(
+            session=session,
+            os_infra_optim_api_version='1.0',
+            api_version_select_state='user',
+            max_retries=0,
+            retry_interval=0,
+            endpoint='http://watcher.example.org:9322/v1',
+            **kwargs)
+
+    def test_request_options(self):
+        client = self._get_client(connect_timeout=5, read_timeout=60,
+                                  keep_alive=False)
+        client.json_request('GET', '/v1/goals')
+        kwargs = client.session.request.call_args[1]
+        self.assertEqual((5, 60), kwargs['timeout'])
+        self.assertEqual('close', kwargs['headers']['Connection'])
+
+    def test_default_request_options(self):
+        client = self._get_client()
+        client.json_request('GET', '/v1/goals')
+        kwargs = client.session.request.call_args[1]
+        self.assertNotIn('timeout', kwargs)
+        self.assertNotIn('Connection', kwargs['headers'])
+        self.assertFalse(client.session.session.mount.called)
+
+    def test_pool_mounted_for_endpoint_only(self):
+        client = self._get_client(pool_maxsize=50)
+        prefix, adapter = client.session.session.mount.call_args[0]
+        self.assertEqual('http://watcher.example.org:9322/', prefix)
+        self.assertEqual(50, adapter._pool_maxsize)
+
+
+class RetryPolicyTest(utils.BaseTestCase):
+
+    def test_exponential_backoff(self):
+        policy = httpclient.RetryPolicy(max_retries=5, interval=1,
+                                        max_interval=5, jitter=False)
+        error = exceptions.ConnectionRefused()
+        self.assertEqual([1, 2, 4, 5, 5, None],
+                         [policy.get_delay('GET', attempt, error, 0)
+                          for attempt in range(1, 7)])
+
+    @mock.patch('random.uniform', return_value=0.5)
+    def test_full_jitter(self, mock_uniform):
+        policy = httpclient.RetryPolicy(interval=1)
+        self.assertEqual(0.5, policy.get_delay(
+            'GET', 3, exceptions.ConnectionRefused(), 0))
+        mock_uniform.assert_called_once_with(0, 4)
+
+    def test_non_idempotent_method_not_retried(self):
+        policy = httpclient.RetryPolicy()
+        error = exceptions.ConnectionRefused()
+        self.assertIsNone(policy.get_delay('POST', 1, error, 0))
+        self.assertIsNone(policy.get_delay('PATCH', 1, error, 0))
+
+    def test_all_methods_retried(self):
+        policy = httpclient.RetryPolicy(methods=None, jitter=False)
+        self.assertEqual(2, policy.get_delay(
+            'POST', 1, exceptions.ConnectionRefused(), 0))
+
+    def test_retry_after(self):
+        policy = httpclient.RetryPolicy(interval=1, jitter=False)
+        error = exceptions.ServiceUnavailable(retry_after='10')
+        self.assertEqual(10, policy.get_delay('GET', 1, error, 0))
+
+    def test_max_elapsed(self):
+        policy = httpclient.RetryPolicy(interval=1, jitter=False,
+                                        max_elapsed=10)
+        error = exceptions.ConnectionRefused()
+        self.assertEqual(4, policy.get_delay('GET', 3, error, 5))
+        self.assertIsNone(policy.get_delay('GET', 3, error, 7))
+
+
+@mock.patch('time.sleep')
+class WithRetriesTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(WithRetriesTest, self).setUp()
+        self.client = httpclient.HTTPClient(
+            'http://localhost:9322/', max_retries=2, retry_interval=1)
+        self.client.session = mock.Mock(verify=True, cert=None)
+
+    def test_get_retried(self, mock_sleep):
+        self.client.session.request.side_effect = [
+            _session_response(b'', status_code=503),
+            _session_response(b'{}')]
+
+        resp, body = self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, mock_sleep.call_count)
+
+    def test_get_retries_exhausted(self, mock_sleep):
+        self.client.session.request.return_value = _session_response(
+            b'', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.client.json_request, 'GET', '/v1/goals')
+        self.assertEqual(3, self.client.session.request.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+
+    def test_post_not_retried(self, mock_sleep):
+        self.client.session.request.return_value = _session_response(
+            b'', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.client.json_request, 'POST', '/v1/audits',
+                          body={})
+        self.assertEqual(1, self.client.session.request.call_count)
+        self.assertFalse(mock_sleep.called)
+
+    def test_retry_after_honored(self, mock_sleep):
+        self.client.session.request.side_effect = [
+            _session_response(b'', status_code=503,
+                              headers={'retry-after': '7'}),
+            _session_response(b'{}')]
+
+        self.client.json_request('GET', '/v1/goals')
+
+        mock_sleep.assert_called_once_with(7)
+
+    def test_custom_policy(self, mock_sleep):
+        policy = mock.Mock(max_retries=1)
+        policy.get_delay.side_effect = [0.25, None]
+        self.client.retry_policy = policy
+        self.client.session.request.return_value = _session_response(
+            b'', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.client.json_request, 'POST', '/v1/audits',
+                          body={})
+        mock_sleep.assert_called_once_with(0.25)
+
+    def test_redirect_shares_budget(self, mock_sleep):
+        self.client.session.request.side_effect = [
+            _session_response(b'', status_code=503),
+            _session_response(b'', status_code=302,
+                              headers={'location': '/v1/goals/'}),
+            _session_response(b'', status_code=503),
+            _session_response(b'', status_code=503)]
+
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.client.json_request, 'GET', '/v1/goals')
+        self.assertEqual(4, self.client.session.request.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertEqual(4, self.client.retry_stats.last_attempts)
+
+    def test_retry_stats(self, mock_sleep):
+        self.client.session.request.side_effect = [
+            _session_response(b'', status_code=503),
+            _session_response(b'{}'),
+            _session_response(b'{}')]
+
+        self.client.json_request('GET', '/v1/goals')
+        self.assertEqual(2, self.client.retry_stats.last_attempts)
+        self.client.json_request('GET', '/v1/goals')
+        self.assertEqual(1, self.client.retry_stats.last_attempts)
+
+        stats = self.client.retry_stats
+        self.assertEqual(2, stats.calls)
+        self.assertEqual(3, stats.attempts)
+        self.assertEqual(1, stats.retries)
+
+    def test_rate_limiter(self, mock_sleep):
+        self.client.rate_limiter = mock.Mock()
+        self.client.session.request.side_effect = [
+            _session_response(b'', status_code=503),
+            _session_response(b'{}')]
+
+        self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual([mock.call('GET'), mock.call('GET')],
+                         self.client.rate_limiter.acquire.call_args_list)
+
+
+@mock.patch('time.sleep')
+class SessionClientRetryTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(SessionClientRetryTest, self).setUp()
+        session = mock.Mock()
+        self.client = httpclient.SessionClient(
+            session=session,
+            os_infra_optim_api_version='1.0',
+            api_version_select_state='user',
+            max_retries=2,
+            retry_interval=1,
+            endpoint='http://watcher.example.org:9322/v1')
+
+    def test_negotiation_shares_budget(self, mock_sleep):
+        not_acceptable = _session_response(
+            b'', status_code=406,
+            headers={'OpenStack-API-Minimum-Version': '1.0',
+                     'OpenStack-API-Maximum-Version': '1.1'})
+        self.client.session.request.side_effect = [
+            _session_response(b'', status_code=503),
+            not_acceptable,
+            _session_response(b'', status_code=503),
+            _session_response(b'', status_code=503)]
+
+        with mock.patch.object(self.client, 'negotiate_version',
+                               autospec=True):
+            self.assertRaises(exceptions.ServiceUnavailable,
+                              self.client.json_request, 'GET', '/v1/goals')
+        self.assertEqual(4, self.client.session.request.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertEqual(4, self.client.retry_stats.last_attempts)
+        self.assertEqual(1, self.client.retry_stats.calls)
+
+
+class ResponseCacheTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(ResponseCacheTest, self).setUp()
+        self.response_cache = cache.ResponseCache()
+        self.client = httpclient.HTTPClient(
+            'http://localhost:9322/', response_cache=self.response_cache)
+        self.client.session = mock.Mock(verify=True, cert=None)
+
+    def test_etag_revalidated(self):
+        self.client.session.request.side_effect = [
+            _session_response(b'{"goals": []}', headers={'ETag': '"v1"'}),
+            _session_response(b'', status_code=304, content_type=None)]
+
+        _, first = self.client.json_request('GET', '/v1/goals')
+        resp, second = self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual(304, resp.status_code)
+        self.assertEqual({'goals': []}, second)
+        self.assertIsNot(first, second)
+        headers = self.client.session.request.call_args[1]['headers']
+        self.assertEqual('"v1"', headers['If-None-Match'])
+        self.assertEqual(1, self.response_cache.stats()['revalidations'])
+
+    def test_last_modified_changed(self):
+        last_modified = 'Tue, 01 Sep 2026 10:00:00 GMT'
+        self.client.session.request.side_effect = [
+            _session_response(b'{"goals": []}',
+                              headers={'Last-Modified': last_modified}),
+            _session_response(b'{"goals": [{"name": "dummy"}]}')]
+
+        self.client.json_request('GET', '/v1/goals')
+        _, body = self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual({'goals': [{'name': 'dummy'}]}, body)
+        headers = self.client.session.request.call_args[1]['headers']
+        self.assertEqual(last_modified, headers['If-Modified-Since'])
+
+    def test_no_validator_reused_within_ttl(self):
+        self.client.session.request.return_value = _session_response(
+            b'{"goals": []}')
+
+        self.client.json_request('GET', '/v1/goals')
+        _, body = self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual({'goals': []}, body)
+        self.assertEqual(1, self.client.session.request.call_count)
+        self.assertEqual(1, self.response_cache.stats()['hits'])
+
+    def test_keyed_by_version(self):
+        self.client.session.request.return_value = _session_response(
+            b'{"goals": []}')
+
+        self.client.json_request('GET', '/v1/goals')
+        self.client.os_infra_optim_api_version = '1.1'
+        self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual(2, self.client.session.request.call_count)
+
+    def test_write_invalidates_collection(self):
+        self.client.session.request.side_effect = [
+            _session_response(b'{"audits": []}'),
+            _session_response(b'{}', status_code=201),
+            _session_response(b'{"audits": []}')]
+
+        self.client.json_request('GET', '/v1/audits')
+        self.client.json_request('POST', '/v1/audits', body={})
+        self.client.json_request('GET', '/v1/audits')
+
+        self.assertEqual(3, self.client.session.request.call_count)
+
+    def test_keyed_by_token(self):
+        self.client.session.request.return_value = _session_response(
+            b'{"goals": []}')
+
+        self.client.json_request('GET', '/v1/goals')
+        self.client.auth_token = 'other-token'
+        self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual(2, self.client.session.request.call_count)
+
+    def test_hit_decoded_again(self):
+        self.client.session.request.return_value = _session_response(
+            b'{"goals": []}')
+
+        _, first = self.client.json_request('GET', '/v1/goals')
+        first['goals'].append('dummy')
+        _, second = self.client.json_request('GET', '/v1/goals')
+
+        self.assertEqual({'goals': []}, second)
+
+    def test_related_collection_invalidated(self):
+        self.client.session.request.side_effect = [
+            _session_response(b'{"actions": []}'),
+            _session_response(b'{}'),
+            _session_response(b'{"actions": []}')]
+
+        self.client.json_request('GET', '/v1/actions')
+        self.client.json_request('POST', '/v1/action_plans/dummy/start',
+                                 body={})
+        self.client.json_request('GET', '/v1/actions')
+
+        self.assertEqual(3, self.client.session.request.call_count)
+
+    def test_raw_delete_invalidates_collection(self):
+        self.client.session.request.side_effect = [
+            _session_response(b'{"audits": []}'),
+            _session_response(b'', status_code=204, content_type=None),
+            _session_response(b'{"audits": []}')]
+
+        self.client.json_request('GET', '/v1/audits')
+        self.client.raw_request('DELETE', '/v1/audits/dummy')
+        self.client.json_request('GET', '/v1/audits')
+
+        self.assertEqual(3, self.client.session.request.call_count)
+
+    def test_session_client(self):
+        session = mock.Mock()
+        client = httpclient.SessionClient(
+            session=session,
+            os_infra_optim_api_version='1.0',
+            api_version_select_state='user',
+            max_retries=0,
+            retry_interval=0,
+            endpoint='http://watcher.example.org:9322/v1',
+            response_cache=self.response_cache,
+            json_codec=mock.Mock(wraps=codec.get_codec('json')))
+        ok = _session_response(
+            b'{"goals": []}', content_type=None,
+            headers={'content-type': 'application/json', 'ETag': '"v1"'})
+        session.request.side_effect = [
+            ok, _session_response(b'', status_code=304, content_type=None)]
+
+        client.json_request('GET', '/v1/goals')
+        resp, body = client.json_request('GET', '/v1/goals')
+
+        self.assertEqual(304, resp.status_code)
+        self.assertEqual({'goals': []}, body)
+        self.assertEqual(2, client.json_codec.decode.call_count)
+        headers = session.request.call_args[1]['headers']
+        self.assertEqual('"v1"', headers['If-None-Match'])
+
+
+class SingleFlightTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(SingleFlightTest, self).setUp()
+        self.single_flight = httpclient.SingleFlight()
+        self.release = threading.Event()
+
+    def _wait_coalesced(self, count):
+        while self.single_flight.stats()['coalesced'] < count:
+            time.sleep(0.001)
+
+    def test_identical_calls_coalesced(self):
+        def call():
+            self.release.wait()
+            return 'result'
+
+        with futures.ThreadPoolExecutor(4) as executor:
+            results = [executor.submit(self.single_flight.do, 'key', call)
+                       for _ in range(4)]
+            self._wait_coalesced(3)
+            self.release.set()
+
+        self.assertEqual([('result', False)] + [('result', True)] * 3,
+                         [result.result() for result in results])
+        self.assertEqual({'calls': 1, 'coalesced': 3, 'in_flight': 0},
+                         self.single_flight.stats())
+
+    def test_error_shared(self):
+        def call():
+            self.release.wait()
+            raise exceptions.ServiceUnavailable()
+
+        with futures.ThreadPoolExecutor(2) as executor:
+            results = [executor.submit(self.single_flight.do, 'key', call)
+                       for _ in range(2)]
+            self._wait_coalesced(1)
+            self.release.set()
+
+        for result in results:
+            self.assertIsInstance(result.exception(),
+                                  exceptions.ServiceUnavailable)
+
+    def test_sequential_calls_not_coalesced(self):
+        self.assertEqual((1, False), self.single_flight.do('key', lambda: 1))
+        self.assertEqual((2, False), self.single_flight.do('key', lambda: 2))
+        self.assertEqual(2, self.single_flight.stats()['calls'])
+
+    def test_client_get_coalesced(self):
+        client = httpclient.HTTPClient('http://localhost:9322/',
+                                       single_flight=self.single_flight)
+        client.session = mock.Mock(verify=True, cert=None)
+
+        def request(*args, **kwargs):
+            self.release.wait()
+            return _session_response(b'{"audits": []}')
+
+        client.session.request.side_effect = request
+
+        with futures.ThreadPoolExecutor(3) as executor:
+            results = [executor.submit(client.json_request, 'GET',
+                                       '/v1/audits')
+                       for _ in range(3)]
+            self._wait_coalesced(2)
+            self.release.set()
+
+        bodies = [result.result()[1] for result in results]
+        self.assertEqual([{'audits': []}] * 3, bodies)
+        self.assertIsNot(bodies[0], bodies[1])
+        self.assertIsNot(bodies[0]['audits'], bodies[1]['audits'])
+        self.assertEqual(1, client.session.request.call_count)
+
+    def test_client_keyed_by_token(self):
+        clients = [httpclient.HTTPClient('http://localhost:9322/',
+                                         token=token,
+                                         single_flight=self.single_flight)
+                   for token in ('token1', 'token2')]
+        keys = []
+
+        def do(key, func):
+            keys.append(key)
+            return func(), False
+
+        for client in clients:
+            client.session = mock.Mock(verify=True, cert=None)
+            client.session.request.return_value = _session_response(b'{}')
+            with mock.patch.object(self.single_flight, 'do', side_effect=do):
+                client.json_request('GET', '/v1/audits')
+
+        self.assertNotEqual(keys[0], keys[1])
+        self.assertNotIn('token1', repr(keys[0]))
+
+    def test_client_distinct_requests_not_coalesced(self):
+        client = httpclient.HTTPClient('http://localhost:9322/',
+                                       single_flight=self.single_flight)
+        client.session = mock.Mock(verify=True, cert=None)
+        client.session.request.return_value = _session_response(b'{}')
+
+        client.json_request('GET', '/v1/audits')
+        client.json_request('GET', '/v1/audits',
+                            headers={'X-Dummy': 'dummy'})
+        client.json_request('POST', '/v1/audits', body={})
+
+        self.assertEqual(3, client.session.request.call_count)
+        self.assertEqual(2, self.single_flight.stats()['calls'])
+
+
+class FormatLogBodyTest(utils.BaseTestCase):
+
+    def test_not_truncated(self):
+        self.assertEqual('{"password": "***"}', httpclient._format_log_body(
+            b'{"password": "secret"}', 100))
+
+    def test_no_limit(self):
+        body = '{"a": "%s"}' % ('x' * 100)
+        self.assertEqual(body, httpclient._format_log_body(body, None))
+
+    def test_truncated_secret_is_masked(self):
+        formatted = httpclient._format_log_body(
+            '{"password": "secret-value"}', 18)
+        self.assertNotIn('sec', formatted)
+        self.assertTrue(formatted.startswith('{"password": "***'))
+
+
+class _FakeAPIHandler(http.server.BaseHTTPRequestHandler):
+    """Watcher API supporting the versions 1.0 to 1.1."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        version = self.headers.get('OpenStack-API-Version', '').split()[-1]
+        if api_versioning.APIVersion(version) > api_versioning.APIVersion(
+                '1.1'):
+            with self.server.lock:
+                self.server.rejected += 1
+            status = 406
+            body = b''
+        else:
+            status = 200
+            body = jsonutils.dump_as_bytes(
+                {'goals': [{'uuid': self.path.rsplit('/', 1)[-1]}]})
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('OpenStack-API-Minimum-Version', '1.0')
+        self.send_header('OpenStack-API-Maximum-Version', '1.1')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeAPIServerTestCase(utils.BaseTestCase):
+    """Runs a local fake API on a random port."""
+
+    def setUp(self):
+        super(FakeAPIServerTestCase, self).setUp()
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), _FakeAPIHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.rejected = 0
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={'poll_interval': 0.05},
+                                  daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.endpoint = 'http://127.0.0.1:%d' % self.server.server_port
+
+
+class ThreadSafetyTest(FakeAPIServerTestCase):
+    """Shares a client between many threads against a local fake API."""
+
+    num_threads = 16
+    num_requests = 20
+
+    def _hammer(self, client):
+        barrier = threading.Barrier(self.num_threads)
+
+        def _worker(worker_id):
+            barrier.wait()
+            headers = {'X-Worker': str(worker_id)}
+            for i in range(self.num_requests):
+                uuid = '%d-%d' % (worker_id, i)
+                resp, body = client.json_request(
+                    'GET', '/v1/goals/%s' % uuid, headers=headers)
+                self.assertEqual({'goals': [{'uuid': uuid}]}, body)
+            self.assertEqual({'X-Worker': str(worker_id)}, headers)
+
+        with futures.ThreadPoolExecutor(self.num_threads) as executor:
+            for result in [executor.submit(_worker, worker_id)
+                           for worker_id in range(self.num_threads)]:
+                result.result()
+
+        self.assertEqual('1.1', client.os_infra_optim_api_version)
+        self.assertEqual('negotiated', client.api_version_select_state)
+        # Only the requests sent before the negotiation are rejected
+        self.assertLessEqual(self.server.rejected, self.num_threads)
+        self.assertEqual('1.1', filecache.retrieve_data(
+            '127.0.0.1', str(self.server.server_port))['version'])
+
+    def test_http_client(self):
+        client = httpclient.HTTPClient(
+            self.endpoint, os_infra_optim_api_version='1.4',
+            max_retries=0, pool_maxsize=self.num_threads)
+        self._hammer(client)
+
+    def test_session_client(self):
+        client = httpclient.SessionClient(
+            os_infra_optim_api_version='1.4',
+            api_version_select_state='default',
+            max_retries=0,
+            retry_interval=0,
+            endpoint=self.endpoint,
+            session=ks_session.Session(),
+            endpoint_override=self.endpoint,
+            pool_maxsize=self.num_threads)
+        self._hammer(client)
+
+
+class ForkSafetyTest(FakeAPIServerTestCase):
+
+    def _get_client(self):
+        return httpclient.HTTPClient(self.endpoint,
+                                     os_infra_optim_api_version='1.1',
+                                     max_retries=0)
+
+    def test_adapters_renewed_after_fork(self):
+        client = self._get_client()
+        client.json_request('GET', '/v1/goals/1')
+        adapter = client.session.get_adapter(self.endpoint)
+
+        with mock.patch.object(adapter, 'close') as mock_close, \
+                mock.patch.object(os, 'getpid', return_value=-1):
+            client.json_request('GET', '/v1/goals/2')
+
+        self.assertFalse(mock_close.called)
+        self.assertEqual(-1, client._pid)
+        new_adapter = client.session.get_adapter(self.endpoint)
+        self.assertIsNot(adapter, new_adapter)
+        self.assertIsNot(adapter.poolmanager, new_adapter.poolmanager)
+        self.assertIs(new_adapter,
+                      client.session.get_adapter('https://localhost/'))
+        self.assertEqual(adapter.pool_config, new_adapter.pool_config)
+
+    def test_session_client_adapters_renewed_after_fork(self):
+        client = httpclient.SessionClient(
+            os_infra_optim_api_version='1.1',
+            api_version_select_state='user',
+            max_retries=0,
+            retry_interval=0,
+            endpoint=self.endpoint,
+            session=ks_session.Session(),
+            endpoint_override=self.endpoint)
+        adapter = client.session.session.get_adapter(self.endpoint)
+
+        with mock.patch.object(os, 'getpid', return_value=-1):
+            client.json_request('GET', '/v1/goals/1')
+
+        self.assertIsNot(adapter,
+                         client.session.session.get_adapter(self.endpoint))
+
+    def test_reset_connections(self):
+        client = self._get_client()
+        adapter = client.session.get_adapter(self.endpoint)
+
+        with mock.patch.object(adapter, 'close') as mock_close:
+            client.reset_connections()
+
+        self.assertTrue(mock_close.called)
+
+    def test_forked_child(self):
+        # NOTE: the process forks in a new interpreter, since forking the
+        # test process while the thread of the fake API is running could
+        # deadlock. The locks of the parent are held by another thread
+        # when it forks, so the child would deadlock if they were not
+        # replaced.
+        script = textwrap.dedent("""
+            import os
+            import signal
+            import sys
+            import threading
+
+            from watcherclient.common import cache
+            from watcherclient.common import filecache
+            from watcherclient.common import httpclient
+            from watcherclient.common import ratelimit
+
+            filecache.CACHE_DIR = sys.argv[2]
+            limiter = ratelimit.RateLimiter(read_rate=1000)
+            response_cache = cache.ResponseCache()
+            single_flight = httpclient.SingleFlight()
+            client = httpclient.HTTPClient(
+                sys.argv[1], os_infra_optim_api_version='1.1',
+                max_retries=0, rate_limiter=limiter,
+                response_cache=response_cache, single_flight=single_flight)
+            client.json_request('GET', '/v1/goals/parent')
+
+            locks = [filecache._lock, limiter.read_bucket._lock,
+                     response_cache._lock, response_cache._cache._lock,
+                     single_flight._lock, client._negotiation_lock,
+                     client.retry_stats._lock]
+            acquired = threading.Event()
+            release = threading.Event()
+
+            def _hold():
+                for lock in locks:
+                    lock.acquire()
+                acquired.set()
+                release.wait()
+                for lock in locks:
+                    lock.release()
+
+            threading.Thread(target=_hold).start()
+            acquired.wait()
+            pid = os.fork()
+            if pid == 0:
+                # NOTE: do not hang the test if the child deadlocks
+                signal.alarm(30)
+                status = 1
+                try:
+                    resp, body = client.json_request('GET',
+                                                     '/v1/goals/child')
+                    filecache.save_data('localhost', '9322',
+                                        {'version': '1.1'})
+                    if body == {'goals': [{'uuid': 'child'}]}:
+                        status = 0
+                finally:
+                    os._exit(status)
+
+            release.set()
+            _, status = os.waitpid(pid, 0)
+            resp, body = client.json_request('GET', '/v1/goals/parent')
+            assert body == {'goals': [{'uuid': 'parent'}]}
+            sys.exit(os.waitstatus_to_exitcode(status))
+        """)
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        result = subprocess.run(
+            [sys.executable, '-c', script, self.endpoint, cache_dir],
+            capture_output=True, timeout=60)
+        self.assertEqual(0, result.returncode, result.stderr)
@@ -0,0 +1,206 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+from unittest import mock
+
+from watcherclient.common import ratelimit
+from watcherclient import exceptions
+from watcherclient.tests.unit import utils
+
+
+@mock.patch('time.sleep')
+class TokenBucketTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(TokenBucketTest, self).setUp()
+        self.now = 100.0
+        p_monotonic = mock.patch('time.monotonic', lambda: self.now)
+        p_monotonic.start()
+        self.addCleanup(p_monotonic.stop)
+
+    def test_burst(self, mock_sleep):
+        bucket = ratelimit.TokenBucket(rate=2, burst=3)
+
+        self.assertEqual([0, 0, 0, 0.5, 1.0],
+                         [bucket.acquire() for _ in range(5)])
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         mock_sleep.call_args_list)
+
+    def test_refill(self, mock_sleep):
+        bucket = ratelimit.TokenBucket(rate=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.now += 1
+
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0.5, bucket.acquire())
+
+    def test_refill_capped_by_burst(self, mock_sleep):
+        bucket = ratelimit.TokenBucket(rate=1, burst=1)
+        self.now += 60
+        bucket.acquire()
+
+        self.assertEqual(1, bucket.acquire())
+
+    def test_stats(self, mock_sleep):
+        bucket = ratelimit.TokenBucket(rate=1)
+        for _ in range(3):
+            bucket.acquire()
+
+        self.assertEqual({'rate': 1.0, 'burst': 1.0, 'acquired': 3,
+                          'waited': 2, 'wait_time': 3.0, 'max_wait': 2.0},
+                         bucket.stats())
+
+    def test_invalid_rate(self, mock_sleep):
+        self.assertRaises(ValueError, ratelimit.TokenBucket, 0)
+
+
+class RateLimiterTest(utils.BaseTestCase):
+
+    def test_reads_and_writes_limited_separately(self):
+        limiter = ratelimit.RateLimiter(read_rate=10, write_rate=1)
+        limiter.read_bucket = mock.Mock()
+        limiter.write_bucket = mock.Mock()
+
+        limiter.acquire('GET')
+        limiter.acquire('head')
+        limiter.acquire('POST')
+        limiter.acquire('DELETE')
+
+        self.assertEqual(2, limiter.read_bucket.acquire.call_count)
+        self.assertEqual(2, limiter.write_bucket.acquire.call_count)
+
+    def test_unlimited(self):
+        limiter = ratelimit.RateLimiter(write_rate=1)
+
+        self.assertEqual(0, limiter.acquire('GET'))
+        self.assertIsNone(limiter.stats()['read'])
+        self.assertEqual(1, limiter.stats()['write']['burst'])
+
+
+class AdaptiveConcurrencyLimiterTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(AdaptiveConcurrencyLimiterTest, self).setUp()
+        self.now = 100.0
+        p_monotonic = mock.patch('time.monotonic', lambda: self.now)
+        p_monotonic.start()
+        self.addCleanup(p_monotonic.stop)
+        self.limiter = ratelimit.AdaptiveConcurrencyLimiter(
+            initial_limit=4, min_limit=1, max_limit=8)
+
+    def _call(self, latency=1.0, error=None):
+        self.now += 0.1
+        token = self.limiter.acquire()
+        self.now += latency
+        self.limiter.release(token, error)
+
+    def test_additive_increase(self):
+        for _ in range(4):
+            self._call()
+        self.assertEqual(4, self.limiter.limit)
+        self._call()
+        self.assertEqual(5, self.limiter.limit)
+
+    def test_increase_capped(self):
+        for _ in range(100):
+            self._call()
+        self.assertEqual(8, self.limiter.limit)
+
+    def test_decrease_on_overload(self):
+        self._call(error=exceptions.ServiceUnavailable())
+        self.assertEqual(2, self.limiter.limit)
+        self._call(error=exceptions.ConnectionRefused())
+        self._call(error=exceptions.ConnectionRefused())
+        self.assertEqual(1, self.limiter.limit)
+        self.assertEqual(3, self.limiter.decreases)
+
+    def test_other_errors_ignored(self):
+        self._call(error=exceptions.HTTPNotFound())
+        self.assertEqual(4, self.limiter.limit)
+        self.assertEqual(0, self.limiter.decreases)
+        self.assertEqual(0, self.limiter.increases)
+
+    def test_decrease_on_latency(self):
+        self._call(latency=1.0)
+        self._call(latency=1.5)
+        self.assertEqual(4, self.limiter.limit)
+        self._call(latency=3.0)
+        self.assertEqual(4, self.limiter.limit)
+        self._call(latency=3.0)
+        self.assertEqual(2, self.limiter.limit)
+
+    def test_jitter_ignored(self):
+        for _ in range(4):
+            self._call(latency=1.0)
+        self._call(latency=3.0)
+        self._call(latency=1.0)
+        self.assertEqual(0, self.limiter.decreases)
+        self.assertEqual(1.0, self.limiter.baseline_latency)
+
+    def test_baseline_follows_latency(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(
+            initial_limit=4, min_limit=1, max_limit=8, latency_window=5)
+        self.limiter = limiter
+        self._call(latency=0.1)
+        for _ in range(10):
+            self._call(latency=1.0)
+        decreases = limiter.decreases
+        self.assertGreater(decreases, 0)
+        self.assertEqual(1.0, limiter.baseline_latency)
+
+        # NOTE: the latency is stable again, the limit is raised again
+        limit = limiter.limit
+        for _ in range(10):
+            self._call(latency=1.0)
+        self.assertEqual(decreases, limiter.decreases)
+        self.assertGreater(limiter.limit, limit)
+
+    def test_release_latency(self):
+        for _ in range(4):
+            self._call(latency=1.0)
+        # NOTE: the call took 10 seconds because of the retries, but its
+        # last attempt took 1 second
+        token = self.limiter.acquire()
+        self.now += 10.0
+        self.limiter.release(token, latency=1.0)
+        self.assertEqual(0, self.limiter.decreases)
+
+    def test_single_decrease_for_concurrent_calls(self):
+        self.now += 1
+        tokens = [self.limiter.acquire() for _ in range(4)]
+        for token in tokens:
+            self.limiter.release(token, exceptions.ServiceUnavailable())
+
+        self.assertEqual(2, self.limiter.limit)
+        self.assertEqual(0, self.limiter.in_flight)
+
+    def test_acquire_waits_for_release(self):
+        tokens = [self.limiter.acquire() for _ in range(4)]
+        acquired = threading.Event()
+
+        def _acquire():
+            self.limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=_acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        self.limiter.release(tokens[0])
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+
+    def test_invalid_limits(self):
+        self.assertRaises(ValueError, ratelimit.AdaptiveConcurrencyLimiter,
+                          initial_limit=10, max_limit=5)
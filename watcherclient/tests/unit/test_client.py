@@ -10,14 +10,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
 from unittest import mock
 
 from keystoneauth1 import loading as kaloading
 
 from watcherclient import client as watcherclient
+from watcherclient.common import cache
+from watcherclient.common import filecache
 from watcherclient.common import httpclient
 from watcherclient import exceptions
+from watcherclient.osc import plugin
 from watcherclient.tests.unit import utils
+from watcherclient.v1 import client as v1_client
 
 
 class ClientTest(utils.BaseTestCase):
@@ -363,3 +368,191 @@ class ClientTest(utils.BaseTestCase):
         endpoint = "http://localhost:8081/"
         http_client = httpclient.HTTPClient(endpoint)
         self.assertEqual(endpoint, http_client._make_connection_url(""))
+
+    def test_client_uses_cached_api_version(self):
+        filecache.save_data('watcher.example.org', '9322',
+                            {'version': '1.1', 'min_version': '1.0',
+                             'max_version': '1.1'})
+        client = v1_client.Client('http://watcher.example.org:9322/',
+                                  os_infra_optim_api_version='1.latest',
+                                  token='USER_AUTH_TOKEN')
+
+        self.assertEqual('1.1',
+                         client.http_client.os_infra_optim_api_version)
+        self.assertEqual('cached',
+                         client.http_client.api_version_select_state)
+
+    def test_client_version_cache_expiry(self):
+        filecache.save_data('watcher.example.org', '9322',
+                            {'version': '1.1', 'min_version': '1.0',
+                             'max_version': '1.1'})
+        with mock.patch('time.time', return_value=time.time() + 60):
+            client = v1_client.Client('http://watcher.example.org:9322/',
+                                      os_infra_optim_api_version='1.latest',
+                                      token='USER_AUTH_TOKEN',
+                                      version_cache_expiry=30)
+
+        self.assertEqual('1.latest',
+                         client.http_client.os_infra_optim_api_version)
+        self.assertEqual('default',
+                         client.http_client.api_version_select_state)
+
+    def test_executor_client_managers(self):
+        client = v1_client.ExecutorClient(
+            'http://watcher.example.org:9322/',
+            os_infra_optim_api_version='1.0', token='USER_AUTH_TOKEN',
+            max_workers=2)
+        self.addCleanup(client.close)
+
+        self.assertIs(client.client.audit, client.audit.manager)
+        self.assertIs(client.client.data_model, client.data_model.manager)
+        self.assertIs(client.executor, client.action.executor)
+        self.assertEqual(2, client.executor._max_workers)
+
+    def test_executor_client_no_lazy_detail(self):
+        client = v1_client.ExecutorClient(
+            'http://watcher.example.org:9322/',
+            os_infra_optim_api_version='1.0', token='USER_AUTH_TOKEN',
+            lazy_detail=True)
+        self.addCleanup(client.close)
+
+        self.assertFalse(client.client.audit.lazy_detail)
+        self.assertFalse(client.action.manager.lazy_detail)
+
+    def test_client_catalog_cache(self):
+        catalog_cache = cache.TTLCache()
+        client = v1_client.Client('http://watcher.example.org:9322/',
+                                  os_infra_optim_api_version='1.0',
+                                  token='USER_AUTH_TOKEN',
+                                  catalog_cache=catalog_cache)
+
+        for manager in (client.goal, client.strategy, client.scoring_engine,
+                        client.service):
+            self.assertIs(catalog_cache, manager.cache)
+        self.assertIsNone(client.audit.cache)
+
+    def test_client_compact_lists(self):
+        client = v1_client.Client('http://watcher.example.org:9322/',
+                                  os_infra_optim_api_version='1.0',
+                                  token='USER_AUTH_TOKEN',
+                                  compact_lists=True)
+
+        self.assertTrue(client.action.compact)
+        self.assertTrue(client.goal.compact)
+        self.assertFalse(v1_client.Client(
+            'http://watcher.example.org:9322/',
+            os_infra_optim_api_version='1.0',
+            token='USER_AUTH_TOKEN').action.compact)
+
+    def test_client_explicit_api_version_ignores_cache(self):
+        filecache.save_data('watcher.example.org', '9322',
+                            {'version': '1.1', 'min_version': '1.0',
+                             'max_version': '1.1'})
+        client = v1_client.Client('http://watcher.example.org:9322/',
+                                  os_infra_optim_api_version='1.4',
+                                  token='USER_AUTH_TOKEN')
+
+        self.assertEqual('1.4',
+                         client.http_client.os_infra_optim_api_version)
+        self.assertEqual('user',
+                         client.http_client.api_version_select_state)
+
+    def test_negotiated_api_version_is_cached(self):
+        client = httpclient.HTTPClient('http://watcher.example.org:9322/')
+        resp = utils.FakeSessionResponse(
+            {'OpenStack-API-Minimum-Version': '1.0',
+             'OpenStack-API-Maximum-Version': '1.1'}, status_code=406)
+        client.negotiate_version(client.session, resp)
+
+        self.assertEqual(
+            {'version': '1.1', 'min_version': '1.0', 'max_version': '1.1'},
+            filecache.retrieve_data('watcher.example.org', '9322'))
+
+    def test_session_client_uses_cached_api_version(self):
+        filecache.save_data('watcher.example.org', '9322',
+                            {'version': '1.1', 'min_version': '1.0',
+                             'max_version': '1.1'})
+        session = mock.Mock()
+        session.get_endpoint.return_value = (
+            'http://watcher.example.org:9322/')
+        client = v1_client.Client(os_infra_optim_api_version='1.latest',
+                                  session=session)
+
+        self.assertEqual('1.1',
+                         client.http_client.os_infra_optim_api_version)
+        self.assertEqual('cached',
+                         client.http_client.api_version_select_state)
+
+    def test_session_client_negotiated_api_version_is_cached(self):
+        session = mock.Mock()
+        session.get_endpoint.return_value = (
+            'http://watcher.example.org:9322/')
+        client = v1_client.Client(os_infra_optim_api_version='1.latest',
+                                  session=session)
+        resp = utils.FakeSessionResponse(
+            {'OpenStack-API-Minimum-Version': '1.0',
+             'OpenStack-API-Maximum-Version': '1.1'}, status_code=406)
+
+        def _save_data(*args, **kwargs):
+            # NOTE: the file is written once the lock is released
+            self.assertFalse(client.http_client._negotiation_lock.locked())
+
+        with mock.patch.object(filecache, 'save_data',
+                               side_effect=_save_data) as mock_save:
+            header = client.http_client._renegotiate_version(
+                session, resp, 'infra-optim %s' % httpclient.LATEST_VERSION)
+
+        self.assertEqual('infra-optim 1.1', header)
+        mock_save.assert_called_once_with(
+            host='watcher.example.org', port='9322',
+            data={'version': '1.1', 'min_version': '1.0',
+                  'max_version': '1.1'})
+
+    def test_osc_make_client_negotiates_default_api_version(self):
+        filecache.save_data('watcher.example.org', '9322',
+                            {'version': '1.1', 'min_version': '1.0',
+                             'max_version': '1.1'})
+        instance = mock.Mock(_api_version={
+            plugin.API_NAME: plugin.DEFAULT_API_VERSION})
+        instance.session.get_endpoint.return_value = (
+            'http://watcher.example.org:9322/')
+
+        client = plugin.make_client(instance)
+
+        self.assertEqual('1.1',
+                         client.http_client.os_infra_optim_api_version)
+        self.assertEqual('cached',
+                         client.http_client.api_version_select_state)
+
+    def test_osc_make_client_pinned_latest_api_version(self):
+        # NOTE: explicitly requesting the latest version known by the
+        # client is not mistaken for the default
+        filecache.save_data('watcher.example.org', '9322',
+                            {'version': '1.1', 'min_version': '1.0',
+                             'max_version': '1.1'})
+        instance = mock.Mock(_api_version={
+            plugin.API_NAME: httpclient.LATEST_VERSION})
+        instance.session.get_endpoint.return_value = (
+            'http://watcher.example.org:9322/')
+
+        client = plugin.make_client(instance)
+
+        self.assertEqual(httpclient.LATEST_VERSION,
+                         client.http_client.os_infra_optim_api_version)
+        self.assertEqual('user',
+                         client.http_client.api_version_select_state)
+
+    def test_osc_make_client_pinned_api_version(self):
+        filecache.save_data('watcher.example.org', '9322',
+                            {'version': '1.1', 'min_version': '1.0',
+                             'max_version': '1.1'})
+        instance = mock.Mock(_api_version={plugin.API_NAME: '1.2'})
+        instance.session.get_endpoint.return_value = (
+            'http://watcher.example.org:9322/')
+
+        client = plugin.make_client(instance)
+
+        self.assertEqual('1.2',
+                         client.http_client.os_infra_optim_api_version)
+        self.assertEqual('user',
+                         client.http_client.api_version_select_state)
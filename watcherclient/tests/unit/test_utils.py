@@ -97,7 +97,7 @@ class UtilsTest(test_utils.BaseTestCase):
 class CommonParamsForListTest(test_utils.BaseTestCase):
     def setUp(self):
         super(CommonParamsForListTest, self).setUp()
-        self.args = mock.Mock(limit=None, marker=None,
+        self.args = mock.Mock(limit=None, marker=None, prefetch=None,
                               sort_key=None, sort_dir=None)
         self.args.detail = False
         self.expected_params = {'detail': False}
@@ -118,6 +118,18 @@ class CommonParamsForListTest(test_utils.BaseTestCase):
                           utils.common_params_for_list,
                           self.args, [], [])
 
+    def test_prefetch(self):
+        self.args.prefetch = 2
+        self.expected_params.update({'prefetch': 2})
+        self.assertEqual(self.expected_params,
+                         utils.common_params_for_list(self.args, [], []))
+
+    def test_invalid_prefetch(self):
+        self.args.prefetch = -1
+        self.assertRaises(exc.CommandError,
+                          utils.common_params_for_list,
+                          self.args, [], [])
+
     def test_marker(self):
         self.args.marker = 'e420a881-d7df-4de2-bbf3-378cc13d9b3a'
         self.expected_params.update(
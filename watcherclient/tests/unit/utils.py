@@ -22,6 +22,8 @@ import fixtures
 from oslo_utils import strutils
 import testtools
 
+from watcherclient.common import filecache
+
 
 class BaseTestCase(testtools.TestCase):
 
@@ -29,6 +31,13 @@ class BaseTestCase(testtools.TestCase):
         super(BaseTestCase, self).setUp()
         self.useFixture(fixtures.FakeLogger())
 
+        # Never read or write the user's negotiated API version cache
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.MonkeyPatch(
+            'watcherclient.common.filecache.CACHE_DIR', cache_dir))
+        filecache.clear()
+        self.addCleanup(filecache.clear)
+
         # If enabled, stdout and/or stderr is captured and will appear in
         # test results if that test fails.
         if strutils.bool_from_string(os.environ.get('OS_STDOUT_CAPTURE')):
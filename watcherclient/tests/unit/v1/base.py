@@ -51,6 +51,10 @@ class CommandTestCase(utils.BaseTestCase):
             httpclient, '_construct_http_client')
         self.m_construct_http_client = self.p_construct_http_client.start()
         self.addCleanup(self.p_construct_http_client.stop)
+        # NOTE: the commands use the version of the HTTP client, which is
+        # the negotiated one
+        http_client = self.m_construct_http_client.return_value
+        http_client.os_infra_optim_api_version = os_infra_optim_api_version
 
     def run_cmd(self, cmd, formatting='json'):
         if formatting and formatting != 'table':
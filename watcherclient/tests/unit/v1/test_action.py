@@ -225,6 +225,43 @@ class ActionManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertThat(actions, matchers.HasLength(2))
 
+    def test_actions_iter_pagination_no_limit(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = watcherclient.v1.action.ActionManager(self.api)
+        actions = self.mgr.iter(limit=0)
+        # NOTE: only the first page is requested until the iterator
+        # is consumed
+        self.assertEqual([('GET', '/v1/actions', {}, None)],
+                         self.api.calls)
+        self.assertThat(list(actions), matchers.HasLength(2))
+        expect = [
+            ('GET', '/v1/actions', {}, None),
+            ('GET', '/v1/actions/?limit=1', {}, None)
+        ]
+        self.assertEqual(expect, self.api.calls)
+
+    def test_actions_iter_prefetch(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = watcherclient.v1.action.ActionManager(self.api)
+        actions = list(self.mgr.iter(limit=0, prefetch=1))
+        expect = [
+            ('GET', '/v1/actions', {}, None),
+            ('GET', '/v1/actions/?limit=1', {}, None)
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual([ACTION1['uuid'], ACTION2['uuid']],
+                         [action.uuid for action in actions])
+
+    def test_actions_iter_limit(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = watcherclient.v1.action.ActionManager(self.api)
+        actions = list(self.mgr.iter(limit=1))
+        expect = [
+            ('GET', '/v1/actions/?limit=1', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(actions, matchers.HasLength(1))
+
     def test_actions_list_sort_key(self):
         self.api = utils.FakeAPI(fake_responses_sorting)
         self.mgr = watcherclient.v1.action.ActionManager(self.api)
@@ -269,6 +306,14 @@ class ActionManagerTest(testtools.TestCase):
         self.assertEqual(ACTION1['action_plan'], action.action_plan)
         self.assertEqual(ACTION1['next'], action.next)
 
+    def test_actions_get_many(self):
+        actions = self.mgr.get_many([ACTION1['uuid'], 'unknown',
+                                     ACTION1['uuid']])
+        self.assertEqual(3, len(actions))
+        self.assertEqual(ACTION1['uuid'], actions[0].uuid)
+        self.assertIsInstance(actions[1], KeyError)
+        self.assertEqual(ACTION1['uuid'], actions[2].uuid)
+
     def test_actions_update(self):
         patch = [{'op': 'replace', 'path': '/state', 'value': 'SKIPPED'}]
         action = self.mgr.update(ACTION1['uuid'], patch)
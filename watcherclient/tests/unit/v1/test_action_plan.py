@@ -212,6 +212,31 @@ class ActionPlanManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertThat(action_plans, matchers.HasLength(2))
 
+    def test_action_plans_iter_pagination_no_limit(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = watcherclient.v1.action_plan.ActionPlanManager(self.api)
+        action_plans = self.mgr.iter(limit=0)
+        # NOTE: only the first page is requested until the iterator
+        # is consumed
+        self.assertEqual([('GET', '/v1/action_plans', {}, None)],
+                         self.api.calls)
+        self.assertThat(list(action_plans), matchers.HasLength(2))
+        expect = [
+            ('GET', '/v1/action_plans', {}, None),
+            ('GET', '/v1/action_plans/?limit=1', {}, None)
+        ]
+        self.assertEqual(expect, self.api.calls)
+
+    def test_action_plans_iter_limit(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = watcherclient.v1.action_plan.ActionPlanManager(self.api)
+        action_plans = list(self.mgr.iter(limit=1))
+        expect = [
+            ('GET', '/v1/action_plans/?limit=1', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(action_plans, matchers.HasLength(1))
+
     def test_action_plans_list_marker(self):
         self.api = utils.FakeAPI(fake_responses_pagination)
         self.mgr = watcherclient.v1.action_plan.ActionPlanManager(self.api)
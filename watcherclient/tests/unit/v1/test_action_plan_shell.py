@@ -19,6 +19,7 @@ from unittest import mock
 
 from oslo_utils.uuidutils import generate_uuid
 
+from watcherclient.common import base as common_base
 from watcherclient import exceptions
 from watcherclient import shell
 from watcherclient.tests.unit.v1 import base
@@ -111,7 +112,7 @@ class ActionPlanShellTest(base.CommandTestCase):
     def test_do_action_plan_list(self):
         action_plan1 = resource.ActionPlan(mock.Mock(), ACTION_PLAN_1)
         action_plan2 = resource.ActionPlan(mock.Mock(), ACTION_PLAN_2)
-        self.m_action_plan_mgr.list.return_value = [
+        self.m_action_plan_mgr.iter.return_value = [
             action_plan1, action_plan2]
 
         exit_code, results = self.run_cmd('actionplan list')
@@ -132,7 +133,7 @@ class ActionPlanShellTest(base.CommandTestCase):
     def test_do_action_plan_list_by_table(self):
         action_plan1 = resource.ActionPlan(mock.Mock(), ACTION_PLAN_1)
         action_plan2 = resource.ActionPlan(mock.Mock(), ACTION_PLAN_2)
-        self.m_action_plan_mgr.list.return_value = [
+        self.m_action_plan_mgr.iter.return_value = [
             action_plan1, action_plan2]
 
         exit_code, results = self.run_cmd('actionplan list', 'table')
@@ -140,12 +141,24 @@ class ActionPlanShellTest(base.CommandTestCase):
         self.assertIn(ACTION_PLAN_1['uuid'], results)
         self.assertIn(ACTION_PLAN_2['uuid'], results)
 
-        self.m_action_plan_mgr.list.assert_called_once_with(detail=False)
+        self.m_action_plan_mgr.iter.assert_called_once_with(detail=False)
+
+    def test_do_action_plan_list_records_by_table(self):
+        action_plan = common_base.RecordFactory()(None, ACTION_PLAN_1)
+        self.m_action_plan_mgr.iter.return_value = [action_plan]
+
+        exit_code, results = self.run_cmd('actionplan list', 'table')
+
+        self.assertEqual(0, exit_code)
+        self.assertIn(ACTION_PLAN_1['uuid'], results)
+        self.assertIn('Dummy_global_efficacy2: 75.00 %', results)
+        self.assertEqual(ACTION_PLAN_1['global_efficacy'],
+                         action_plan.global_efficacy)
 
     def test_do_action_plan_list_detail(self):
         action_plan1 = resource.ActionPlan(mock.Mock(), ACTION_PLAN_1)
         action_plan2 = resource.ActionPlan(mock.Mock(), ACTION_PLAN_2)
-        self.m_action_plan_mgr.list.return_value = [
+        self.m_action_plan_mgr.iter.return_value = [
             action_plan1, action_plan2]
 
         exit_code, results = self.run_cmd('actionplan list --detail')
@@ -162,11 +175,11 @@ class ActionPlanShellTest(base.CommandTestCase):
         self.assertEqual(action_plan2.global_efficacy,
                          results[1]['Global efficacy'])
 
-        self.m_action_plan_mgr.list.assert_called_once_with(detail=True)
+        self.m_action_plan_mgr.iter.assert_called_once_with(detail=True)
 
     def test_do_action_plan_list_filter_by_audit(self):
         action_plan1 = resource.ActionPlan(mock.Mock(), ACTION_PLAN_1)
-        self.m_action_plan_mgr.list.return_value = [action_plan1]
+        self.m_action_plan_mgr.iter.return_value = [action_plan1]
 
         exit_code, results = self.run_cmd(
             'actionplan list --audit '
@@ -178,7 +191,7 @@ class ActionPlanShellTest(base.CommandTestCase):
                                    self.SHORT_LIST_FIELD_LABELS)],
             results)
 
-        self.m_action_plan_mgr.list.assert_called_once_with(
+        self.m_action_plan_mgr.iter.assert_called_once_with(
             detail=False,
             audit='770ef053-ecb3-48b0-85b5-d55a2dbc6588',
         )
@@ -236,7 +249,7 @@ class ActionPlanShellTest(base.CommandTestCase):
             'd9d9978e-6db5-4a05-8eab-1531795d7004')
 
     def test_do_action_plan_delete(self):
-        self.m_action_plan_mgr.delete.return_value = ''
+        self.m_action_plan_mgr.delete_many.return_value = [None]
 
         exit_code, result = self.run_cmd(
             'actionplan delete 5869da81-4876-4687-a1ed-12cd64cf53d9',
@@ -244,8 +257,8 @@ class ActionPlanShellTest(base.CommandTestCase):
 
         self.assertEqual(0, exit_code)
         self.assertEqual('', result)
-        self.m_action_plan_mgr.delete.assert_called_once_with(
-            '5869da81-4876-4687-a1ed-12cd64cf53d9')
+        self.m_action_plan_mgr.delete_many.assert_called_once_with(
+            ['5869da81-4876-4687-a1ed-12cd64cf53d9'], max_workers=1, rate=None)
 
     def test_do_action_plan_delete_not_uuid(self):
         exit_code, result = self.run_cmd(
@@ -255,7 +268,7 @@ class ActionPlanShellTest(base.CommandTestCase):
         self.assertEqual('', result)
 
     def test_do_action_plan_delete_multiple(self):
-        self.m_action_plan_mgr.delete.return_value = ''
+        self.m_action_plan_mgr.delete_many.return_value = [None, None]
 
         exit_code, result = self.run_cmd(
             'actionplan delete 5869da81-4876-4687-a1ed-12cd64cf53d9 '
@@ -263,11 +276,11 @@ class ActionPlanShellTest(base.CommandTestCase):
             formatting=None)
 
         self.assertEqual(0, exit_code)
-        self.assertEqual('', result)
-        self.m_action_plan_mgr.delete.assert_any_call(
-            '5869da81-4876-4687-a1ed-12cd64cf53d9')
-        self.m_action_plan_mgr.delete.assert_any_call(
-            'c20627fa-ea70-4d56-ae15-4106358f773b')
+        self.assertEqual('Deleted 2 of 2 action plan(s)\n', result)
+        self.m_action_plan_mgr.delete_many.assert_called_once_with(
+            ['5869da81-4876-4687-a1ed-12cd64cf53d9',
+             'c20627fa-ea70-4d56-ae15-4106358f773b'],
+            max_workers=1, rate=None)
 
     def test_do_action_plan_update(self):
         action_plan = resource.ActionPlan(mock.Mock(), ACTION_PLAN_1)
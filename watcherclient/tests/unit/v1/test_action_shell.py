@@ -103,7 +103,7 @@ class ActionShellTest(base.CommandTestCase):
     def test_do_action_list(self):
         action1 = resource.Action(mock.Mock(), ACTION_1)
         action2 = resource.Action(mock.Mock(), ACTION_2)
-        self.m_action_mgr.list.return_value = [action1, action2]
+        self.m_action_mgr.iter.return_value = [action1, action2]
 
         exit_code, results = self.run_cmd('action list')
 
@@ -115,12 +115,12 @@ class ActionShellTest(base.CommandTestCase):
                                    self.SHORT_LIST_FIELD_LABELS)],
             results)
 
-        self.m_action_mgr.list.assert_called_once_with(detail=False)
+        self.m_action_mgr.iter.assert_called_once_with(detail=False)
 
     def test_do_action_list_detail(self):
         action1 = resource.Action(mock.Mock(), ACTION_1)
         action2 = resource.Action(mock.Mock(), ACTION_2)
-        self.m_action_mgr.list.return_value = [action1, action2]
+        self.m_action_mgr.iter.return_value = [action1, action2]
 
         exit_code, results = self.run_cmd('action list --detail')
 
@@ -132,12 +132,12 @@ class ActionShellTest(base.CommandTestCase):
                                    self.FIELD_LABELS)],
             results)
 
-        self.m_action_mgr.list.assert_called_once_with(detail=True)
+        self.m_action_mgr.iter.assert_called_once_with(detail=True)
 
     def test_do_action_list_marker(self):
         action2 = resource.Action(mock.Mock(), ACTION_2)
         action3 = resource.Action(mock.Mock(), ACTION_3)
-        self.m_action_mgr.list.return_value = [
+        self.m_action_mgr.iter.return_value = [
             action2, action3]
 
         exit_code, results = self.run_cmd(
@@ -151,10 +151,21 @@ class ActionShellTest(base.CommandTestCase):
                                    self.SHORT_LIST_FIELD_LABELS)],
             results)
 
-        self.m_action_mgr.list.assert_called_once_with(
+        self.m_action_mgr.iter.assert_called_once_with(
             detail=False,
             marker='770ef053-ecb3-48b0-85b5-d55a2dbc6588')
 
+    def test_do_action_list_prefetch(self):
+        action1 = resource.Action(mock.Mock(), ACTION_1)
+        self.m_action_mgr.iter.return_value = [action1]
+
+        exit_code, results = self.run_cmd(
+            'action list --limit 0 --prefetch 2')
+
+        self.assertEqual(0, exit_code)
+        self.m_action_mgr.iter.assert_called_once_with(
+            detail=False, limit=0, prefetch=2)
+
     def test_do_action_show_by_uuid(self):
         action = resource.Action(mock.Mock(), ACTION_1)
         self.m_action_mgr.get.return_value = action
@@ -199,6 +199,31 @@ class AuditManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertThat(audits, matchers.HasLength(2))
 
+    def test_audits_iter_pagination_no_limit(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = watcherclient.v1.audit.AuditManager(self.api)
+        audits = self.mgr.iter(limit=0)
+        # NOTE: only the first page is requested until the iterator
+        # is consumed
+        self.assertEqual([('GET', '/v1/audits', {}, None)],
+                         self.api.calls)
+        self.assertThat(list(audits), matchers.HasLength(2))
+        expect = [
+            ('GET', '/v1/audits', {}, None),
+            ('GET', '/v1/audits/?limit=1', {}, None)
+        ]
+        self.assertEqual(expect, self.api.calls)
+
+    def test_audits_iter_limit(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = watcherclient.v1.audit.AuditManager(self.api)
+        audits = list(self.mgr.iter(limit=1))
+        expect = [
+            ('GET', '/v1/audits/?limit=1', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(audits, matchers.HasLength(1))
+
     def test_audits_list_sort_key(self):
         self.api = utils.FakeAPI(fake_responses_sorting)
         self.mgr = watcherclient.v1.audit.AuditManager(self.api)
@@ -17,6 +17,10 @@ import datetime
 import io
 from unittest import mock
 
+import fixtures
+
+from watcherclient.common import base as common_base
+from watcherclient import exceptions
 from watcherclient import shell
 from watcherclient.tests.unit.v1 import base
 from watcherclient import v1 as resource
@@ -169,7 +173,7 @@ class AuditShellTest(base.CommandTestCase):
     def test_do_audit_list(self):
         audit1 = resource.Audit(mock.Mock(), self.AUDIT_1)
         audit2 = resource.Audit(mock.Mock(), self.AUDIT_2)
-        self.m_audit_mgr.list.return_value = [
+        self.m_audit_mgr.iter.return_value = [
             audit1, audit2]
 
         exit_code, results = self.run_cmd('audit list')
@@ -182,11 +186,22 @@ class AuditShellTest(base.CommandTestCase):
                                    self.SHORT_LIST_FIELD_LABELS)],
             results)
 
-        self.m_audit_mgr.list.assert_called_once_with(detail=False)
+        self.m_audit_mgr.iter.assert_called_once_with(detail=False)
+
+    def test_do_audit_list_records(self):
+        audit = common_base.RecordFactory()(
+            None, dict(self.AUDIT_1, strategy_name=None))
+        self.m_audit_mgr.iter.return_value = [audit]
+
+        exit_code, results = self.run_cmd('audit list')
+
+        self.assertEqual(0, exit_code)
+        self.assertEqual('auto', results[0]['Strategy'])
+        self.assertIsNone(audit.strategy_name)
 
     def test_do_audit_list_marker(self):
         audit2 = resource.Audit(mock.Mock(), self.AUDIT_2)
-        self.m_audit_mgr.list.return_value = [audit2]
+        self.m_audit_mgr.iter.return_value = [audit2]
 
         exit_code, results = self.run_cmd(
             'audit list --marker 5869da81-4876-4687-a1ed-12cd64cf53d9')
@@ -197,14 +212,14 @@ class AuditShellTest(base.CommandTestCase):
                                    self.SHORT_LIST_FIELD_LABELS)],
             results)
 
-        self.m_audit_mgr.list.assert_called_once_with(
+        self.m_audit_mgr.iter.assert_called_once_with(
             detail=False,
             marker='5869da81-4876-4687-a1ed-12cd64cf53d9')
 
     def test_do_audit_list_detail(self):
         audit1 = resource.Audit(mock.Mock(), self.AUDIT_1)
         audit2 = resource.Audit(mock.Mock(), self.AUDIT_2)
-        self.m_audit_mgr.list.return_value = [
+        self.m_audit_mgr.iter.return_value = [
             audit1, audit2]
 
         exit_code, results = self.run_cmd('audit list --detail')
@@ -217,7 +232,7 @@ class AuditShellTest(base.CommandTestCase):
                                    self.FIELD_LABELS)],
             results)
 
-        self.m_audit_mgr.list.assert_called_once_with(detail=True)
+        self.m_audit_mgr.iter.assert_called_once_with(detail=True)
 
     def test_do_audit_show_by_uuid(self):
         audit = resource.Audit(mock.Mock(), self.AUDIT_1)
@@ -248,7 +263,7 @@ class AuditShellTest(base.CommandTestCase):
             'my_audit')
 
     def test_do_audit_delete(self):
-        self.m_audit_mgr.delete.return_value = ''
+        self.m_audit_mgr.delete_many.return_value = [None]
 
         exit_code, result = self.run_cmd(
             'audit delete 5869da81-4876-4687-a1ed-12cd64cf53d9',
@@ -256,11 +271,11 @@ class AuditShellTest(base.CommandTestCase):
 
         self.assertEqual(0, exit_code)
         self.assertEqual('', result)
-        self.m_audit_mgr.delete.assert_called_once_with(
-            '5869da81-4876-4687-a1ed-12cd64cf53d9')
+        self.m_audit_mgr.delete_many.assert_called_once_with(
+            ['5869da81-4876-4687-a1ed-12cd64cf53d9'], max_workers=1, rate=None)
 
     def test_do_audit_delete_by_name(self):
-        self.m_audit_mgr.delete.return_value = ''
+        self.m_audit_mgr.delete_many.return_value = [None]
 
         exit_code, result = self.run_cmd(
             'audit delete my_audit',
@@ -268,11 +283,11 @@ class AuditShellTest(base.CommandTestCase):
 
         self.assertEqual(0, exit_code)
         self.assertEqual('', result)
-        self.m_audit_mgr.delete.assert_called_once_with(
-            'my_audit')
+        self.m_audit_mgr.delete_many.assert_called_once_with(
+            ['my_audit'], max_workers=1, rate=None)
 
     def test_do_audit_delete_multiple(self):
-        self.m_audit_mgr.delete.return_value = ''
+        self.m_audit_mgr.delete_many.return_value = [None, None]
 
         exit_code, result = self.run_cmd(
             'audit delete 5869da81-4876-4687-a1ed-12cd64cf53d9 '
@@ -280,11 +295,60 @@ class AuditShellTest(base.CommandTestCase):
             formatting=None)
 
         self.assertEqual(0, exit_code)
+        self.assertEqual('Deleted 2 of 2 audit(s)\n', result)
+        self.m_audit_mgr.delete_many.assert_called_once_with(
+            ['5869da81-4876-4687-a1ed-12cd64cf53d9',
+             '5b157edd-5a7e-4aaa-b511-f7b33ec86e9f'],
+            max_workers=1, rate=None)
+
+    def test_do_audit_delete_concurrency(self):
+        self.m_audit_mgr.delete_many.return_value = [None, None]
+
+        exit_code, result = self.run_cmd(
+            'audit delete --concurrency 4 --rate 10 audit1 audit2',
+            formatting=None)
+
+        self.assertEqual(0, exit_code)
+        self.m_audit_mgr.delete_many.assert_called_once_with(
+            ['audit1', 'audit2'], max_workers=4, rate=10)
+
+    def test_do_audit_delete_failures(self):
+        self.m_audit_mgr.delete_many.return_value = [
+            exceptions.HTTPNotFound('Audit audit1 could not be found.'),
+            None,
+            exceptions.HTTPNotFound('Audit audit3 could not be found.')]
+        logger = self.useFixture(fixtures.FakeLogger())
+
+        exit_code, result = self.run_cmd(
+            'audit delete audit1 audit2 audit3', formatting=None)
+
+        self.assertEqual(1, exit_code)
+        self.assertEqual('Deleted 1 of 3 audit(s)\n', result)
+        self.assertIn('Failed to delete audit audit1: Audit audit1 could '
+                      'not be found.', logger.output)
+        self.assertIn('Failed to delete audit audit3: Audit audit3 could '
+                      'not be found.', logger.output)
+        self.assertIn('2 of 3 audit(s) failed to delete.', logger.output)
+
+    def test_do_audit_delete_failure(self):
+        self.m_audit_mgr.delete_many.return_value = [
+            exceptions.HTTPNotFound('Audit audit1 could not be found.')]
+        logger = self.useFixture(fixtures.FakeLogger())
+
+        exit_code, result = self.run_cmd('audit delete audit1',
+                                         formatting=None)
+
+        self.assertEqual(1, exit_code)
         self.assertEqual('', result)
-        self.m_audit_mgr.delete.assert_any_call(
-            '5869da81-4876-4687-a1ed-12cd64cf53d9')
-        self.m_audit_mgr.delete.assert_any_call(
-            '5b157edd-5a7e-4aaa-b511-f7b33ec86e9f')
+        self.assertIn('Audit audit1 could not be found.', logger.output)
+        self.assertNotIn('failed to delete', logger.output)
+
+    def test_do_audit_delete_invalid_concurrency(self):
+        exit_code, result = self.run_cmd(
+            'audit delete --concurrency 0 audit1', formatting=None)
+
+        self.assertEqual(1, exit_code)
+        self.assertFalse(self.m_audit_mgr.delete_many.called)
 
     def test_do_audit_update(self):
         audit = resource.Audit(mock.Mock(), self.AUDIT_1)
@@ -336,6 +400,26 @@ class AuditShellTest(base.CommandTestCase):
             auto_trigger=False
         )
 
+    def test_do_audit_create_negotiated_version(self):
+        # NOTE: the fields are those of the version negotiated by the
+        # client rather than those of the requested version
+        http_client = self.m_construct_http_client.return_value
+        http_client.os_infra_optim_api_version = '1.0'
+        audit = resource.Audit(mock.Mock(), self.AUDIT_3)
+        self.m_audit_mgr.create.return_value = audit
+
+        exit_code, result = self.run_cmd(
+            '--os-infra-optim-api-version 1.latest '
+            'audit create -a f8e47706-efcf-49a4-a5c4-af604eb492f2 --force')
+
+        self.assertEqual(0, exit_code)
+        self.assertNotIn('Force', result)
+        self.m_audit_mgr.create.assert_called_once_with(
+            audit_template_uuid='f8e47706-efcf-49a4-a5c4-af604eb492f2',
+            audit_type='ONESHOT',
+            auto_trigger=False
+        )
+
     def test_do_audit_create_with_audit_template_name(self):
         audit = resource.Audit(mock.Mock(), self.AUDIT_3)
         audit_template = resource.AuditTemplate(mock.Mock(), AUDIT_TEMPLATE_1)
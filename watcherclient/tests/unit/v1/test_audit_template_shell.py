@@ -285,7 +285,7 @@ class AuditTemplateShellTest(base.CommandTestCase):
             'f8e47706-efcf-49a4-a5c4-af604eb492f2')
 
     def test_do_audit_template_delete(self):
-        self.m_audit_template_mgr.delete.return_value = ''
+        self.m_audit_template_mgr.delete_many.return_value = [None]
 
         exit_code, result = self.run_cmd(
             'audittemplate delete f8e47706-efcf-49a4-a5c4-af604eb492f2',
@@ -293,11 +293,11 @@ class AuditTemplateShellTest(base.CommandTestCase):
 
         self.assertEqual(0, exit_code)
         self.assertEqual('', result)
-        self.m_audit_template_mgr.delete.assert_called_once_with(
-            'f8e47706-efcf-49a4-a5c4-af604eb492f2')
+        self.m_audit_template_mgr.delete_many.assert_called_once_with(
+            ['f8e47706-efcf-49a4-a5c4-af604eb492f2'], max_workers=1, rate=None)
 
     def test_do_audit_template_delete_multiple(self):
-        self.m_audit_template_mgr.delete.return_value = ''
+        self.m_audit_template_mgr.delete_many.return_value = [None, None]
 
         exit_code, result = self.run_cmd(
             'audittemplate delete f8e47706-efcf-49a4-a5c4-af604eb492f2 '
@@ -305,11 +305,11 @@ class AuditTemplateShellTest(base.CommandTestCase):
             formatting=None)
 
         self.assertEqual(0, exit_code)
-        self.assertEqual('', result)
-        self.m_audit_template_mgr.delete.assert_any_call(
-            'f8e47706-efcf-49a4-a5c4-af604eb492f2')
-        self.m_audit_template_mgr.delete.assert_any_call(
-            '92dfce2f-0a5e-473f-92b7-d92e21839e4d')
+        self.assertEqual('Deleted 2 of 2 audit template(s)\n', result)
+        self.m_audit_template_mgr.delete_many.assert_called_once_with(
+            ['f8e47706-efcf-49a4-a5c4-af604eb492f2',
+             '92dfce2f-0a5e-473f-92b7-d92e21839e4d'],
+            max_workers=1, rate=None)
 
     def test_do_audit_template_update(self):
         audit_template = resource.AuditTemplate(mock.Mock(), AUDIT_TEMPLATE_1)
@@ -14,9 +14,13 @@
 #    under the License.
 
 
+from unittest import mock
+
 import testtools
 from testtools import matchers
 
+from watcherclient.common import cache
+from watcherclient.common import httpclient
 from watcherclient.tests.unit import utils
 import watcherclient.v1.goal
 
@@ -199,3 +203,48 @@ class GoalManagerTest(testtools.TestCase):
         ]
         self.assertEqual(expect, self.api.calls)
         self.assertEqual(GOAL1['name'], goal.name)
+
+    def test_goals_cached(self):
+        self.mgr.cache = cache.TTLCache()
+        goal = self.mgr.get(GOAL1['uuid'])
+        goal.name = 'modified'
+        goal = self.mgr.get(GOAL1['uuid'])
+        goals = self.mgr.list()
+        self.mgr.list()
+
+        expect = [
+            ('GET', '/v1/goals/%s' % GOAL1['uuid'], {}, None),
+            ('GET', '/v1/goals', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual(GOAL1['name'], goal.name)
+        self.assertEqual(1, len(goals))
+        self.assertEqual(2, self.mgr.cache.hits)
+
+    def test_goals_cached_per_session_endpoint(self):
+        catalog_cache = cache.TTLCache()
+        goals = []
+        for endpoint in ('http://cloud1:9322', 'http://cloud2:9322'):
+            session = mock.Mock()
+            session.get_endpoint.return_value = endpoint
+            client = httpclient.SessionClient(
+                session=session, os_infra_optim_api_version='1.0',
+                api_version_select_state='user', max_retries=0,
+                retry_interval=0, endpoint=None)
+            mgr = watcherclient.v1.goal.GoalManager(client,
+                                                    cache=catalog_cache)
+            with mock.patch.object(
+                    client, 'json_request',
+                    return_value=(None, {'goals': [{'name': endpoint}]})):
+                goals.append(mgr.list()[0].name)
+
+        self.assertEqual(['http://cloud1:9322', 'http://cloud2:9322'], goals)
+        self.assertEqual(2, catalog_cache.stats()['size'])
+
+    def test_goals_invalidate_cache(self):
+        self.mgr.cache = cache.TTLCache()
+        self.mgr.get(GOAL1['uuid'])
+        self.mgr.invalidate_cache()
+        self.mgr.get(GOAL1['uuid'])
+
+        self.assertEqual(2, len(self.api.calls))
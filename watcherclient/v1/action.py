@@ -15,6 +15,7 @@
 
 from watcherclient.common import base
 from watcherclient.common import utils
+from watcherclient.v1 import resource_fields as res_fields
 
 
 class Action(base.Resource):
@@ -24,13 +25,14 @@ class Action(base.Resource):
 
 class ActionManager(base.Manager):
     resource_class = Action
+    interned_fields = res_fields.ACTION_INTERNED_FIELDS
 
     @staticmethod
     def _path(id=None):
         return '/v1/actions/%s' % id if id else '/v1/actions'
 
     def list(self, action_plan=None, audit=None, limit=None, sort_key=None,
-             sort_dir=None, detail=False, marker=None):
+             sort_dir=None, detail=False, marker=None, prefetch=0):
         """Retrieve a list of action.
 
         :param action_plan: UUID of the action plan
@@ -54,12 +56,50 @@ class ActionManager(base.Manager):
 
         :param marker: Optional, UUID of the last action in the previous page.
 
+        :param prefetch: Optional, number of pages to fetch ahead on a
+                         background thread while the current one is
+                         processed. Only used when paginating (limit is
+                         not None); 0 (the default) disables prefetching.
+
         :returns: A list of actions.
 
         """
         if limit is not None:
             limit = int(limit)
 
+        path = self._list_path(action_plan, audit, limit, sort_key,
+                               sort_dir, detail, marker)
+
+        if limit is None:
+            return self._list(path, "actions")
+        else:
+            return self._list_pagination(path, "actions", limit=limit,
+                                         prefetch=prefetch)
+
+    def iter(self, action_plan=None, audit=None, limit=None, sort_key=None,
+             sort_dir=None, detail=False, marker=None, prefetch=0):
+        """Retrieve an iterator over actions, one page at a time.
+
+        Takes the same parameters as :meth:`list`, but yields the actions
+        as each page is received rather than building the whole list, so
+        that listing a large action plan uses constant memory.
+
+        :returns: An iterator of actions.
+        """
+        if limit is not None:
+            limit = int(limit)
+
+        path = self._list_path(action_plan, audit, limit, sort_key,
+                               sort_dir, detail, marker)
+
+        if limit is None:
+            return iter(self._list(path, "actions"))
+        else:
+            return self._iter_pagination(path, "actions", limit=limit,
+                                         prefetch=prefetch)
+
+    def _list_path(self, action_plan, audit, limit, sort_key, sort_dir,
+                   detail, marker):
         filters = utils.common_filters(limit, sort_key, sort_dir, marker)
         if action_plan is not None:
             filters.append('action_plan_uuid=%s' % action_plan)
@@ -72,11 +112,7 @@ class ActionManager(base.Manager):
         if filters:
             path += '?' + '&'.join(filters)
 
-        if limit is None:
-            return self._list(self._path(path), "actions")
-        else:
-            return self._list_pagination(self._path(path), "actions",
-                                         limit=limit)
+        return self._path(path)
 
     def get(self, action_id):
         try:
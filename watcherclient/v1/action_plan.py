@@ -15,6 +15,7 @@
 
 from watcherclient.common import base
 from watcherclient.common import utils
+from watcherclient.v1 import resource_fields as res_fields
 # from watcherclient import exceptions as exc
 
 
@@ -25,6 +26,7 @@ class ActionPlan(base.Resource):
 
 class ActionPlanManager(base.Manager):
     resource_class = ActionPlan
+    interned_fields = res_fields.ACTION_PLAN_INTERNED_FIELDS
 
     @staticmethod
     def _path(id=None, q_param=None):
@@ -36,7 +38,7 @@ class ActionPlanManager(base.Manager):
             return '/v1/action_plans'
 
     def list(self, audit=None, limit=None, sort_key=None,
-             sort_dir=None, detail=False, marker=None):
+             sort_dir=None, detail=False, marker=None, prefetch=0):
         """Retrieve a list of action plan.
 
         :param audit: Name of the audit
@@ -60,12 +62,48 @@ class ActionPlanManager(base.Manager):
         :param marker: The last actionplan UUID of the previous page;
                        displays list of actionplans after "marker".
 
+        :param prefetch: Optional, number of pages to fetch ahead on a
+                         background thread while the current one is
+                         processed. Only used when paginating (limit is
+                         not None); 0 (the default) disables prefetching.
+
         :returns: A list of action plans.
 
         """
         if limit is not None:
             limit = int(limit)
 
+        path = self._list_path(audit, limit, sort_key, sort_dir, detail,
+                               marker)
+
+        if limit is None:
+            return self._list(path, "action_plans")
+        else:
+            return self._list_pagination(path, "action_plans", limit=limit,
+                                         prefetch=prefetch)
+
+    def iter(self, audit=None, limit=None, sort_key=None,
+             sort_dir=None, detail=False, marker=None, prefetch=0):
+        """Retrieve an iterator over action plans, one page at a time.
+
+        Takes the same parameters as :meth:`list`, but yields the action
+        plans as each page is received rather than building the whole list.
+
+        :returns: An iterator of action plans.
+        """
+        if limit is not None:
+            limit = int(limit)
+
+        path = self._list_path(audit, limit, sort_key, sort_dir, detail,
+                               marker)
+
+        if limit is None:
+            return iter(self._list(path, "action_plans"))
+        else:
+            return self._iter_pagination(path, "action_plans", limit=limit,
+                                         prefetch=prefetch)
+
+    def _list_path(self, audit, limit, sort_key, sort_dir, detail, marker):
         filters = utils.common_filters(limit, sort_key, sort_dir, marker)
         if audit is not None:
             filters.append('audit_uuid=%s' % audit)
@@ -76,11 +114,7 @@ class ActionPlanManager(base.Manager):
         if filters:
             path += '?' + '&'.join(filters)
 
-        if limit is None:
-            return self._list(self._path(path), "action_plans")
-        else:
-            return self._list_pagination(self._path(path), "action_plans",
-                                         limit=limit)
+        return self._path(path)
 
     def get(self, action_plan_id):
         try:
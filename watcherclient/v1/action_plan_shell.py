@@ -28,10 +28,10 @@ from watcherclient import exceptions
 from watcherclient.v1 import resource_fields as res_fields
 
 
-def drop_unsupported_field(app_args, fields, field_labels):
+def drop_unsupported_field(client, fields, field_labels):
     fields = copy.copy(fields)
     field_labels = copy.copy(field_labels)
-    api_ver = app_args.os_infra_optim_api_version
+    api_ver = common_utils.get_api_version(client)
     if not api_versioning.action_update_supported(api_ver):
         fields.remove('status_message')
         field_labels.remove('Status Message')
@@ -114,7 +114,7 @@ class ShowActionPlan(command.ShowOne):
         columns = res_fields.ACTION_PLAN_FIELDS
         column_headers = res_fields.ACTION_PLAN_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
         return column_headers, utils.get_item_properties(action_plan, columns)
 
 
@@ -154,6 +154,13 @@ class ListActionPlan(command.Lister):
             metavar='<direction>',
             choices=['asc', 'desc'],
             help=_('Sort direction: "asc" (the default) or "desc".'))
+        parser.add_argument(
+            '--prefetch',
+            metavar='<pages>',
+            type=int,
+            help=_('Number of pages of action plans to request in advance '
+                   'while the current page is displayed. Only used with '
+                   '--limit. Default is 0, no prefetching.'))
 
         return parser
 
@@ -193,7 +200,7 @@ class ListActionPlan(command.Lister):
             fields = res_fields.ACTION_PLAN_FIELDS
             field_labels = res_fields.ACTION_PLAN_FIELD_LABELS
             fields, field_labels = drop_unsupported_field(
-                self.app_args, fields, field_labels)
+                client, fields, field_labels)
         else:
             fields = res_fields.ACTION_PLAN_SHORT_LIST_FIELDS
             field_labels = res_fields.ACTION_PLAN_SHORT_LIST_FIELD_LABELS
@@ -201,20 +208,25 @@ class ListActionPlan(command.Lister):
         params.update(common_utils.common_params_for_list(
             parsed_args, fields, field_labels))
 
-        data = client.action_plan.list(**params)
-
-        if parsed_args.formatter == 'table':
-            for action_plan in data:
-                # Update the raw efficacy indicators with the formatted ones
-                action_plan.efficacy_indicators = (
-                    self._format_indicators(action_plan, parsed_args))
+        data = client.action_plan.iter(**params)
 
-                # Update the raw global efficacy with the formatted one
-                action_plan.global_efficacy = self._format_global_efficacy(
-                    action_plan.global_efficacy, parsed_args)
+        def _format_action_plan(action_plan):
+            row = utils.get_item_properties(action_plan, fields)
+            if parsed_args.formatter != 'table':
+                return row
+            # NOTE: the listed action plans may be read-only records, so
+            # the raw efficacy indicators and global efficacy are replaced
+            # with the formatted ones in the row instead of the action plan
+            formatted = []
+            for field, value in zip(fields, row):
+                if field == 'efficacy_indicators':
+                    value = self._format_indicators(action_plan, parsed_args)
+                elif field == 'global_efficacy':
+                    value = self._format_global_efficacy(value, parsed_args)
+                formatted.append(value)
+            return tuple(formatted)
 
-        return (field_labels,
-                (utils.get_item_properties(item, fields) for item in data))
+        return (field_labels, (_format_action_plan(item) for item in data))
 
 
 class UpdateActionPlan(command.ShowOne):
@@ -256,7 +268,7 @@ class UpdateActionPlan(command.ShowOne):
         columns = res_fields.ACTION_PLAN_FIELDS
         column_headers = res_fields.ACTION_PLAN_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(action_plan, columns)
 
@@ -284,7 +296,7 @@ class StartActionPlan(command.ShowOne):
         columns = res_fields.ACTION_PLAN_FIELDS
         column_headers = res_fields.ACTION_PLAN_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(action_plan, columns)
 
@@ -300,6 +312,7 @@ class DeleteActionPlan(command.Command):
             nargs='+',
             help=_('UUID of the action plan'),
         )
+        common_utils.add_bulk_arguments(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -309,7 +322,10 @@ class DeleteActionPlan(command.Command):
             if not uuidutils.is_uuid_like(action_plan):
                 raise exceptions.ValidationError()
 
-            client.action_plan.delete(action_plan)
+        common_utils.delete_many(client.action_plan,
+                                 parsed_args.action_plans, parsed_args,
+                                 'action plan', self.log,
+                                 stdout=self.app.stdout)
 
 
 class CancelActionPlan(command.ShowOne):
@@ -335,6 +351,6 @@ class CancelActionPlan(command.ShowOne):
         columns = res_fields.ACTION_PLAN_FIELDS
         column_headers = res_fields.ACTION_PLAN_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(action_plan, columns)
@@ -26,10 +26,10 @@ from watcherclient import exceptions
 from watcherclient.v1 import resource_fields as res_fields
 
 
-def drop_unsupported_field(app_args, fields, field_labels):
+def drop_unsupported_field(client, fields, field_labels):
     fields = copy.copy(fields)
     field_labels = copy.copy(field_labels)
-    api_ver = app_args.os_infra_optim_api_version
+    api_ver = common_utils.get_api_version(client)
     if not api_versioning.action_update_supported(api_ver):
         fields.remove('status_message')
         field_labels.remove('Status Message')
@@ -59,7 +59,7 @@ class ShowAction(command.ShowOne):
         columns = res_fields.ACTION_FIELDS
         column_headers = res_fields.ACTION_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(action, columns)
 
@@ -106,6 +106,13 @@ class ListAction(command.Lister):
             default=None,
             help=_('UUID of the last action in the previous page; '
                    'displays list of actions after "marker".'))
+        parser.add_argument(
+            '--prefetch',
+            metavar='<pages>',
+            type=int,
+            help=_('Number of pages of actions to request in advance while '
+                   'the current page is displayed. Only used with '
+                   '--limit. Default is 0, no prefetching.'))
 
         return parser
 
@@ -121,7 +128,7 @@ class ListAction(command.Lister):
             fields = res_fields.ACTION_FIELDS
             field_labels = res_fields.ACTION_FIELD_LABELS
             fields, field_labels = drop_unsupported_field(
-                self.app_args, fields, field_labels)
+                client, fields, field_labels)
         else:
             fields = res_fields.ACTION_SHORT_LIST_FIELDS
             field_labels = res_fields.ACTION_SHORT_LIST_FIELD_LABELS
@@ -131,7 +138,7 @@ class ListAction(command.Lister):
                 parsed_args, fields, field_labels))
 
         try:
-            data = client.action.list(**params)
+            data = client.action.iter(**params)
         except exceptions.HTTPNotFound as ex:
             raise exceptions.CommandError(str(ex))
 
@@ -162,7 +169,7 @@ class UpdateAction(command.ShowOne):
         client = getattr(self.app.client_manager, "infra-optim")
 
         # Check if action update is supported in the requested API version
-        api_ver = self.app_args.os_infra_optim_api_version
+        api_ver = common_utils.get_api_version(client)
         if not api_versioning.action_update_supported(api_ver):
             raise exceptions.CommandError(
                 _("Action update is not supported in API version %s. "
@@ -198,6 +205,6 @@ class UpdateAction(command.ShowOne):
         columns = res_fields.ACTION_FIELDS
         column_headers = res_fields.ACTION_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(action, columns)
@@ -16,6 +16,7 @@
 from watcherclient.common import base
 from watcherclient.common import utils
 from watcherclient import exceptions as exc
+from watcherclient.v1 import resource_fields as res_fields
 
 
 CREATION_ATTRIBUTES = ['audit_template_uuid', 'audit_type', 'interval',
@@ -30,6 +31,7 @@ class Audit(base.Resource):
 
 class AuditManager(base.Manager):
     resource_class = Audit
+    interned_fields = res_fields.AUDIT_INTERNED_FIELDS
 
     @staticmethod
     def _path(id=None):
@@ -37,7 +39,7 @@ class AuditManager(base.Manager):
 
     def list(self, audit_template=None, limit=None, sort_key=None,
              sort_dir=None, detail=False, goal=None, strategy=None,
-             marker=None):
+             marker=None, prefetch=0):
         """Retrieve a list of audit.
 
         :param audit_template: Name of the audit template
@@ -60,12 +62,50 @@ class AuditManager(base.Manager):
 
         :param marker: Optional, UUID of the last audit in the previous page.
 
+        :param prefetch: Optional, number of pages to fetch ahead on a
+                         background thread while the current one is
+                         processed. Only used when paginating (limit is
+                         not None); 0 (the default) disables prefetching.
+
         :returns: A list of audits.
 
         """
         if limit is not None:
             limit = int(limit)
 
+        path = self._list_path(audit_template, limit, sort_key, sort_dir,
+                               detail, goal, strategy, marker)
+
+        if limit is None:
+            return self._list(path, "audits")
+        else:
+            return self._list_pagination(path, "audits", limit=limit,
+                                         prefetch=prefetch)
+
+    def iter(self, audit_template=None, limit=None, sort_key=None,
+             sort_dir=None, detail=False, goal=None, strategy=None,
+             marker=None, prefetch=0):
+        """Retrieve an iterator over audits, one page at a time.
+
+        Takes the same parameters as :meth:`list`, but yields the audits
+        as each page is received rather than building the whole list.
+
+        :returns: An iterator of audits.
+        """
+        if limit is not None:
+            limit = int(limit)
+
+        path = self._list_path(audit_template, limit, sort_key, sort_dir,
+                               detail, goal, strategy, marker)
+
+        if limit is None:
+            return iter(self._list(path, "audits"))
+        else:
+            return self._iter_pagination(path, "audits", limit=limit,
+                                         prefetch=prefetch)
+
+    def _list_path(self, audit_template, limit, sort_key, sort_dir, detail,
+                   goal, strategy, marker):
         filters = utils.common_filters(limit, sort_key, sort_dir, marker)
         if audit_template is not None:
             filters.append('audit_template=%s' % audit_template)
@@ -80,11 +120,7 @@ class AuditManager(base.Manager):
         if filters:
             path += '?' + '&'.join(filters)
 
-        if limit is None:
-            return self._list(self._path(path), "audits")
-        else:
-            return self._list_pagination(self._path(path), "audits",
-                                         limit=limit)
+        return self._path(path)
 
     def create(self, **kwargs):
         new = {}
@@ -26,10 +26,10 @@ from watcherclient import exceptions
 from watcherclient.v1 import resource_fields as res_fields
 
 
-def drop_unsupported_field(app_args, fields, field_labels):
+def drop_unsupported_field(client, fields, field_labels):
     fields = copy.copy(fields)
     field_labels = copy.copy(field_labels)
-    api_ver = app_args.os_infra_optim_api_version
+    api_ver = common_utils.get_api_version(client)
     if not api_versioning.allow_start_end_audit_time(api_ver):
         for field, label in zip(('start_time', 'end_time'),
                                 ('Start Time', 'End Time')):
@@ -69,7 +69,7 @@ class ShowAudit(command.ShowOne):
         columns = res_fields.AUDIT_FIELDS
         column_headers = res_fields.AUDIT_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(audit, columns)
 
@@ -118,6 +118,13 @@ class ListAudit(command.Lister):
             default=None,
             help=_('UUID of the last audit in the previous page; '
                    'displays list of audits after "marker".'))
+        parser.add_argument(
+            '--prefetch',
+            metavar='<pages>',
+            type=int,
+            help=_('Number of pages of audits to request in advance while '
+                   'the current page is displayed. Only used with '
+                   '--limit. Default is 0, no prefetching.'))
 
         return parser
 
@@ -143,21 +150,24 @@ class ListAudit(command.Lister):
 
         if parsed_args.detail:
             fields, field_labels = drop_unsupported_field(
-                self.app_args, fields, field_labels)
+                client, fields, field_labels)
 
         params.update(common_utils.common_params_for_list(
             parsed_args, fields, field_labels))
 
         try:
-            data = client.audit.list(**params)
-            for audit in data:
-                if audit.strategy_name is None:
-                    audit.strategy_name = 'auto'
+            data = client.audit.iter(**params)
         except exceptions.HTTPNotFound as ex:
             raise exceptions.CommandError(str(ex))
 
-        return (field_labels,
-                (utils.get_item_properties(item, fields) for item in data))
+        def _format_audit(audit):
+            # NOTE: the listed audits may be read-only records, so the row
+            # is formatted instead of the audit
+            row = utils.get_item_properties(audit, fields)
+            return tuple('auto' if field == 'strategy_name' and value is None
+                         else value for field, value in zip(fields, row))
+
+        return (field_labels, (_format_audit(item) for item in data))
 
 
 class CreateAudit(command.ShowOne):
@@ -242,7 +252,7 @@ class CreateAudit(command.ShowOne):
                       'interval', 'goal', 'strategy', 'auto_trigger',
                       'name']
 
-        api_ver = self.app_args.os_infra_optim_api_version
+        api_ver = common_utils.get_api_version(client)
         if api_versioning.allow_start_end_audit_time(api_ver):
             if parsed_args.start_time is not None:
                 field_list.append('start_time')
@@ -268,7 +278,7 @@ class CreateAudit(command.ShowOne):
         columns = res_fields.AUDIT_FIELDS
         column_headers = res_fields.AUDIT_FIELD_LABELS
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(audit, columns)
 
@@ -311,7 +321,7 @@ class UpdateAudit(command.ShowOne):
         column_headers = res_fields.AUDIT_FIELD_LABELS
 
         columns, column_headers = drop_unsupported_field(
-            self.app_args, columns, column_headers)
+            client, columns, column_headers)
 
         return column_headers, utils.get_item_properties(audit, columns)
 
@@ -327,10 +337,12 @@ class DeleteAudit(command.Command):
             nargs='+',
             help=_('UUID or name of the audit'),
         )
+        common_utils.add_bulk_arguments(parser)
         return parser
 
     def take_action(self, parsed_args):
         client = getattr(self.app.client_manager, "infra-optim")
 
-        for audit in parsed_args.audits:
-            client.audit.delete(audit)
+        common_utils.delete_many(client.audit, parsed_args.audits,
+                                 parsed_args, 'audit', self.log,
+                                 stdout=self.app.stdout)
@@ -16,6 +16,7 @@
 from watcherclient.common import base
 from watcherclient.common import utils
 from watcherclient import exceptions as exc
+from watcherclient.v1 import resource_fields as res_fields
 
 CREATION_ATTRIBUTES = ['description', 'name', 'goal', 'strategy', 'scope',
                        'default_parameters']
@@ -28,6 +29,7 @@ class AuditTemplate(base.Resource):
 
 class AuditTemplateManager(base.Manager):
     resource_class = AuditTemplate
+    interned_fields = res_fields.AUDIT_TEMPLATE_INTERNED_FIELDS
 
     @staticmethod
     def _path(id_=None):
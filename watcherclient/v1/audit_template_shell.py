@@ -264,7 +264,7 @@ class CreateAuditTemplate(command.ShowOne):
 
         field_list = ['description', 'name', 'goal', 'strategy', 'scope']
 
-        api_ver = self.app_args.os_infra_optim_api_version
+        api_ver = common_utils.get_api_version(client)
         if api_versioning.allow_audit_template_default_parameters(api_ver):
             field_list.append('default_parameters')
         elif vars(parsed_args).get('default_parameters') is not None:
@@ -350,10 +350,13 @@ class DeleteAuditTemplate(command.Command):
             nargs='+',
             help=_('UUID or name of the audit template'),
         )
+        common_utils.add_bulk_arguments(parser)
         return parser
 
     def take_action(self, parsed_args):
         client = getattr(self.app.client_manager, "infra-optim")
 
-        for audit_template in parsed_args.audit_templates:
-            client.audit_template.delete(audit_template)
+        common_utils.delete_many(client.audit_template,
+                                 parsed_args.audit_templates, parsed_args,
+                                 'audit template', self.log,
+                                 stdout=self.app.stdout)
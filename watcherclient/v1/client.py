@@ -13,11 +13,26 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import logging
+
 from watcherclient._i18n import _
+from watcherclient.common import api_versioning
+from watcherclient.common import base
+from watcherclient.common import filecache
 from watcherclient.common import httpclient
 from watcherclient import exceptions
 from watcherclient import v1
 
+LOG = logging.getLogger(__name__)
+
+
+def _is_latest(version):
+    try:
+        return api_versioning.get_api_version(version).is_latest()
+    except exceptions.UnsupportedVersion:
+        return False
+
 
 class Client(object):
     """Client for the Watcher v1 API.
@@ -27,33 +42,142 @@ class Client(object):
     :param function token: Provides token for authentication.
     :param integer timeout: Allows customization of the timeout for client
                             http requests. (optional)
+    :param catalog_cache: A :class:`watcherclient.common.cache.TTLCache`
+                          caching the goals, strategies, scoring engines and
+                          services. (optional)
+    :param boolean compact_lists: Whether the list calls return read-only
+        :class:`watcherclient.common.base.Record` instances, which use less
+        memory than resources. (optional)
+    :param boolean intern_strings: Whether the values repeated across the
+        audits, audit templates, action plans and actions of a list, e.g.
+        their state, share a single string. (optional)
+    :param boolean lazy_detail: Whether reading an attribute missing from a
+        resource of a list without details loads the details of the whole
+        list with one request. (optional)
+    :param boolean lazy_lists: Whether the list calls return a
+        :class:`watcherclient.common.base.LazyList`, a read-only sequence
+        building the resource of an item on access, rather than a list.
+        (optional)
+    :param integer version_cache_expiry: Age, in seconds, after which the
+        API version cached for the endpoint is negotiated again, 0 to always
+        negotiate it. Defaults to 300. (optional)
+
+    A client is thread-safe and can be shared by the threads of a pool.
     """
 
     def __init__(self, endpoint=None, *args, **kwargs):
         """Initialize a new client for the Watcher v1 API."""
-        if kwargs.get('os_infra_optim_api_version'):
-            kwargs['api_version_select_state'] = "user"
-        else:
-            if not endpoint:
+        api_version = kwargs.get('os_infra_optim_api_version')
+        negotiate = not api_version or _is_latest(api_version)
+        if negotiate:
+            if not (endpoint or kwargs.get('session')):
                 raise exceptions.EndpointException(
                     _("Must provide 'endpoint' if os_infra_optim_api_version "
                       "isn't specified"))
-
-            # If the user didn't specify a version, use a cached version if
-            # one has been stored
-            host, netport = httpclient.get_server(endpoint)
             kwargs['api_version_select_state'] = "default"
-            kwargs['os_infra_optim_api_version'] = httpclient.DEFAULT_VER
+            kwargs['os_infra_optim_api_version'] = (
+                api_version or httpclient.DEFAULT_VER)
+        else:
+            kwargs['api_version_select_state'] = "user"
 
+        catalog_cache = kwargs.pop('catalog_cache', None)
+        version_cache_expiry = kwargs.pop('version_cache_expiry',
+                                          filecache.DEFAULT_EXPIRY)
+        options = {'compact': kwargs.pop('compact_lists', False),
+                   'lazy_detail': kwargs.pop('lazy_detail', False),
+                   'lazy_lists': kwargs.pop('lazy_lists', False)}
+        intern = kwargs.pop('intern_strings', False)
         self.http_client = httpclient._construct_http_client(
             endpoint, *args, **kwargs)
+        if negotiate:
+            # If the user didn't specify a version, or asked for the latest
+            # one, use the version cached for the endpoint, if any
+            self.http_client.use_cached_version(expiry=version_cache_expiry)
+
+        self.audit = v1.AuditManager(self.http_client, intern=intern,
+                                     **options)
+        self.audit_template = v1.AuditTemplateManager(
+            self.http_client, intern=intern, **options)
+        self.action = v1.ActionManager(self.http_client, intern=intern,
+                                       **options)
+        self.action_plan = v1.ActionPlanManager(self.http_client,
+                                                intern=intern, **options)
+        self.goal = v1.GoalManager(self.http_client, cache=catalog_cache,
+                                   **options)
+        self.scoring_engine = v1.ScoringEngineManager(
+            self.http_client, cache=catalog_cache, **options)
+        self.service = v1.ServiceManager(self.http_client,
+                                         cache=catalog_cache, **options)
+        self.strategy = v1.StrategyManager(self.http_client,
+                                           cache=catalog_cache, **options)
+        self.data_model = v1.DataModelManager(self.http_client, **options)
+
+    def reset_connections(self):
+        """Close the pooled connections to the Watcher API.
+
+        A client can be created before forking worker processes: each
+        process transparently opens its own connections on first use.
+        """
+        self.http_client.reset_connections()
+
+
+class ExecutorClient(object):
+    """Client for the Watcher v1 API usable from asyncio code.
+
+    Exposes the same managers as :class:`Client`, with coroutine methods
+    and an asynchronous ``iter`` method, e.g.::
+
+        client = ExecutorClient(endpoint, session=session)
+        audit = await client.audit.get(audit_uuid)
+        async for action in client.action.iter(audit=audit_uuid, limit=0):
+            ...
+
+    This is not an asynchronous transport: the requests are sent by a
+    :class:`Client` built from the same arguments, on a thread pool of at
+    most ``max_workers`` threads, and each request in flight occupies one
+    of its threads. The size of the pool bounds the number of requests in
+    flight.
+
+    :param executor: a :class:`concurrent.futures.Executor` to run the
+                     requests on instead of a dedicated thread pool.
+                     (optional)
+    :param integer max_workers: size of the dedicated thread pool.
+                                (optional)
+
+    The ``lazy_detail`` option of :class:`Client` is not supported: reading
+    an attribute of a resource would send a request from the event loop.
+    """
+
+    def __init__(self, endpoint=None, *args, **kwargs):
+        """Initialize a new client for the Watcher v1 API."""
+        executor = kwargs.pop('executor', None)
+        max_workers = kwargs.pop('max_workers', None)
+        self._own_executor = executor is None
+        if executor is None:
+            executor = futures.ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='watcherclient')
+        self.executor = executor
+
+        if kwargs.pop('lazy_detail', False):
+            LOG.warning('The lazy_detail argument is ignored by the '
+                        'ExecutorClient, call hydrate() instead')
+        self.client = Client(endpoint, *args, **kwargs)
+        self.http_client = self.client.http_client
+
+        for name in ('audit', 'audit_template', 'action', 'action_plan',
+                     'goal', 'scoring_engine', 'service', 'strategy',
+                     'data_model'):
+            setattr(self, name, base.ExecutorManager(
+                getattr(self.client, name), executor=executor))
+
+    def close(self):
+        """Shut down the thread pool created by this client, if any."""
+        if self._own_executor:
+            self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
 
-        self.audit = v1.AuditManager(self.http_client)
-        self.audit_template = v1.AuditTemplateManager(self.http_client)
-        self.action = v1.ActionManager(self.http_client)
-        self.action_plan = v1.ActionPlanManager(self.http_client)
-        self.goal = v1.GoalManager(self.http_client)
-        self.scoring_engine = v1.ScoringEngineManager(self.http_client)
-        self.service = v1.ServiceManager(self.http_client)
-        self.strategy = v1.StrategyManager(self.http_client)
-        self.data_model = v1.DataModelManager(self.http_client)
+    async def __aexit__(self, *exc_info):
+        self.close()
@@ -31,6 +31,9 @@ AUDIT_TEMPLATE_SHORT_LIST_FIELDS = [
 
 AUDIT_TEMPLATE_SHORT_LIST_FIELD_LABELS = ['UUID', 'Name', 'Goal', 'Strategy']
 
+# Fields whose values are repeated across the audit templates of a list
+AUDIT_TEMPLATE_INTERNED_FIELDS = ['goal_name', 'strategy_name']
+
 # Audit
 AUDIT_FIELDS = ['uuid', 'name', 'created_at', 'updated_at', 'deleted_at',
                 'state', 'audit_type', 'parameters', 'interval', 'goal_name',
@@ -51,6 +54,10 @@ AUDIT_SHORT_LIST_FIELDS = ['uuid', 'name', 'audit_type',
 AUDIT_SHORT_LIST_FIELD_LABELS = ['UUID', 'Name', 'Audit Type', 'State', 'Goal',
                                  'Strategy', 'Auto Trigger']
 
+# Fields whose values are repeated across the audits of a list
+AUDIT_INTERNED_FIELDS = ['state', 'audit_type', 'goal_name', 'strategy_name',
+                         'hostname']
+
 # Action Plan
 ACTION_PLAN_FIELDS = ['uuid', 'created_at', 'updated_at', 'deleted_at',
                       'audit_uuid', 'strategy_name', 'state',
@@ -68,6 +75,10 @@ ACTION_PLAN_SHORT_LIST_FIELDS = ['uuid', 'audit_uuid', 'state',
 ACTION_PLAN_SHORT_LIST_FIELD_LABELS = ['UUID', 'Audit', 'State',
                                        'Updated At', 'Global efficacy']
 
+# Fields whose values are repeated across the action plans of a list
+ACTION_PLAN_INTERNED_FIELDS = ['audit_uuid', 'strategy_name', 'state',
+                               'hostname']
+
 GLOBAL_EFFICACY_FIELDS = ['value', 'unit', 'name', 'description']
 
 # Action
@@ -84,6 +95,10 @@ ACTION_SHORT_LIST_FIELDS = ['uuid', 'parents',
 
 ACTION_SHORT_LIST_FIELD_LABELS = ['UUID', 'Parents', 'State',
                                   'Action Plan', 'Action']
+
+# Fields whose values are repeated across the actions of a list
+ACTION_INTERNED_FIELDS = ['parents', 'state', 'action_plan_uuid',
+                          'action_type']
 # Goals
 
 GOAL_FIELDS = ['uuid', 'name', 'display_name', 'efficacy_specification']